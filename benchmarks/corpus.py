@@ -0,0 +1,108 @@
+# benchmarks/corpus.py
+"""
+Synthetic question corpus for the offline benchmarks.
+
+    build_corpus(10_000)      # into the DB configured by DB_URL
+
+Questions get 1–4 StackExchange-style tags drawn (Zipf-like) from VOCAB, about half of them get
+QuestionMeta, and one benchmark role is persisted through the real skill-graph writer so the
+relevance / retrieval code paths see realistic data. Generation is deterministic per (n, seed).
+"""
+from __future__ import annotations
+import hashlib
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+# (display skill name, StackExchange tag); a few deliberately differ in spelling
+VOCAB: List[Tuple[str, str]] = [
+    ("Python", "python"), ("JavaScript", "javascript"), ("Java", "java"), ("SQL", "sql"),
+    ("Docker", "docker"), ("Kubernetes", "kubernetes"), ("AWS", "amazon-web-services"),
+    ("React", "reactjs"), ("Machine Learning", "machine-learning"), ("PostgreSQL", "postgresql"),
+    ("Git", "git"), ("Linux", "linux"), ("Go", "go"), ("TypeScript", "typescript"),
+    ("Pandas", "pandas"), ("NumPy", "numpy"), ("Django", "django"), ("Flask", "flask"),
+    ("Redis", "redis"), ("Kafka", "apache-kafka"), ("Spark", "apache-spark"), ("TensorFlow", "tensorflow"),
+    ("PyTorch", "pytorch"), ("REST", "rest"), ("GraphQL", "graphql"), ("Terraform", "terraform"),
+    ("CI/CD", "continuous-integration"), ("Microservices", "microservices"), ("C++", "c++"), ("Rust", "rust"),
+    ("Node.js", "node.js"), ("MongoDB", "mongodb"), ("Elasticsearch", "elasticsearch"), ("Airflow", "airflow"),
+    ("Bash", "bash"), ("Algorithms", "algorithm"), ("Data Structures", "data-structures"),
+    ("System Design", "system-design"), ("Concurrency", "concurrency"), ("Testing", "unit-testing"),
+]
+TAGS = [t for _, t in VOCAB]
+
+QTYPES = ["Behavioral", "Technical", "Coding", "System Design"]
+DIFFS = ["Easy", "Medium", "Hard"]
+ROLE_TITLE = "Benchmark Backend Engineer"
+
+_VERBS = ["optimize", "debug", "scale", "test", "design", "profile", "deploy", "refactor", "secure", "cache"]
+_NOUNS = ["queries", "a service", "memory usage", "a pipeline", "the build", "requests", "a cluster", "an index"]
+
+
+def _tag_weights() -> List[float]:
+    return [1.0 / (i + 1) ** 0.8 for i in range(len(TAGS))]
+
+def synth_question(i: int, rng: random.Random, weights: List[float]) -> Dict:
+    tags = sorted(set(rng.choices(TAGS, weights=weights, k=rng.randint(1, 4))))
+    verb, noun = rng.choice(_VERBS), rng.choice(_NOUNS)
+    title = f"How do I {verb} {noun} with {tags[0]}? (#{i})"
+    body = (f"I am trying to {verb} {noun} in a project that uses {', '.join(tags)}.\n\n"
+            f"What are the trade-offs, and how would you explain them in an interview?")
+    if rng.random() < 0.3:
+        body += f"\n\n```python\ndef f(x):\n    return x * {rng.randint(2, 99)}\n```"
+    return {"title": title, "body": body, "tags": tags, "score": int(rng.paretovariate(1.5) * 3)}
+
+
+def build_corpus(n: int, seed: int = 7, meta_ratio: float = 0.5, chunk: int = 20_000) -> Dict:
+    """Insert n synthetic questions (+ QuestionMeta for ~meta_ratio of them) and the benchmark role."""
+    from sqlalchemy import insert
+    from jd2interview.storage.db import init_db, session_scope, refresh_question_summaries, Question, QuestionMeta
+
+    init_db()
+    rng = random.Random(seed)
+    weights = _tag_weights()
+    t0 = datetime(2020, 1, 1)
+    q_tbl, m_tbl = Question.__table__, QuestionMeta.__table__
+    next_id = 1
+    for start in range(0, n, chunk):
+        q_rows, m_rows = [], []
+        for i in range(start, min(n, start + chunk)):
+            q = synth_question(i, rng, weights)
+            q_rows.append({
+                "id": next_id, "source": "synthetic", "external_id": f"syn-{i}",
+                "url": f"https://example.invalid/q/{i}", "title": q["title"], "body_markdown": q["body"],
+                "body_html": None, "tags_json": json.dumps(q["tags"]), "companies_json": "[]",
+                "question_type": None, "difficulty": None,
+                "created_at_source": t0 + timedelta(minutes=i), "score": q["score"],
+                "hash": hashlib.sha256(f"syn-{i}".encode()).hexdigest(), "fetched_at": t0,
+            })
+            if rng.random() < meta_ratio:
+                m_rows.append({
+                    "question_id": next_id, "qtype": rng.choice(QTYPES), "difficulty": rng.choice(DIFFS),
+                    "rubric_json": json.dumps({"signals": ["clarity", q["tags"][0]], "red_flags": [],
+                                               "scoring": "0-5 rubric"}),
+                    "updated_at": t0,
+                })
+            next_id += 1
+        with session_scope() as db:
+            db.execute(insert(q_tbl), q_rows)
+            if m_rows:
+                db.execute(insert(m_tbl), m_rows)
+            refresh_question_summaries(db, [r["id"] for r in q_rows])   # raw inserts bypass the upsert helpers
+    role_id = build_role()
+    return {"questions": n, "role_id": role_id}
+
+
+def build_role(n_skills: int = 12) -> int:
+    """Persist the benchmark role's skill graph through the regular writer; returns role_id."""
+    from jd2interview.skills.models import SkillGraph, SkillNode, Edge
+    from jd2interview.skills.persist import persist_skill_graph
+
+    picked = VOCAB[:n_skills]
+    nodes = [SkillNode(name=name, category="other", importance=round(1.0 - i * 0.05, 2),
+                       aliases=[tag] if tag != name.lower() else [])
+             for i, (name, tag) in enumerate(picked)]
+    edges = [Edge(source=picked[i][0], target=picked[i + 1][0], relation="related_to", weight=0.6)
+             for i in range(len(picked) - 1)]
+    role_id, _ = persist_skill_graph(SkillGraph(role_title=ROLE_TITLE, skills=nodes, edges=edges))
+    return role_id
@@ -0,0 +1,97 @@
+# benchmarks/explain.py
+"""
+Query-plan check: the hot query shapes must be served by the composite indexes from
+storage/migrations.py, not by full scans + temp B-trees (SQLite `EXPLAIN QUERY PLAN`).
+
+    python benchmarks/explain.py            # exit 1 if a query does not use its index
+    python benchmarks/explain.py --rows 20000 --verbose
+
+Runs against a throwaway SQLite database seeded with synthetic rows (then ANALYZEd), so the
+planner sees realistic statistics.
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _queries():
+    from sqlalchemy import desc, select
+    from jd2interview.storage.db import Answer, Question, QuestionMeta, QuestionSummary, SUMMARY_LIST_COLUMNS
+    browse = (select(Question.id, QuestionMeta.qtype).join(QuestionMeta, QuestionMeta.question_id == Question.id)
+              .order_by(Question.score.desc(), Question.id.desc()).limit(50))
+    by_score = (QuestionSummary.score.desc(), QuestionSummary.question_id.desc())
+    return [
+        # (label, statement, index that must appear in the plan)
+        ("browse order", browse, "ix_questions_score_id"),
+        ("source filter", select(Question.id).where(Question.source == "stackoverflow")
+         .order_by(Question.score.desc(), Question.id.desc()).limit(50), "ix_questions_source_score"),
+        ("meta type/difficulty", select(QuestionMeta.question_id)
+         .where(QuestionMeta.qtype == "Technical", QuestionMeta.difficulty == "Medium"), "ix_qmeta_type_diff_qid"),
+        ("best answer", select(Answer.body_markdown).where(Answer.question_id == 7)
+         .order_by(desc(Answer.is_accepted), desc(Answer.score)).limit(1), "ix_answers_best"),
+        ("answer upsert lookup", select(Answer.id)
+         .where(Answer.question_id == 7, Answer.external_id == "a7"), "uq_answers_qid_extid"),
+        # question_summary read model (ui/gradio_app._typed_summaries, retrieval/availability._relevant_summaries)
+        ("summary typed browse", select(*SUMMARY_LIST_COLUMNS)
+         .where(QuestionSummary.qtype.is_not(None), QuestionSummary.source.in_(["stackexchange", "generated"]))
+         .order_by(*by_score).limit(10000), "ix_qsummary_score"),
+        ("summary role scan", select(*SUMMARY_LIST_COLUMNS).order_by(*by_score).limit(10000), "ix_qsummary_score"),
+        ("summary type/difficulty", select(QuestionSummary.question_id)
+         .where(QuestionSummary.qtype == "Technical", QuestionSummary.difficulty == "Medium",
+                QuestionSummary.source.in_(["stackexchange", "generated"])), "ix_qsummary_type_diff_src"),
+    ]
+
+def _seed(rows: int):
+    from jd2interview.storage.db import Answer, Question, QuestionMeta, refresh_question_summaries, session_scope
+    rnd = random.Random(7)
+    sources = ["stackoverflow", "softwareengineering", "dba", "stackexchange", "generated"]
+    with session_scope() as db:
+        db.execute(Question.__table__.insert(), [
+            {"source": rnd.choice(sources), "external_id": f"q{i}", "url": "", "title": f"t{i}",
+             "score": rnd.randint(0, 500), "hash": f"h{i}"} for i in range(rows)])
+        db.execute(QuestionMeta.__table__.insert(), [
+            {"question_id": i + 1, "qtype": rnd.choice(["Technical", "Coding", "Behavioral", "System Design"]),
+             "difficulty": rnd.choice(["Easy", "Medium", "Hard"])} for i in range(rows)])
+        db.execute(Answer.__table__.insert(), [
+            {"question_id": i % rows + 1, "external_id": f"a{i}", "score": rnd.randint(0, 50),
+             "is_accepted": i % 5 == 0} for i in range(rows * 2)])
+        refresh_question_summaries(db)
+    from jd2interview.storage.db import get_engine
+    with get_engine().begin() as c:
+        c.exec_driver_sql("ANALYZE")
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, default=5000, help="synthetic questions to seed")
+    ap.add_argument("--verbose", action="store_true", help="print every plan")
+    args = ap.parse_args(argv)
+
+    tmp = tempfile.mkdtemp(prefix="jd2i_explain_")
+    os.environ.update({"DB_URL": f"sqlite:///{tmp}/explain.db", "TRACE_JSONL": ""})
+    sys.path.insert(0, str(ROOT / "src"))
+    from jd2interview.storage.db import get_engine, init_db
+
+    init_db()
+    _seed(args.rows)
+    failures = 0
+    with get_engine().connect() as conn:
+        for label, stmt, index in _queries():
+            sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+            plan = [r[-1] for r in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all()]
+            ok = any(index in step for step in plan) and not any("USE TEMP B-TREE FOR ORDER BY" in s for s in plan)
+            failures += not ok
+            print(f"[explain] {'ok  ' if ok else 'FAIL'} {label:<24} expects {index}")
+            if args.verbose or not ok:
+                for step in plan:
+                    print(f"           {step}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+# benchmarks/fakes.py
+"""
+Deterministic stand-ins for the OpenAI chat and embedding APIs.
+
+    from fakes import install
+    install(chat_latency_ms=50, embed_latency_ms=5)
+
+`FakeChatModel` is a real LangChain chat model: it runs through the registry in
+jd2interview.utils.llm, the usage callback and `with_structured_output`, and returns schema-valid
+objects (QMeta, Suitability, SkillGraph, GenQABatch, GenQList, ...) synthesised from the pydantic
+schema and seeded by the prompt text, so the same prompt always gets the same answer. A model bound
+with `bind_tools([schema])` streams the answer as tool-call argument chunks spread over its latency.
+"""
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+import typing
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel
+
+from corpus import VOCAB, QTYPES, DIFFS
+
+_WORDS = ["latency", "trade-off", "invariant", "throughput", "consistency", "ownership", "failure mode",
+          "bottleneck", "cache", "index", "rollback", "edge case"]
+
+
+def _rng(*parts: str) -> random.Random:
+    return random.Random(int(hashlib.sha256("\x1f".join(parts).encode()).hexdigest()[:16], 16))
+
+def _hints(text: str) -> Dict[str, Any]:
+    m = re.search(r"(?:Requested count:|Generate)\s*(\d+)", text)
+    return {"count": int(m.group(1)) if m else None}
+
+
+# ---------- schema-driven object synthesis ----------
+def _options_from_description(field) -> Optional[List[str]]:
+    desc = getattr(field, "description", None) or ""
+    if desc.lower().startswith("one of"):
+        opts = re.findall(r'"([^"]+)"', desc)
+        return opts or None
+    return None
+
+def _fake_value(tp, name: str, field, rng: random.Random, hints: Dict[str, Any]):
+    origin, args = typing.get_origin(tp), typing.get_args(tp)
+    if origin is typing.Literal:
+        return rng.choice(args)
+    if origin is typing.Union or str(origin) == "types.UnionType":
+        non_none = [a for a in args if a is not type(None)]
+        return _fake_value(non_none[0], name, field, rng, hints) if non_none else None
+    if origin is typing.Annotated:
+        return _fake_value(args[0], name, field, rng, hints)
+    if origin in (list, List):
+        inner = args[0] if args else str
+        n = hints.get("count") if name == "items" and hints.get("count") else rng.randint(2, 4)
+        if inner is str:
+            return [rng.choice(VOCAB)[1] for _ in range(n)]
+        return [_fake_value(inner, name, None, rng, hints) for _ in range(n)]
+    if origin in (dict, Dict) or tp is dict:
+        return {"signals": rng.sample(_WORDS, 2), "red_flags": rng.sample(_WORDS, 1), "scoring": "0-5 rubric"}
+    if isinstance(tp, type) and issubclass(tp, BaseModel):
+        return {n: _fake_value(f.annotation, n, f, rng, hints) for n, f in tp.model_fields.items()}
+    if tp is bool:
+        return rng.random() < 0.8
+    if tp is int:
+        return rng.randint(1, 5)
+    if tp in (float, Decimal):
+        return round(rng.uniform(0.3, 1.0), 2)
+    # str
+    opts = _options_from_description(field) if field is not None else None
+    if opts:
+        return rng.choice(opts)
+    if name == "type":
+        return rng.choice(QTYPES)
+    if name == "difficulty":
+        return rng.choice(DIFFS)
+    if name in ("question", "title"):
+        return f"How would you handle {rng.choice(_WORDS)} when working with {rng.choice(VOCAB)[0]}?"
+    if name in ("url", "answer"):
+        return None if field is not None and not field.is_required() else ""
+    return f"{rng.choice(_WORDS)} {rng.choice(_WORDS)}"
+
+def _fake_skill_graph(rng: random.Random) -> Dict:
+    picked = rng.sample(VOCAB, rng.randint(8, 16))
+    skills = [{"name": name, "category": "other", "aliases": [tag] if tag != name.lower() else [],
+               "importance": round(1.0 - i * 0.04, 2), "level": "intermediate"}
+              for i, (name, tag) in enumerate(picked)]
+    rels = ["requires", "related_to", "part_of", "co_occurs_with"]
+    edges = [{"source": picked[i][0], "target": picked[j][0], "relation": rng.choice(rels),
+              "weight": round(rng.uniform(0.3, 0.9), 2)}
+             for i in range(len(picked)) for j in range(i + 1, len(picked)) if rng.random() < 0.15]
+    edges.append({"source": picked[0][0], "target": "pytest", "relation": "uses_tool", "weight": 0.5})
+    return {"role_title": "Benchmark Backend Engineer", "tags": [t for _, t in picked[:5]],
+            "skills": skills, "edges": edges}
+
+def fake_instance(schema, prompt_text: str) -> BaseModel:
+    rng = _rng(schema.__name__, prompt_text)
+    if schema.__name__ == "SkillGraph":
+        return schema.model_validate(_fake_skill_graph(rng))
+    hints = _hints(prompt_text)
+    data = {n: _fake_value(f.annotation, n, f, rng, hints) for n, f in schema.model_fields.items()}
+    return schema.model_validate(data)
+
+def fake_parsed_jd(prompt_text: str) -> Dict:
+    rng = _rng("parse", prompt_text)
+    picked = rng.sample(VOCAB, 10)
+    return {"job_title": "Benchmark Backend Engineer", "skills": [n for n, _ in picked[:7]],
+            "tools": [n for n, _ in picked[7:]], "responsibilities": ["Build services", "Own reliability"],
+            "experience": ["3+ years"]}
+
+
+# ---------- LangChain chat model ----------
+class FakeChatModel(BaseChatModel):
+    model_name: str = "fake-chat"
+    latency_s: float = 0.0
+    stream_chunk_chars: int = 48
+
+    @property
+    def _llm_type(self) -> str:
+        return "jd2i-fake"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model": self.model_name}
+
+    def _respond(self, messages: List[BaseMessage], schema=None) -> ChatResult:
+        text = "\n".join(str(m.content) for m in messages)
+        out = fake_instance(schema, text).model_dump_json() if schema is not None else json.dumps(fake_parsed_jd(text))
+        p_tok, c_tok = max(1, len(text) // 4), max(1, len(out) // 4)
+        msg = AIMessage(content=out, usage_metadata={"input_tokens": p_tok, "output_tokens": c_tok,
+                                                     "total_tokens": p_tok + c_tok})
+        return ChatResult(generations=[ChatGeneration(message=msg)],
+                          llm_output={"model_name": self.model_name,
+                                      "token_usage": {"prompt_tokens": p_tok, "completion_tokens": c_tok}})
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return self._respond(messages, kwargs.get("fake_schema"))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        return self._respond(messages, kwargs.get("fake_schema"))
+
+    def with_structured_output(self, schema, *, method: Optional[str] = None, **kwargs):
+        return self.bind(fake_schema=schema) | RunnableLambda(lambda m: schema.model_validate_json(m.content))
+
+    def bind_tools(self, tools, *, tool_choice=None, **kwargs):
+        return self.bind(fake_schema=tools[0])
+
+    def _stream_pieces(self, messages, schema):
+        text = "\n".join(str(m.content) for m in messages)
+        out = fake_instance(schema, text).model_dump_json()
+        pieces = [out[i:i + self.stream_chunk_chars] for i in range(0, len(out), self.stream_chunk_chars)]
+        p_tok, c_tok = max(1, len(text) // 4), max(1, len(out) // 4)
+        usage = {"input_tokens": p_tok, "output_tokens": c_tok, "total_tokens": p_tok + c_tok}
+        return schema.__name__, pieces, usage
+
+    def _chunk(self, name, piece, first, usage=None) -> ChatGenerationChunk:
+        tcc = [{"name": name if first else None, "args": piece, "id": "call_fake" if first else None, "index": 0}]
+        return ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=tcc, usage_metadata=usage))
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        name, pieces, usage = self._stream_pieces(messages, kwargs.get("fake_schema"))
+        for i, piece in enumerate(pieces):
+            if self.latency_s:
+                time.sleep(self.latency_s / len(pieces))
+            yield self._chunk(name, piece, i == 0, usage if i == len(pieces) - 1 else None)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        name, pieces, usage = self._stream_pieces(messages, kwargs.get("fake_schema"))
+        for i, piece in enumerate(pieces):
+            if self.latency_s:
+                await asyncio.sleep(self.latency_s / len(pieces))
+            yield self._chunk(name, piece, i == 0, usage if i == len(pieces) - 1 else None)
+
+
+# ---------- embeddings ----------
+def fake_embedder(dim: int = 256, latency_s: float = 0.0):
+    """Hashed bag-of-words vectors: deterministic, L2-normalised, texts sharing words are similar."""
+    import numpy as np
+
+    def _embed(texts: List[str], model: str) -> List[List[float]]:
+        if latency_s:
+            time.sleep(latency_s)
+        out = np.zeros((len(texts), dim), dtype=np.float32)
+        for i, t in enumerate(texts):
+            for tok in re.findall(r"[a-z0-9+#.]+", (t or "").lower()):
+                h = int(hashlib.md5(tok.encode()).hexdigest()[:8], 16)
+                out[i, h % dim] += 1.0 if (h >> 31) & 1 else -1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (out / norms).tolist()
+
+    return _embed
+
+
+def install(chat_latency_ms: float = 0.0, embed_latency_ms: float = 0.0, dim: int = 256):
+    """Route every chat model and embed_texts call in this process to the fakes."""
+    from jd2interview.utils.llm import set_chat_factory
+    from jd2interview.retrieval.embeddings import set_embedder
+
+    def _factory(model: str, temperature: float, callbacks):
+        return FakeChatModel(model_name=f"fake-{model}", latency_s=chat_latency_ms / 1000.0, callbacks=callbacks)
+
+    set_chat_factory(_factory)
+    set_embedder(fake_embedder(dim=dim, latency_s=embed_latency_ms / 1000.0))
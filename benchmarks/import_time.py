@@ -0,0 +1,78 @@
+# benchmarks/import_time.py
+"""
+Import-time budget check (`python -X importtime`).
+
+    python benchmarks/import_time.py            # exit 1 if any module is over budget
+    python benchmarks/import_time.py --runs 5   # best-of-N to smooth out noisy machines
+
+Budgets are cumulative import time in milliseconds of the module itself. `forbid` lists heavy
+packages that must NOT be pulled in just by importing the module (they belong behind lazy factories).
+"""
+from __future__ import annotations
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+HEAVY = ("langchain", "langchain_openai", "langchain_core", "openai", "numpy", "gradio", "markdown", "bleach")
+
+# module → (budget_ms, forbidden top-level packages)
+BUDGETS = {
+    "jd2interview.cli":               (150, HEAVY),
+    "jd2interview.utils.config":      (150, HEAVY),
+    "jd2interview.storage.db":        (750, HEAVY),   # storage-only tools / workers
+    "jd2interview.jobs.runner":       (800, HEAVY),
+    "jd2interview.parsing.extract":   (200, HEAVY),
+    "jd2interview.enrich.metadata":   (900, ("langchain", "langchain_openai", "openai", "gradio")),
+    "jd2interview.ui.gradio_app":     (None, ("langchain", "langchain_openai", "openai", "markdown", "bleach")),
+}
+
+
+def measure(module: str) -> tuple[float, set]:
+    """Return (cumulative_ms, top-level packages imported) for `import module` in a fresh interpreter."""
+    code = f"import sys, {module}; print(','.join(sorted({{m.split('.')[0] for m in sys.modules}})))"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(ROOT / "src"), os.environ.get("PYTHONPATH", "")])}
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, env=env, cwd=ROOT)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    cum_us = None
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            cum_us = int(parts[1])
+    loaded = set((proc.stdout.strip().splitlines() or [""])[-1].split(","))
+    return (cum_us or 0) / 1000.0, loaded
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=3, help="best-of-N runs per module")
+    ap.add_argument("modules", nargs="*", help="subset of modules to check (default: all budgets)")
+    args = ap.parse_args(argv)
+
+    failed = 0
+    for module in args.modules or list(BUDGETS):
+        budget, forbid = BUDGETS.get(module, (None, ()))
+        best, loaded = None, set()
+        for _ in range(max(1, args.runs)):
+            ms, loaded = measure(module)
+            best = ms if best is None else min(best, ms)
+        leaked = sorted(set(forbid) & loaded)
+        over = budget is not None and best > budget
+        ok = not over and not leaked
+        failed += 0 if ok else 1
+        print(f"{'OK  ' if ok else 'FAIL'} {module:32s} {best:8.1f} ms"
+              + (f" (budget {budget} ms)" if budget is not None else "")
+              + (f" imports heavy: {leaked}" if leaked else ""))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+# benchmarks/replay_server.py
+"""
+Local stand-in for the StackExchange and GitHub APIs.
+
+    python benchmarks/replay_server.py --port 8765                 # replay fixtures / synthesise
+    python benchmarks/replay_server.py --port 8765 --record        # proxy upstream and save fixtures
+
+then point the app at it:
+
+    STACKEXCHANGE_API_URL=http://127.0.0.1:8765/2.3 GITHUB_API_URL=http://127.0.0.1:8765
+
+Responses are looked up in `fixtures/` by (path, sorted query params minus `key`). A miss is
+answered with a deterministic synthetic response (same request → same body), or, with --record,
+fetched from the real API and stored so later runs replay it offline.
+"""
+from __future__ import annotations
+import argparse
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from corpus import TAGS, synth_question
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+UPSTREAM = {"se": "https://api.stackexchange.com", "gh": "https://api.github.com"}
+SYNTH_PAGES = 5   # synthetic StackExchange searches report has_more up to this page
+
+
+def fixture_key(path: str, params: Dict[str, str]) -> str:
+    canon = path + "?" + urllib.parse.urlencode(sorted((k, v) for k, v in params.items() if k != "key"))
+    return hashlib.sha256(canon.encode()).hexdigest()[:24]
+
+
+# ---------- synthetic responses ----------
+def _seed(path: str, params: Dict[str, str]) -> random.Random:
+    return random.Random(fixture_key(path, params))
+
+def synth_stackexchange(path: str, params: Dict[str, str]) -> Dict:
+    rng = _seed(path, params)
+    page, size = int(params.get("page", 1)), int(params.get("pagesize", 30))
+    tagged = [t for t in (params.get("tagged") or "").split(";") if t]
+    weights = [1.0] * len(TAGS)
+    items = []
+    for i in range(size):
+        q = synth_question(page * 1000 + i, rng, weights)
+        tags = sorted(set(tagged + q["tags"]))
+        qid = int(hashlib.sha256(f"{params.get('site')}|{';'.join(tagged)}|{page}|{i}".encode()).hexdigest()[:12], 16)
+        items.append({
+            "question_id": qid, "link": f"https://{params.get('site', 'stackoverflow')}.example.invalid/q/{qid}",
+            "title": q["title"], "body": f"<p>{q['body']}</p>", "body_markdown": q["body"],
+            "tags": tags, "score": q["score"], "creation_date": 1_600_000_000 + qid % 100_000_000,
+        })
+    return {"items": items, "has_more": page < SYNTH_PAGES, "quota_max": 10000, "quota_remaining": 9999}
+
+def synth_github_contents(path: str) -> Dict:
+    rng = random.Random(path)
+    lines = [f"# Interview questions ({path})", ""]
+    for i in range(60):
+        tag = rng.choice(TAGS)
+        lines.append(f"- What are the most common pitfalls when using {tag} in production (variant {i})?")
+    content = base64.b64encode("\n".join(lines).encode()).decode()
+    return {"name": path.rsplit("/", 1)[-1], "path": path, "encoding": "base64", "content": content}
+
+
+# ---------- server ----------
+class ReplayHandler(BaseHTTPRequestHandler):
+    server_version = "jd2i-replay/0.1"
+
+    def log_message(self, fmt, *args):   # keep benchmark output clean
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def _route(self, path: str) -> Optional[Tuple[str, str]]:
+        if path.startswith("/2.3/"):
+            return "se", path
+        if path.startswith("/repos/") and "/contents/" in path:
+            return "gh", path
+        return None
+
+    def do_GET(self):
+        parsed = urllib.parse.urlsplit(self.path)
+        params = dict(urllib.parse.parse_qsl(parsed.query))
+        route = self._route(parsed.path)
+        if route is None:
+            return self._send(404, {"error": f"no route for {parsed.path}"})
+        api, path = route
+        srv: ReplayServer = self.server
+        srv.hits[api] = srv.hits.get(api, 0) + 1
+        if srv.latency_s:
+            time.sleep(srv.latency_s)
+
+        fx = srv.fixtures / api / f"{fixture_key(path, params)}.json"
+        if fx.exists():
+            return self._send(200, json.loads(fx.read_text(encoding="utf-8")))
+        if srv.record:
+            status, body = _fetch_upstream(UPSTREAM[api] + self.path)
+            if status == 200:
+                fx.parent.mkdir(parents=True, exist_ok=True)
+                fx.write_text(json.dumps(body), encoding="utf-8")
+            return self._send(status, body)
+        if api == "se":
+            return self._send(200, synth_stackexchange(path, params))
+        return self._send(200, synth_github_contents(path.split("/contents/", 1)[1]))
+
+    def _send(self, status: int, body: Dict):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr, fixtures: Path = FIXTURES, record: bool = False,
+                 latency_ms: float = 0.0, verbose: bool = False):
+        super().__init__(addr, ReplayHandler)
+        self.fixtures, self.record, self.verbose = Path(fixtures), record, verbose
+        self.latency_s = latency_ms / 1000.0
+        self.hits: Dict[str, int] = {}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> Dict[str, str]:
+        """Settings overrides that point the app at this server."""
+        return {"STACKEXCHANGE_API_URL": f"{self.base_url}/2.3", "GITHUB_API_URL": self.base_url}
+
+
+def _fetch_upstream(url: str) -> Tuple[int, Dict]:
+    req = urllib.request.Request(url, headers={"User-Agent": "jd2interview-replay/0.1",
+                                               "Accept-Encoding": "identity"})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as r:
+            return r.status, json.loads(r.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        return e.code, {"error": str(e)}
+
+def start_server(port: int = 0, **kwargs) -> ReplayServer:
+    """Start a replay server on a background thread (port 0 = pick a free port)."""
+    srv = ReplayServer(("127.0.0.1", port), **kwargs)
+    threading.Thread(target=srv.serve_forever, name="jd2i-replay", daemon=True).start()
+    return srv
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--fixtures", default=str(FIXTURES))
+    ap.add_argument("--record", action="store_true", help="proxy misses to the real APIs and save them")
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="artificial delay per response")
+    args = ap.parse_args(argv)
+    srv = ReplayServer(("127.0.0.1", args.port), fixtures=Path(args.fixtures), record=args.record,
+                       latency_ms=args.latency_ms, verbose=True)
+    print(f"[replay] serving on {srv.base_url} (fixtures={args.fixtures}, record={args.record})")
+    for k, v in srv.env().items():
+        print(f"  {k}={v}")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+# benchmarks/run.py
+"""
+Offline performance benchmarks: fake LLM + fake embeddings + local StackExchange/GitHub replay server.
+
+    python benchmarks/run.py                          # 1k + 10k corpora, all stages, 5 reps
+    python benchmarks/run.py --sizes 100k,1m --reps 3
+    python benchmarks/run.py --check                  # exit 1 if a stage regresses past thresholds.json
+                                                      # or a hot query loses its index (explain.py)
+    python benchmarks/run.py --chat-latency-ms 300    # model a slow LLM instead of pure overhead
+
+Stages (per corpus size, each timed `--reps` times):
+  crawl      fetch StackExchange + GitHub pages from the replay server
+  persist    persist_questions() of the crawled items
+  relevance  relevant_question_ids_for_role()
+  retrieval  fetch_typed_questions_for_role()
+  classify   classify_role_questions_stream() over --classify-items unclassified questions
+  package    build_interview_package() (gate + embeddings + picking; package cache bypassed)
+  render     the UI's question-list HTML for the retrieved items
+
+Each size runs in its own interpreter against a fresh copy of a cached synthetic corpus
+(benchmarks/.work/), so DB_URL and the lazily created engine are per size. Results (p50/p95/mean
+latency and items/s per stage) are printed and written to --out.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+WORK = HERE / ".work"
+THRESHOLDS = HERE / "thresholds.json"
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+STAGES = ["crawl", "persist", "relevance", "retrieval", "classify", "package", "render"]
+CORPUS_VERSION = 2   # bump when corpus.py changes shape, to rebuild cached corpora
+
+
+# ---------- stats ----------
+def _pct(xs: List[float], q: float) -> float:
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, max(0, int(round(q * (len(xs) - 1)))))] if xs else 0.0
+
+def _stats(samples: List[Tuple[float, int]]) -> Dict:
+    secs = [s for s, _ in samples]
+    items = sum(n for _, n in samples)
+    return {
+        "reps": len(samples),
+        "p50_ms": round(_pct(secs, 0.50) * 1000, 2),
+        "p95_ms": round(_pct(secs, 0.95) * 1000, 2),
+        "mean_ms": round(sum(secs) / len(secs) * 1000, 2) if secs else 0.0,
+        "items": items,
+        "items_per_s": round(items / sum(secs), 1) if sum(secs) else 0.0,
+    }
+
+def _timed(fn: Callable[[int], int], reps: int, warmup: bool = False) -> Dict:
+    if warmup:
+        fn(-1)
+    samples = []
+    for rep in range(reps):
+        t0 = time.perf_counter()
+        n = fn(rep)
+        samples.append((time.perf_counter() - t0, int(n or 0)))
+    return _stats(samples)
+
+
+# ---------- worker (one corpus size, own interpreter) ----------
+def _worker(args) -> Dict:
+    sys.path.insert(0, str(ROOT / "src"))
+    from fakes import install
+    install(chat_latency_ms=args.chat_latency_ms, embed_latency_ms=args.embed_latency_ms)
+
+    from jd2interview.storage.db import SessionLocal, Role, init_db
+    from corpus import ROLE_TITLE
+    init_db()   # cached corpora from older schemas get new tables + migrations
+    with SessionLocal() as db:
+        role_id = db.query(Role.id).filter(Role.name == ROLE_TITLE).scalar()
+    if role_id is None:
+        raise SystemExit(f"benchmark role {ROLE_TITLE!r} missing from corpus")
+
+    from jd2interview.skills.query import top_k_skills_for_role
+    skills = [s.lower() for s, _ in top_k_skills_for_role(role_id, k=8)]
+    stages = args.stages
+    out: Dict[str, Dict] = {}
+    crawled: Dict[int, list] = {}
+
+    def crawl(rep: int) -> int:
+        from jd2interview.crawl.stackoverflow_requests import fetch_stackoverflow_requests
+        from jd2interview.crawl.github_lists import fetch_github_questions
+        items = list(fetch_stackoverflow_requests(site=f"bench{rep}", tags_any=skills[:2], query=None,
+                                                  pages=2, page_size=50, sleep_s=0))
+        items += list(fetch_github_questions("bench", "interview-lists", f"rep{rep}.md", "github"))
+        crawled[rep] = items
+        return len(items)
+
+    def persist(rep: int) -> int:
+        from jd2interview.crawl.pipeline import persist_questions
+        return persist_questions(crawled[rep])
+
+    def relevance(rep: int) -> int:
+        from jd2interview.retrieval.availability import relevant_question_ids_for_role
+        with SessionLocal() as db:
+            return len(relevant_question_ids_for_role(db, role_id, topk=8))
+
+    def retrieval(rep: int) -> int:
+        from jd2interview.retrieval.availability import fetch_typed_questions_for_role
+        return len(fetch_typed_questions_for_role(role_id))
+
+    def classify(rep: int) -> int:
+        from jd2interview.enrich.metadata import classify_role_questions_stream
+        last = ""
+        for last in classify_role_questions_stream(role_id, batch_size=25, max_items=args.classify_items):
+            pass
+        return int(last.split("Classified ", 1)[1].split(",", 1)[0]) if "Classified " in last else 0
+
+    def package(rep: int) -> int:
+        from jd2interview.generation.package import build_interview_package
+        return len(build_interview_package(role_id, total_q=10, use_cache=False)["package"])
+
+    def render(rep: int) -> int:
+        from jd2interview.ui.gradio_app import _render_questions_html
+        _render_questions_html(render_items)
+        return len(render_items)
+
+    fns = {"crawl": crawl, "persist": persist, "relevance": relevance, "retrieval": retrieval,
+           "classify": classify, "package": package, "render": render}
+    render_items = []
+    for stage in stages:
+        if stage == "persist" and "crawl" not in stages:
+            for rep in range(args.reps):
+                crawl(rep)
+        if stage == "render":
+            from jd2interview.retrieval.availability import fetch_typed_questions_for_role
+            render_items = fetch_typed_questions_for_role(role_id)
+        warm = stage in ("relevance", "retrieval", "render")
+        out[stage] = _timed(fns[stage], args.reps, warmup=warm)
+        print(f"[bench] {args.worker:>4} {stage:<10} p50={out[stage]['p50_ms']:>9.1f}ms "
+              f"p95={out[stage]['p95_ms']:>9.1f}ms  {out[stage]['items_per_s']:>9.1f} items/s", flush=True)
+    return out
+
+
+# ---------- driver ----------
+def _corpus_db(label: str) -> Path:
+    return WORK / f"corpus_{label}_v{CORPUS_VERSION}.db"
+
+def _env(db: Path, extra: Dict[str, str]) -> Dict[str, str]:
+    return {**os.environ, **extra,
+            "PYTHONPATH": os.pathsep.join([str(ROOT / "src"), str(HERE), os.environ.get("PYTHONPATH", "")]),
+            "DB_URL": f"sqlite:///{db}", "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY") or "bench-offline",
+            "TRACE_JSONL": "", "METRICS_EVENTS_JSONL": ""}
+
+def _copy_db(src: Path, dst: Path):
+    """Consistent copy of a SQLite file including pages still in its WAL (a plain file copy misses them)."""
+    import sqlite3
+    for p in (dst, Path(f"{dst}-wal"), Path(f"{dst}-shm")):
+        p.unlink(missing_ok=True)
+    s, d = sqlite3.connect(src), sqlite3.connect(dst)
+    try:
+        s.backup(d)
+    finally:
+        s.close(); d.close()
+
+def _ensure_corpus(label: str, rebuild: bool):
+    db = _corpus_db(label)
+    if db.exists() and not rebuild:
+        return db
+    db.unlink(missing_ok=True)
+    WORK.mkdir(parents=True, exist_ok=True)
+    print(f"[bench] building {label} corpus ({SIZES[label]:,} questions) → {db}", flush=True)
+    t0 = time.perf_counter()
+    code = f"from corpus import build_corpus; print(build_corpus({SIZES[label]}))"
+    subprocess.run([sys.executable, "-c", code], env=_env(db, {}), cwd=HERE, check=True)
+    print(f"[bench] corpus {label} built in {time.perf_counter() - t0:.1f}s", flush=True)
+    return db
+
+def check_thresholds(results: Dict[str, Dict], path: Path = THRESHOLDS) -> List[str]:
+    """Return one message per stage that is slower (p95) or lower-throughput than its threshold."""
+    if not path.exists():
+        return [f"no thresholds file at {path}"]
+    spec = json.loads(path.read_text(encoding="utf-8"))
+    tol = float(spec.get("tolerance", 0.0))
+    failures = []
+    for label, stages in results.items():
+        for stage, st in stages.items():
+            th = spec.get("sizes", {}).get(label, {}).get(stage)
+            if not th:
+                continue
+            if "p95_ms" in th and st["p95_ms"] > th["p95_ms"] * (1 + tol):
+                failures.append(f"{label}/{stage}: p95 {st['p95_ms']}ms > {th['p95_ms']}ms (+{tol:.0%})")
+            if "min_items_per_s" in th and st["items_per_s"] < th["min_items_per_s"] * (1 - tol):
+                failures.append(f"{label}/{stage}: {st['items_per_s']} items/s < {th['min_items_per_s']} (-{tol:.0%})")
+    return failures
+
+def write_thresholds(results: Dict[str, Dict], margin: float, path: Path = THRESHOLDS):
+    spec = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {"tolerance": 0.25, "sizes": {}}
+    for label, stages in results.items():
+        dst = spec["sizes"].setdefault(label, {})
+        for stage, st in stages.items():
+            dst[stage] = {"p95_ms": round(st["p95_ms"] * margin, 1),
+                          "min_items_per_s": round(st["items_per_s"] / margin, 1)}
+    path.write_text(json.dumps(spec, indent=2) + "\n", encoding="utf-8")
+    print(f"[bench] thresholds written → {path}")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", default="1k,10k", help=f"comma-separated subset of {list(SIZES)}")
+    ap.add_argument("--stages", default=",".join(STAGES), help=f"comma-separated subset of {STAGES}")
+    ap.add_argument("--reps", type=int, default=5)
+    ap.add_argument("--chat-latency-ms", type=float, default=0.0, help="fake chat model latency per call")
+    ap.add_argument("--embed-latency-ms", type=float, default=0.0, help="fake embedding latency per call")
+    ap.add_argument("--http-latency-ms", type=float, default=0.0, help="replay server latency per response")
+    ap.add_argument("--classify-items", type=int, default=50, help="questions classified per classify rep")
+    ap.add_argument("--rebuild", action="store_true", help="regenerate cached corpora")
+    ap.add_argument("--out", default=str(HERE / "results" / "latest.json"))
+    ap.add_argument("--check", action="store_true", help="fail (exit 1) on regressions vs thresholds.json")
+    ap.add_argument("--write-thresholds", type=float, metavar="MARGIN", default=None,
+                    help="store measured p95 × MARGIN (and items/s ÷ MARGIN) as the new thresholds")
+    ap.add_argument("--worker", help=argparse.SUPPRESS)
+    ap.add_argument("--result", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+    args.stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    bad = [s for s in args.stages if s not in STAGES]
+    if bad:
+        ap.error(f"unknown stage(s) {bad}; expected a subset of {STAGES}")
+
+    if args.worker:
+        res = _worker(args)
+        Path(args.result).write_text(json.dumps(res), encoding="utf-8")
+        return 0
+
+    sizes = [s.strip().lower() for s in args.sizes.split(",") if s.strip()]
+    for s in sizes:
+        if s not in SIZES:
+            ap.error(f"unknown size {s!r}; expected one of {list(SIZES)}")
+
+    from replay_server import start_server
+    srv = start_server(latency_ms=args.http_latency_ms)
+    results: Dict[str, Dict] = {}
+    try:
+        for label in sizes:
+            corpus = _ensure_corpus(label, args.rebuild)
+            run_db = WORK / f"run_{label}.db"
+            _copy_db(corpus, run_db)   # stages write; keep the cached corpus pristine
+            result = WORK / f"result_{label}.json"
+            cmd = [sys.executable, str(Path(__file__).resolve()), "--worker", label, "--result", str(result),
+                   "--reps", str(args.reps), "--stages", ",".join(args.stages),
+                   "--chat-latency-ms", str(args.chat_latency_ms), "--embed-latency-ms", str(args.embed_latency_ms),
+                   "--classify-items", str(args.classify_items)]
+            subprocess.run(cmd, env=_env(run_db, srv.env()), cwd=HERE, check=True)
+            results[label] = json.loads(result.read_text(encoding="utf-8"))
+            for p in (run_db, Path(f"{run_db}-wal"), Path(f"{run_db}-shm")):
+                p.unlink(missing_ok=True)
+    finally:
+        srv.shutdown()
+
+    report = {"meta": {"ts": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0],
+                       "reps": args.reps, "chat_latency_ms": args.chat_latency_ms,
+                       "embed_latency_ms": args.embed_latency_ms, "http_latency_ms": args.http_latency_ms,
+                       "classify_items": args.classify_items, "replay_hits": srv.hits},
+              "sizes": results}
+    out = Path(args.out); out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"[bench] results → {out}")
+
+    if args.write_thresholds:
+        write_thresholds(results, args.write_thresholds)
+    if args.check:
+        failures = check_thresholds(results)
+        # query plans: explain.py seeds its own throwaway DB, so it runs in a separate interpreter
+        if subprocess.run([sys.executable, str(HERE / "explain.py")], cwd=HERE).returncode != 0:
+            failures.append("query plan check (benchmarks/explain.py) failed")
+        for f in failures:
+            print(f"[bench] REGRESSION {f}")
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
-from jd2interview.ui.gradio_app import main
+import sys
+from jd2interview.cli import main
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,249 @@
+# src/jd2interview/batch/pipeline.py
+from __future__ import annotations
+import json
+import multiprocessing as mp
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from jd2interview.parsing.extract import load_processed_jds
+from jd2interview.utils.config import settings
+from jd2interview.utils.metrics import llm_context, role_cost_summary
+
+# parse → skill graph → crawl → classify → package, in this order
+STAGES = ["parse", "skills", "crawl", "classify", "package"]
+
+
+@dataclass
+class BatchConfig:
+    input_dir: str
+    out_dir: str = "data/batch_out"
+    executor: str = "thread"                 # "thread" | "process"
+    workers: int = 4
+    stage_limits: Dict[str, int] = field(default_factory=lambda: dict(settings.BATCH_STAGE_LIMITS))
+    stages: List[str] = field(default_factory=lambda: list(STAGES))
+    package_total: int = 10
+    resume: bool = True
+
+    @property
+    def checkpoint_dir(self) -> Path:
+        return Path(self.out_dir) / "checkpoints"
+
+    @property
+    def results_path(self) -> Path:
+        return Path(self.out_dir) / "results.jsonl"
+
+    @property
+    def summary_path(self) -> Path:
+        return Path(self.out_dir) / "summary.json"
+
+
+# ---------- per-stage concurrency limits ----------
+# Set per worker (thread pool: shared in-process; process pool: via initializer with mp semaphores).
+_LIMITS: Dict[str, object] = {}
+
+def _init_limits(limits: Dict[str, object]):
+    global _LIMITS
+    _LIMITS = limits
+
+@contextmanager
+def _stage_slot(stage: str):
+    sem = _LIMITS.get(stage)
+    if sem is None:
+        yield
+        return
+    sem.acquire()
+    try:
+        yield
+    finally:
+        sem.release()
+
+
+# ---------- checkpoints ----------
+def _ckpt_path(cfg: BatchConfig, job_id: str) -> Path:
+    return cfg.checkpoint_dir / f"{job_id}.json"
+
+def _load_ckpt(cfg: BatchConfig, job_id: str) -> Dict:
+    p = _ckpt_path(cfg, job_id)
+    if cfg.resume and p.exists():
+        try:
+            return json.loads(p.read_text(encoding="utf-8"))
+        except Exception:
+            pass
+    return {"job_id": job_id, "stages": {}}
+
+def _save_ckpt(cfg: BatchConfig, ckpt: Dict):
+    p = _ckpt_path(cfg, ckpt["job_id"])
+    tmp = p.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(ckpt, ensure_ascii=False, default=str), encoding="utf-8")
+    tmp.replace(p)   # atomic: a crash never leaves a half-written checkpoint
+
+
+# ---------- stages ----------
+def _run_stage(stage: str, jd_text: str, done: Dict[str, Dict], cfg: BatchConfig) -> Dict:
+    if stage == "parse":
+        from jd2interview.parsing.extract import extract_structured
+        return {"parsed": extract_structured(jd_text)}
+
+    if stage == "skills":
+        from jd2interview.skills.service import build_and_store_skill_graph
+        role_id, graph, ranked = build_and_store_skill_graph(done["parse"]["parsed"], jd_text)
+        return {"role_id": role_id, "role_title": graph.role_title, "ranked": ranked,
+                "n_nodes": len(graph.skills), "n_edges": len(graph.edges)}
+
+    role_id = int(done["skills"]["role_id"])
+    if stage == "crawl":
+        from jd2interview.crawl.role_aware import crawl_for_role
+        return crawl_for_role(role_id)
+
+    if stage == "classify":
+        from jd2interview.enrich.metadata import classify_role_questions_stream
+        last = ""
+        for last in classify_role_questions_stream(role_id, batch_size=25, max_items=None):
+            pass
+        return {"status": last}
+
+    if stage == "package":
+        from jd2interview.generation.package import build_interview_package
+        return build_interview_package(role_id, total_q=cfg.package_total)
+
+    raise ValueError(f"Unknown stage: {stage!r}")
+
+def process_jd(job_id: str, jd_text: str, cfg: BatchConfig) -> Dict:
+    """Run the configured stages for one JD, checkpointing after each stage."""
+    ckpt = _load_ckpt(cfg, job_id)
+    done: Dict[str, Dict] = ckpt["stages"]
+    timings: Dict[str, float] = {}
+    for stage in cfg.stages:
+        if stage in done:
+            continue
+        t0 = time.perf_counter()
+        role_id = (done.get("skills") or {}).get("result", {}).get("role_id")
+        try:
+            with _stage_slot(stage), llm_context(stage, role_id=role_id):
+                out = _run_stage(stage, jd_text, {k: v["result"] for k, v in done.items()}, cfg)
+        except Exception as e:
+            return {"job_id": job_id, "status": "failed", "failed_stage": stage,
+                    "error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc(),
+                    "timings": timings}
+        timings[stage] = time.perf_counter() - t0
+        done[stage] = {"result": out, "seconds": timings[stage]}
+        _save_ckpt(cfg, ckpt)
+
+    res = {k: v["result"] for k, v in done.items()}
+    role_id = (res.get("skills") or {}).get("role_id")
+    return {
+        "job_id": job_id,
+        "status": "ok",
+        "role_id": role_id,
+        "role_title": (res.get("skills") or {}).get("role_title"),
+        "results": res,
+        "timings": timings,
+        "resumed_stages": [s for s in cfg.stages if s in done and s not in timings],
+        # tokens/cost recorded in this worker for the role (crawl/classify/package stages)
+        "usage": role_cost_summary(role_id)["total"] if role_id is not None else {},
+    }
+
+
+# ---------- summary ----------
+def _pct(xs: List[float], q: float) -> float:
+    if not xs:
+        return 0.0
+    xs = sorted(xs)
+    i = min(len(xs) - 1, max(0, int(round(q * (len(xs) - 1)))))
+    return xs[i]
+
+def _summary(rows: List[Dict], wall: float, skipped: int) -> Dict:
+    per_stage: Dict[str, List[float]] = {s: [] for s in STAGES}
+    for r in rows:
+        for s, sec in (r.get("timings") or {}).items():
+            per_stage.setdefault(s, []).append(float(sec))
+    usage = [r.get("usage") or {} for r in rows]
+    return {
+        "processed": len(rows),
+        "llm_usage": {f: round(sum(float(u.get(f, 0)) for u in usage), 6)
+                      for f in ("calls", "prompt_tokens", "completion_tokens", "cost_usd")},
+        "ok": sum(1 for r in rows if r["status"] == "ok"),
+        "failed": sum(1 for r in rows if r["status"] != "ok"),
+        "skipped_already_done": skipped,
+        "wall_seconds": round(wall, 3),
+        "stages": {
+            s: {"count": len(xs), "total_s": round(sum(xs), 3),
+                "mean_s": round(sum(xs) / len(xs), 3) if xs else 0.0,
+                "p50_s": round(_pct(xs, 0.50), 3), "p95_s": round(_pct(xs, 0.95), 3)}
+            for s, xs in per_stage.items() if xs
+        },
+    }
+
+
+# ---------- driver ----------
+def _already_ok(cfg: BatchConfig) -> set:
+    ok = set()
+    if cfg.resume and cfg.results_path.exists():
+        with cfg.results_path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    r = json.loads(line)
+                except Exception:
+                    continue
+                if r.get("status") == "ok":
+                    ok.add(r.get("job_id"))
+    return ok
+
+def run_batch(cfg: BatchConfig, log=print) -> Dict:
+    """Process every .txt JD in cfg.input_dir; append one JSON line per JD and write a timing summary."""
+    from jd2interview.storage.db import init_db
+    init_db()
+
+    bad = [s for s in cfg.stages if s not in STAGES]
+    if bad:
+        raise ValueError(f"Unknown stage(s): {bad}; expected a subset of {STAGES}")
+    cfg.stages = [s for s in STAGES if s in cfg.stages]
+
+    Path(cfg.out_dir).mkdir(parents=True, exist_ok=True)
+    cfg.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+    done_ok = _already_ok(cfg)
+    all_jds = sorted(load_processed_jds(cfg.input_dir))
+    jds: List[Tuple[str, str]] = [(j, t) for j, t in all_jds if j not in done_ok]
+    skipped = len(all_jds) - len(jds)          # JDs of this input already done (results.jsonl may hold others)
+    log(f"[batch] {len(jds)} JD(s) to process ({skipped} already done) · executor={cfg.executor} "
+        f"workers={cfg.workers} stages={cfg.stages} limits={cfg.stage_limits}")
+
+    if cfg.executor == "process":
+        ctx = mp.get_context("spawn")
+        limits = {s: ctx.BoundedSemaphore(max(1, int(n))) for s, n in cfg.stage_limits.items()}
+        pool = ProcessPoolExecutor(max_workers=cfg.workers, mp_context=ctx,
+                                   initializer=_init_limits, initargs=(limits,))
+    else:
+        _init_limits({s: threading.BoundedSemaphore(max(1, int(n))) for s, n in cfg.stage_limits.items()})
+        pool = ThreadPoolExecutor(max_workers=cfg.workers, thread_name_prefix="jd2i-batch")
+
+    rows: List[Dict] = []
+    t0 = time.perf_counter()
+    with pool, cfg.results_path.open("a", encoding="utf-8") as out:
+        futs = {pool.submit(process_jd, job_id, text, cfg): job_id for job_id, text in jds}
+        for fut in as_completed(futs):
+            job_id = futs[fut]
+            try:
+                row = fut.result()
+            except Exception as e:   # worker died (e.g. pickling / process crash)
+                row = {"job_id": job_id, "status": "failed", "error": f"{type(e).__name__}: {e}", "timings": {}}
+            rows.append(row)
+            out.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+            out.flush()
+            took = sum((row.get("timings") or {}).values())
+            log(f"[batch] {job_id}: {row['status']}" + (f" at {row.get('failed_stage')}: {row.get('error')}"
+                if row["status"] != "ok" else f" ({took:.1f}s)"))
+
+    summary = _summary(rows, time.perf_counter() - t0, skipped)
+    summary["config"] = {k: v for k, v in asdict(cfg).items()}
+    cfg.summary_path.write_text(json.dumps(summary, indent=2, default=str), encoding="utf-8")
+    log(f"[batch] done: {summary['ok']} ok, {summary['failed']} failed in {summary['wall_seconds']}s "
+        f"→ {cfg.results_path}, {cfg.summary_path}")
+    return summary
@@ -0,0 +1,95 @@
+# src/jd2interview/cli.py
+from __future__ import annotations
+import argparse
+import sys
+from typing import Dict, List, Optional
+
+
+def _parse_limits(specs: List[str]) -> Dict[str, int]:
+    """['parse=4', 'crawl=1,classify=2'] → {'parse': 4, 'crawl': 1, 'classify': 2}"""
+    out: Dict[str, int] = {}
+    for spec in specs or []:
+        for part in spec.split(","):
+            if not part.strip():
+                continue
+            name, _, n = part.partition("=")
+            if not n:
+                raise argparse.ArgumentTypeError(f"Bad stage limit {part!r}; expected STAGE=N")
+            out[name.strip()] = int(n)
+    return out
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="jd2i", description="JD → skill graph → interview questions")
+    sub = p.add_subparsers(dest="cmd")
+
+    sub.add_parser("ui", help="Launch the Gradio UI (default)")
+
+    b = sub.add_parser("batch", help="Process a directory of JD .txt files headlessly")
+    b.add_argument("input_dir", help="Directory containing <job_id>.txt job descriptions")
+    b.add_argument("-o", "--out-dir", default="data/batch_out", help="Where results.jsonl, summary.json and checkpoints go")
+    b.add_argument("--executor", choices=["thread", "process"], default="thread")
+    b.add_argument("-w", "--workers", type=int, default=4, help="JDs processed concurrently")
+    b.add_argument("--limit", action="append", default=[], metavar="STAGE=N",
+                   help="Per-stage concurrency limit (repeatable, or comma separated), e.g. --limit crawl=1,parse=8")
+    b.add_argument("--stages", default=None,
+                   help="Comma-separated subset of stages to run (default: parse,skills,crawl,classify,package)")
+    b.add_argument("--package-total", type=int, default=10, help="Questions per interview package")
+    b.add_argument("--no-resume", action="store_true", help="Ignore existing checkpoints and results")
+
+    e = sub.add_parser("export", help="Stream the question bank + skill graph to a directory")
+    e.add_argument("out_dir", help="Target directory (one file per table + manifest.json)")
+    e.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl", help="gzip JSONL or Parquet (needs pyarrow)")
+    e.add_argument("--tables", default=None, help="Comma-separated subset of tables (default: all)")
+    e.add_argument("--batch", type=int, default=5000, help="Rows per streamed batch")
+
+    i = sub.add_parser("import", help="Load a directory written by `jd2i export` through the bulk upsert path")
+    i.add_argument("in_dir", help="Directory containing manifest.json")
+    i.add_argument("--tables", default=None, help="Comma-separated subset of tables (default: all in the dump)")
+    i.add_argument("--batch", type=int, default=5000, help="Rows per transaction")
+    return p
+
+
+def main(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
+
+    if args.cmd in (None, "ui"):
+        from jd2interview.ui.gradio_app import main as ui_main
+        ui_main()
+        return 0
+
+    if args.cmd == "batch":
+        from jd2interview.batch.pipeline import BatchConfig, STAGES, run_batch
+        from jd2interview.utils.config import settings, log_settings
+        cfg = BatchConfig(
+            input_dir=args.input_dir,
+            out_dir=args.out_dir,
+            executor=args.executor,
+            workers=max(1, args.workers),
+            stage_limits={**settings.BATCH_STAGE_LIMITS, **_parse_limits(args.limit)},
+            stages=[s.strip() for s in args.stages.split(",")] if args.stages else list(STAGES),
+            package_total=args.package_total,
+            resume=not args.no_resume,
+        )
+        log_settings()
+        summary = run_batch(cfg)
+        return 1 if summary["failed"] else 0
+
+    if args.cmd in ("export", "import"):
+        from jd2interview.storage import bank_io
+        tables = [t.strip() for t in args.tables.split(",") if t.strip()] if args.tables else None
+        unknown = sorted(set(tables or ()) - set(bank_io.TABLES))
+        if unknown:
+            print(f"[bank] unknown tables: {', '.join(unknown)} (known: {', '.join(bank_io.TABLES)})")
+            return 2
+        if args.cmd == "export":
+            bank_io.export_bank(args.out_dir, fmt=args.format, tables=tables, batch=max(1, args.batch))
+        else:
+            bank_io.import_bank(args.in_dir, tables=tables, batch=max(1, args.batch))
+        return 0
+
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,10 @@
 import base64, requests
 from typing import Iterable
 from jd2interview.ingest.models import QuestionItem
-
-GH = "https://api.github.com"
+from jd2interview.utils.config import settings
 
 def fetch_github_file(owner: str, repo: str, path: str) -> str:
-    r = requests.get(f"{GH}/repos/{owner}/{repo}/contents/{path}", timeout=30)
+    r = requests.get(f"{settings.GITHUB_API_URL}/repos/{owner}/{repo}/contents/{path}", timeout=30)
     r.raise_for_status()
     content = r.json()["content"]
     return base64.b64decode(content).decode("utf-8", errors="ignore")
@@ -1,8 +1,9 @@
 import asyncio
 from typing import Iterable, Dict, Any, List
 from jd2interview.ingest.models import QuestionItem
-from jd2interview.storage.db import session_scope, upsert_question_with_answers, canonical_question_text, sha256_hex
+from jd2interview.storage.db import session_scope, bulk_upsert_questions, canonical_question_text, sha256_hex
 from jd2interview.crawl.stackoverflow_requests import fetch_stackoverflow_requests
+from jd2interview.utils.tracing import span
 
 # normalize -> dedupe -> persist
 
@@ -14,15 +15,15 @@ def dedupe_key(q: QuestionItem) -> str:
     return sha256_hex(canonical_question_text(q.title, q.body_markdown))
 
 def persist_questions(items: Iterable[QuestionItem]) -> int:
-    n = 0
-    with session_scope() as db:
+    items = list(items)
+    with span("crawl.persist", items=len(items)), session_scope() as db:
         for q in items:
             if not q.hash:
                 q.hash = dedupe_key(q)
-            upsert_question_with_answers(db, q)
-            n += 1
-    return n
+        bulk_upsert_questions(db, items)         # one transaction, set-based
+    return len(items)
 
 def run_stackoverflow_requests(site: str, tags_all, tags_any, query, pages: int, pagesize:int) -> int:
-    items = list(fetch_stackoverflow_requests(site=site, tags_any=tags_any, query=query, pages=pages, pagesize=pagesize))
+    items = list(fetch_stackoverflow_requests(site=site, tags_all=tags_all, tags_any=tags_any, query=query,
+                                              pages=pages, page_size=pagesize))
     return persist_questions(items)
\ No newline at end of file
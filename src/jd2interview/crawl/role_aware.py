@@ -1,43 +1,63 @@
-from jd2interview.skills.query import top_k_skills_for_role
+from jd2interview.skills.query import role_skill_terms
+from jd2interview.skills.canon import canon_index
 from jd2interview.crawl.stackoverflow_requests import fetch_stackoverflow_requests
 from jd2interview.crawl.pipeline import persist_questions
 from jd2interview.utils.config import settings
+from jd2interview.utils.tracing import span, start_span
 
 def crawl_for_role(role_id: int):
-    sites = [s.strip() for s in settings.CRAWL_SITES if s.strip()]
-    skills = [s for s,_ in top_k_skills_for_role(role_id, k=8)]
-    if not skills:
-        return {"inserted": 0, "by_site": {}, "skills": []}
-    totals, total = {}, 0
-    for site in sites:
-        items = list(fetch_stackoverflow_requests(
-            site=site,
-            tags_any=skills,                    # role-aware
-            query=settings.CRAWL_QUERY_HINT,   # e.g., "interview"
-            pages=settings.CRAWL_PAGES,
-            page_size=settings.CRAWL_PAGE_SIZE,
-        ))
-        n = persist_questions(items)
-        totals[site] = n; total += n
-    return {"inserted": total, "by_site": totals, "skills": skills}
+    with span("crawl.for_role", role_id=role_id) as sp:
+        sites = [s.strip() for s in settings.CRAWL_SITES if s.strip()]
+        skills = role_skill_terms(role_id, k=8, related=settings.CRAWL_RELATED_SKILLS)
+        if not skills:
+            return {"inserted": 0, "by_site": {}, "skills": []}
+        tags = canon_index().crawl_tags(skills)            # StackExchange spellings, deduped
+        totals, total = {}, 0
+        for site in sites:
+            with span("crawl.site", site=site) as ssp:
+                items = list(fetch_stackoverflow_requests(
+                    site=site,
+                    tags_any=tags,                      # role-aware
+                    query=settings.CRAWL_QUERY_HINT,   # e.g., "interview"
+                    pages=settings.CRAWL_PAGES,
+                    page_size=settings.CRAWL_PAGE_SIZE,
+                ))
+                n = persist_questions(items)
+                ssp.set(fetched=len(items), upserted=n)
+            totals[site] = n; total += n
+        sp.set(inserted=total)
+        return {"inserted": total, "by_site": totals, "skills": skills, "tags": tags}
 
 def crawl_for_role_stream(role_id: int):
-    sites = [s.strip() for s in settings.CRAWL_SITES if s.strip()]
-    skills = [s for s,_ in top_k_skills_for_role(role_id, k=8)]
-    if not skills:
-        yield "No skills for this role. Parse JD & build skill graph first."; return
-    yield f"Skills: {skills}"
-    total = 0
-    for site in sites:
-        yield f"Fetching {site} (tags_any={skills}, q={settings.CRAWL_QUERY_HINT!r}, pages={settings.CRAWL_PAGES}, page_size={settings.CRAWL_PAGE_SIZE})"
-        items = list(fetch_stackoverflow_requests(
-            site=site,
-            tags_any=skills,
-            query=settings.CRAWL_QUERY_HINT,
-            pages=settings.CRAWL_PAGES,
-            page_size=settings.CRAWL_PAGE_SIZE,
-        ))
-        n = persist_questions(items)
-        total += n
-        yield f"[{site}] upserted: {n}"
-    yield f"Done. Total upserted: {total}"
\ No newline at end of file
+    # generator: the root span is finished explicitly, child spans never stay open across a yield
+    root = start_span("crawl.for_role", role_id=role_id)
+    try:
+        sites = [s.strip() for s in settings.CRAWL_SITES if s.strip()]
+        with span("crawl.top_skills", parent=root):
+            skills = role_skill_terms(role_id, k=8, related=settings.CRAWL_RELATED_SKILLS)
+        if not skills:
+            yield "No skills for this role. Parse JD & build skill graph first."; return
+        tags = canon_index().crawl_tags(skills)
+        yield f"Skills: {skills}"
+        total = 0
+        for site in sites:
+            yield f"Fetching {site} (tags_any={tags}, q={settings.CRAWL_QUERY_HINT!r}, pages={settings.CRAWL_PAGES}, page_size={settings.CRAWL_PAGE_SIZE})"
+            with span("crawl.site", parent=root, site=site) as ssp:
+                items = list(fetch_stackoverflow_requests(
+                    site=site,
+                    tags_any=tags,
+                    query=settings.CRAWL_QUERY_HINT,
+                    pages=settings.CRAWL_PAGES,
+                    page_size=settings.CRAWL_PAGE_SIZE,
+                ))
+                n = persist_questions(items)
+                ssp.set(fetched=len(items), upserted=n)
+            total += n
+            yield f"[{site}] upserted: {n}"
+        root.set(inserted=total)
+        yield f"Done. Total upserted: {total}"
+    except Exception as e:
+        root.finish(error=e)
+        raise
+    finally:
+        root.finish()
\ No newline at end of file
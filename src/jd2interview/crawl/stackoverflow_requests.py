@@ -6,32 +6,43 @@ from datetime import datetime, timezone
 from typing import Dict, Iterable, List, Optional
 from jd2interview.ingest.models import QuestionItem
 from jd2interview.utils.config import settings
+from jd2interview.utils.tracing import span
 
-QUESTIONS_URL = "https://api.stackexchange.com/2.3/questions"
-SEARCH_ADV_URL = "https://api.stackexchange.com/2.3/search/advanced"
 UA = {"User-Agent": "jd2interview-crawler/0.1 (+demo)"}
 
-def _params_base(site: str, with_body: bool) -> Dict:
+# resolved per call so STACKEXCHANGE_API_URL can point at a local replay server
+def _questions_url() -> str:
+    return f"{settings.STACKEXCHANGE_API_URL}/questions"
+
+def _search_adv_url() -> str:
+    return f"{settings.STACKEXCHANGE_API_URL}/search/advanced"
+
+def _params_base(site: str, with_body: bool, page_size: Optional[int] = None) -> Dict:
     key = getattr(settings, "STACKEXCHANGE_KEY", "") or ""
     return {
         "order": "desc",
         "sort": "votes",
         "site": site,
         "filter": "withbody" if (with_body and key) else "default",
-        "pagesize": getattr(settings, "CRAWL_PAGE_SIZE", 50),
+        "pagesize": page_size or getattr(settings, "CRAWL_PAGE_SIZE", 50),
         **({"key": key} if key else {}),
     }
 
 
 def _fetch_page(url: str, params: Dict) -> Dict:
-    r = requests.get(url, params=params, headers=UA, timeout=30)
-    try:
-        r.raise_for_status()
-    except HTTPError as e:
-        # Make debugging easier: include body text
-        msg = f"{e} :: url={r.url} :: body={r.text[:300]}..."
-        raise HTTPError(msg, response=r) from e
-    return r.json()
+    with span("crawl.page", endpoint=url.rsplit("/", 1)[-1], site=params.get("site"),
+              page=params.get("page"), tagged=params.get("tagged")) as sp:
+        r = requests.get(url, params=params, headers=UA, timeout=30)
+        sp.set(status=r.status_code)
+        try:
+            r.raise_for_status()
+        except HTTPError as e:
+            # Make debugging easier: include body text
+            msg = f"{e} :: url={r.url} :: body={r.text[:300]}..."
+            raise HTTPError(msg, response=r) from e
+        data = r.json()
+        sp.set(items=len(data.get("items", [])))
+        return data
 
 def _to_item(d: Dict) -> QuestionItem:
     created = datetime.fromtimestamp(d.get("creation_date", 0), tz=timezone.utc)
@@ -57,7 +68,7 @@ def fetch_stackoverflow_requests(
     site: str = "stackoverflow",
     pages: int = 2,
     page_size: int = 50,
-    # tags_all: Optional[List[str]] = None,
+    tags_all: Optional[List[str]] = None,
     tags_any: Optional[List[str]] = None,
     query: Optional[str] = None,
     with_body: bool = True,
@@ -80,16 +91,16 @@ def fetch_stackoverflow_requests(
             if query:
                 # 1st try: search/advanced with full-text 'q'
                 try:
-                    data = _fetch_page(SEARCH_ADV_URL, {**params, "q": query})
+                    data = _fetch_page(_search_adv_url(), {**params, "q": query})
                 except HTTPError:
                     # 2nd try: search/advanced with 'intitle'
                     try:
-                        data = _fetch_page(SEARCH_ADV_URL, {**params, "intitle": query})
+                        data = _fetch_page(_search_adv_url(), {**params, "intitle": query})
                     except HTTPError:
                         # 3rd try: plain /questions without query (just tags + votes)
-                        data = _fetch_page(QUESTIONS_URL, params)
+                        data = _fetch_page(_questions_url(), params)
             else:
-                data = _fetch_page(QUESTIONS_URL, params)
+                data = _fetch_page(_questions_url(), params)
 
             items = data.get("items", [])
             for it in items:
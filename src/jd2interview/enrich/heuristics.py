@@ -0,0 +1,278 @@
+# src/jd2interview/enrich/heuristics.py
+"""
+Local pre-classifier for question type / difficulty, run before the LLM.
+
+Two signals, both cheap:
+  * rules    — phrasings that give the type away ("Tell me about a time…" → Behavioral,
+               "Write a function that…" → Coding, "Design a URL shortener" → System Design).
+  * model    — optional multinomial logistic regression (NumPy, hashed unigram + bigram features)
+               trained on the QuestionMeta labels already in the bank:
+
+                   python -m jd2interview.enrich.heuristics train [--min-examples 200]
+
+`classify_question` (enrich/metadata.py) uses the local answer when its confidence reaches
+HEURISTIC_MIN_CONFIDENCE and calls the LLM otherwise. Locally classified rows are marked in their
+rubric (`scoring` is exactly HEURISTIC_SCORING) so retraining learns from LLM labels only.
+"""
+from __future__ import annotations
+import json
+import os
+import re
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from jd2interview.utils.config import settings
+
+QTYPES = ["Behavioral", "Technical", "Coding", "System Design"]
+DIFFS = ["Easy", "Medium", "Hard"]
+HEURISTIC_TAG = "heuristic"
+HEURISTIC_SCORING = f"0-5 rubric ({HEURISTIC_TAG})"   # rubric `scoring` of locally classified rows
+DIM = 1 << 14                   # hashed feature space
+BODY_CHARS = 600                # rules and features look at the title plus the start of the body
+
+
+@dataclass
+class Guess:
+    qtype: Optional[str]
+    difficulty: str
+    confidence: float           # confidence in qtype, 0..1
+    source: str                 # "rules" | "model" | "rules+model" | "none"
+
+
+# ---------- rules ----------
+# (type, weight, pattern); a match in the body counts BODY_WEIGHT of a match in the title
+_RULES: List[Tuple[str, float, str]] = [
+    ("Behavioral", 0.95, r"\btell (me|us) about a (time|situation)\b"),
+    ("Behavioral", 0.93, r"\bdescribe a (time|situation|project) (when|where|in which)\b"),
+    ("Behavioral", 0.93, r"\bgive (me |us )?an example of a time\b"),
+    ("Behavioral", 0.90, r"\bhow (do|did|would) you (handle|deal with|manage|resolve|respond to) (a |an )?"
+                         r"(conflict|disagreement|difficult|stress|pressure|tight deadline|feedback|failure|mistake)"),
+    ("Behavioral", 0.90, r"\b(your|you) (greatest|biggest) (strength|weakness|achievement|accomplishment|failure)\b"),
+    ("Behavioral", 0.90, r"\b(why do you want to|where do you see yourself|walk me through your (resume|background))\b"),
+    ("Coding", 0.93, r"^(write|implement|code) (a |an |the )?(function|method|program|class|algorithm|routine)\b"),
+    ("Coding", 0.90, r"\bwrite (a|an) (function|program|method|routine)\b"),
+    ("Coding", 0.90, r"\bimplement (a|an) (function|algorithm|lru cache|stack|queue|linked list|binary search|trie|heap|iterator)\b"),
+    ("Coding", 0.88, r"\bgiven (an?|the|two) (sorted )?(array|string|list|binary tree|linked list|integer|matrix|graph)s?\b"
+                     r".{0,200}\b(return|find|determine|count)\b"),
+    ("Coding", 0.70, r"\b(time|space) complexity of (your|the) (solution|algorithm)\b"),
+    ("Coding", 0.60, r"\bin o\((1|n|log n|n log n|n\^?2)\) (time|space)\b"),
+    ("System Design", 0.93, r"^(design|architect) (a|an|the)\b"),
+    ("System Design", 0.90, r"\bhow would you (design|architect|build|scale)\b.{0,80}\b"
+                            r"(system|service|platform|api|shortener|feed|cache|queue|pipeline|store)\b"),
+    ("System Design", 0.90, r"\bdesign (a|an) (scalable|distributed|highly available|url shortener|rate limiter|"
+                            r"chat|news feed|notification|key-value store|web crawler)\b"),
+    ("System Design", 0.60, r"\b(millions|billions) of (users|requests|events|messages)\b"),
+    ("Technical", 0.88, r"^(what is|what are|what's) the difference between\b"),
+    ("Technical", 0.85, r"^(explain|describe) (how|why|what)\b"),
+    ("Technical", 0.75, r"^(what is|what are|what does)\b"),
+    ("Technical", 0.70, r"\bhow does .{1,60} work\b"),
+    ("Technical", 0.55, r"\b(exception|error|traceback|stack trace|segfault|warning)\b"),
+]
+_COMPILED = [(t, w, re.compile(p, re.I)) for t, w, p in _RULES]
+BODY_WEIGHT = 0.8
+
+_HARD = re.compile(r"\b(distributed|concurren\w*|lock[- ]free|consensus|amortized|np-hard|dynamic programming|"
+                   r"race condition|deadlock|at scale|sharding|exactly[- ]once|linearizab\w*)\b", re.I)
+_EASY = re.compile(r"\b(basic|basics|simple|beginner|define|what is a|what is an|reverse a string|fizzbuzz)\b", re.I)
+_TYPE_DIFFICULTY = {"Behavioral": "Medium", "Technical": "Medium", "Coding": "Medium", "System Design": "Hard"}
+
+def _rule_scores(title: str, body: str) -> Dict[str, float]:
+    miss = {t: 1.0 for t in QTYPES}
+    title, body = (title or "").strip(), (body or "")[:BODY_CHARS]
+    for qtype, w, rx in _COMPILED:
+        if rx.search(title):
+            miss[qtype] *= 1.0 - w
+        elif body and rx.search(body):
+            miss[qtype] *= 1.0 - w * BODY_WEIGHT
+    return {t: 1.0 - m for t, m in miss.items()}
+
+def _rule_difficulty(qtype: Optional[str], title: str, body: str) -> str:
+    text = f"{title}\n{(body or '')[:BODY_CHARS]}"
+    if _HARD.search(text):
+        return "Hard"
+    if _EASY.search(text):
+        return "Easy"
+    return _TYPE_DIFFICULTY.get(qtype or "", "Medium")
+
+
+# ---------- model: hashed features + softmax regression ----------
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+
+def features(title: str, body: str) -> List[int]:
+    """Hashed unigram + bigram indices (title tokens are kept apart from body tokens)."""
+    out = set()
+    for prefix, text in (("t", title or ""), ("b", (body or "")[:BODY_CHARS])):
+        toks = _TOKEN.findall(text.lower())
+        for i, tok in enumerate(toks):
+            out.add(zlib.crc32(f"{prefix}:{tok}".encode()) % DIM)
+            if i:
+                out.add(zlib.crc32(f"{prefix}:{toks[i - 1]} {tok}".encode()) % DIM)
+    return sorted(out)
+
+def _dense(rows: List[List[int]]):
+    import numpy as np
+    X = np.zeros((len(rows), DIM), dtype=np.float32)
+    for i, idx in enumerate(rows):
+        if idx:
+            X[i, idx] = 1.0 / np.sqrt(len(idx))
+    return X
+
+def _softmax(z):
+    import numpy as np
+    z = z - z.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
+
+def _fit(X_rows: List[List[int]], y, k: int, epochs: int = 30, lr: float = 1.0, l2: float = 1e-5,
+         batch: int = 256, seed: int = 0):
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    W, b = np.zeros((DIM, k), dtype=np.float32), np.zeros(k, dtype=np.float32)
+    y = np.asarray(y)
+    for _ in range(epochs):
+        order = rng.permutation(len(X_rows))
+        for s in range(0, len(order), batch):
+            ix = order[s:s + batch]
+            X = _dense([X_rows[i] for i in ix])
+            P = _softmax(X @ W + b)
+            P[np.arange(len(ix)), y[ix]] -= 1.0
+            W -= lr * (X.T @ P / len(ix) + l2 * W)
+            b -= lr * P.mean(axis=0)
+    return W, b
+
+def _locally_classified(rubric_json: Optional[str]) -> bool:
+    try:
+        rubric = json.loads(rubric_json or "{}")
+    except ValueError:
+        return False
+    return isinstance(rubric, dict) and rubric.get("scoring") == HEURISTIC_SCORING
+
+def train(db, min_examples: int = 200, path: Optional[str] = None) -> Dict:
+    """Fit type and difficulty heads on LLM-labelled QuestionMeta rows; writes an .npz. Returns a summary."""
+    import numpy as np
+    from sqlalchemy import select
+    from jd2interview.storage.db import Question, QuestionMeta
+    rows = db.execute(
+        select(Question.title, Question.body_markdown, Question.body_html, QuestionMeta.qtype,
+               QuestionMeta.difficulty, QuestionMeta.rubric_json)
+        .join(QuestionMeta, QuestionMeta.question_id == Question.id)
+    ).all()
+    data = [(features(t or "", bm or bh or ""), QTYPES.index(qt), DIFFS.index(d) if d in DIFFS else 1)
+            for t, bm, bh, qt, d, rj in rows if qt in QTYPES and not _locally_classified(rj)]
+    if len(data) < min_examples:
+        return {"trained": False, "examples": len(data), "reason": f"need at least {min_examples} LLM-labelled rows"}
+    rng = np.random.default_rng(0)
+    perm = rng.permutation(len(data))
+    cut = max(1, int(len(data) * 0.9))
+    tr, te = [data[i] for i in perm[:cut]], [data[i] for i in perm[cut:]] or [data[i] for i in perm[:cut]]
+    Wt, bt = _fit([d[0] for d in tr], [d[1] for d in tr], len(QTYPES))
+    Wd, bd = _fit([d[0] for d in tr], [d[2] for d in tr], len(DIFFS))
+    Xte = _dense([d[0] for d in te])
+    acc_t = float(((Xte @ Wt + bt).argmax(1) == np.array([d[1] for d in te])).mean())
+    acc_d = float(((Xte @ Wd + bd).argmax(1) == np.array([d[2] for d in te])).mean())
+    path = path or settings.HEURISTIC_MODEL_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    np.savez_compressed(path, Wt=Wt, bt=bt, Wd=Wd, bd=bd, dim=np.int64(DIM))
+    _model_cache.clear()
+    return {"trained": True, "examples": len(data), "type_accuracy": acc_t, "difficulty_accuracy": acc_d, "path": path}
+
+_model_cache: Dict[str, tuple] = {}
+_model_lock = threading.Lock()
+
+def _model():
+    """(Wt, bt, Wd, bd) from HEURISTIC_MODEL_PATH, reloaded when the file changes; None if absent."""
+    path = settings.HEURISTIC_MODEL_PATH
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _model_lock:
+        hit = _model_cache.get(path)
+        if hit and hit[0] == mtime:
+            return hit[1]
+        import numpy as np
+        with np.load(path) as z:
+            m = (z["Wt"], z["bt"], z["Wd"], z["bd"]) if int(z["dim"]) == DIM else None
+        _model_cache[path] = (mtime, m)
+        return m
+
+def _model_probs(title: str, body: str):
+    m = _model()
+    if m is None:
+        return None
+    import numpy as np
+    Wt, bt, Wd, bd = m
+    idx = features(title, body)
+    if not idx:
+        return None
+    x = np.zeros(DIM, dtype=np.float32)
+    x[idx] = 1.0 / np.sqrt(len(idx))
+    return _softmax((x @ Wt + bt)[None, :])[0], _softmax((x @ Wd + bd)[None, :])[0]
+
+
+# ---------- combined ----------
+def classify(title: str, body: str) -> Guess:
+    scores = _rule_scores(title, body)
+    ranked = sorted(scores.items(), key=lambda kv: -kv[1])
+    (r_type, r_best), (_, r_second) = ranked[0], ranked[1]
+    r_conf = max(0.0, r_best - 0.5 * r_second)
+    probs = _model_probs(title, body)
+    if probs is None:
+        if r_best <= 0:
+            return Guess(None, _rule_difficulty(None, title, body), 0.0, "none")
+        return Guess(r_type, _rule_difficulty(r_type, title, body), r_conf, "rules")
+
+    pt, pd = probs
+    m_type, m_conf = QTYPES[int(pt.argmax())], float(pt.max())
+    difficulty = DIFFS[int(pd.argmax())] if float(pd.max()) >= 0.6 else _rule_difficulty(m_type, title, body)
+    if r_best <= 0:
+        return Guess(m_type, difficulty, m_conf, "model")
+    m_edge = max(0.0, (m_conf - 1.0 / len(QTYPES)) / (1.0 - 1.0 / len(QTYPES)))   # better-than-chance part
+    if m_type == r_type:              # independent agreement
+        return Guess(r_type, difficulty, 1.0 - (1.0 - r_conf) * (1.0 - m_edge), "rules+model")
+    if r_conf >= m_conf:              # disagreement: the stronger one, discounted by the other
+        return Guess(r_type, _rule_difficulty(r_type, title, body), max(0.0, r_conf - 0.5 * m_edge), "rules")
+    return Guess(m_type, difficulty, max(0.0, m_conf - 0.5 * r_conf), "model")
+
+def rubric_for(qtype: str) -> Dict:
+    """Generic per-type rubric for locally classified questions (marked so retraining skips them)."""
+    signals = {
+        "Behavioral": ["Concrete situation with their own role", "Actions and reasoning, not just outcome",
+                       "Measurable result and what they learned"],
+        "Technical": ["Accurate core explanation", "Trade-offs and when each option applies",
+                      "Relevant real-world example"],
+        "Coding": ["Correct, working solution", "Handles edge cases", "States time / space complexity"],
+        "System Design": ["Clarifies requirements and scale", "Sound components and data flow",
+                          "Discusses bottlenecks, failure modes and trade-offs"],
+    }.get(qtype, [])
+    red_flags = {
+        "Behavioral": ["Vague or hypothetical answer", "Blames others"],
+        "Technical": ["Buzzwords without substance", "Factual errors"],
+        "Coding": ["No testing or edge cases", "Cannot explain complexity"],
+        "System Design": ["Jumps to tools without requirements", "Single point of failure ignored"],
+    }.get(qtype, [])
+    return {"signals": signals, "red_flags": red_flags, "scoring": HEURISTIC_SCORING}
+
+def confident(title: str, body: str, threshold: Optional[float] = None) -> Optional[Guess]:
+    """The local guess when it is confident enough to skip the LLM, else None."""
+    if not settings.HEURISTIC_CLASSIFY:
+        return None
+    g = classify(title, body)
+    thr = settings.HEURISTIC_MIN_CONFIDENCE if threshold is None else threshold
+    return g if g.qtype and g.confidence >= thr else None
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    ap = argparse.ArgumentParser(description="Train the local question-type classifier on QuestionMeta labels")
+    ap.add_argument("cmd", choices=["train"])
+    ap.add_argument("--min-examples", type=int, default=200)
+    ap.add_argument("--out", default=None, help="model path (default HEURISTIC_MODEL_PATH)")
+    args = ap.parse_args()
+    from jd2interview.storage.db import ReadSession, init_db
+    init_db()
+    with ReadSession() as db:
+        print(json.dumps(train(db, min_examples=args.min_examples, path=args.out), indent=2))
@@ -1,8 +1,11 @@
+from functools import lru_cache
 from typing import Literal, List, Dict
 from pydantic import BaseModel, Field
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
 from jd2interview.utils.config import settings
+from jd2interview.enrich import heuristics
+from jd2interview.utils.llm import structured_chain
+from jd2interview.utils.metrics import llm_context, metrics
+from jd2interview.utils.tracing import span, start_span
 
 from sqlalchemy import select
 from jd2interview.storage.db import session_scope, Question, QuestionMeta, upsert_question_meta
@@ -23,7 +26,7 @@ class QMeta(BaseModel):
     difficulty: Diff
     evaluation_rubric: Rubric
 
-PROMPT = ChatPromptTemplate.from_template("""
+PROMPT_TEMPLATE = """
 Classify the interview question and return JSON with keys: qtype, difficulty, evaluation_rubric.
 qtype ∈ ["Behavioral","Technical","Coding","System Design"]
 difficulty ∈ ["Easy","Medium","Hard"]
@@ -35,12 +38,24 @@ Question Body (markdown):
 ```{body}```
 
 Return ONLY the JSON.
-""")
+"""
+
+@lru_cache(maxsize=None)
+def _prompt(template: str):
+    # langchain is only imported once something is actually classified
+    from langchain.prompts import ChatPromptTemplate
+    return ChatPromptTemplate.from_template(template)
 
 def classify_question(title: str, body: str) -> QMeta:
-    llm = ChatOpenAI(model=settings.OPENAI_MODEL, api_key=settings.OPENAI_API_KEY, temperature=0.0)
-    chain = PROMPT | llm.with_structured_output(QMeta)
-    return chain.invoke({"title": title, "body": body})
+    """Type / difficulty / rubric; the local pre-classifier answers confident cases without an LLM call."""
+    guess = heuristics.confident(title, body)
+    metrics.record_cache("enrich.heuristic", hits=int(guess is not None), misses=int(guess is None))
+    if guess is not None:
+        return QMeta(qtype=guess.qtype, difficulty=guess.difficulty,
+                     evaluation_rubric=Rubric(**heuristics.rubric_for(guess.qtype)))
+    chain = structured_chain(_prompt(PROMPT_TEMPLATE), QMeta, temperature=0.0)
+    with span("enrich.classify_question"), llm_context("enrich.classify"):
+        return chain.invoke({"title": title, "body": body})
 
 
 class Suitability(BaseModel):
@@ -48,7 +63,7 @@ class Suitability(BaseModel):
     suggested_type: QType
     reason: str
 
-SUIT_PROMPT = ChatPromptTemplate.from_template("""
+SUIT_PROMPT_TEMPLATE = """
 Decide if the following StackExchange-style question is suitable as an interview question.
 Return JSON with keys: is_interview (true/false), suggested_type, reason (short).
 Types: ["Behavioral","Technical","Coding","System Design"].
@@ -58,12 +73,12 @@ Title:
 
 Body (markdown):
 ```{body}```
-""")
+"""
 
 def interview_gate(title: str, body: str) -> Suitability:
-    llm = ChatOpenAI(model=settings.OPENAI_MODEL, api_key=settings.OPENAI_API_KEY, temperature=0.0)
-    chain = SUIT_PROMPT | llm.with_structured_output(Suitability)
-    return chain.invoke({"title": title, "body": body})
+    chain = structured_chain(_prompt(SUIT_PROMPT_TEMPLATE), Suitability, temperature=0.0)
+    with span("enrich.interview_gate"), llm_context("enrich.gate"):
+        return chain.invoke({"title": title, "body": body})
 
 
 def classify_role_questions_stream(role_id: int, batch_size: int = 25, max_items: int | None = None):
@@ -72,36 +87,52 @@ def classify_role_questions_stream(role_id: int, batch_size: int = 25, max_items
     that don't yet have QuestionMeta. Persists results so next runs are fast.
     """
     classified, skipped = 0, 0
-    with session_scope() as db:
-        ids_all = _relevant_ids_for_role(db, role_id, topk=8, limit=10000)
-        if not ids_all:
-            yield "No relevant web questions found for this role."
-            return
-        have_meta = {
-            qid for (qid,) in db.execute(
-                select(QuestionMeta.question_id).where(QuestionMeta.question_id.in_(ids_all))
-            ).all()
-        }
-        targets = [qid for qid in ids_all if qid not in have_meta]
-        if max_items is not None:
-            targets = targets[:max_items]
-
-        total = len(targets)
-        yield f"Classifying {total} web questions…"
-        for i in range(0, total, batch_size):
-            chunk = targets[i:i+batch_size]
-            for qid in chunk:
-                q = db.get(Question, qid)
-                if not q:
-                    skipped += 1
-                    continue
-                title = (q.title or "").strip()
-                body  = (q.body_markdown or q.body_html or "").strip()
-                try:
-                    meta = classify_question(title, body)
-                    upsert_question_meta(db, qid, meta.qtype, meta.difficulty, meta.evaluation_rubric.model_dump())
-                    classified += 1
-                except Exception:
-                    skipped += 1
-            yield f"…{min(i+batch_size, total)}/{total} done (classified {classified}, skipped {skipped})"
-    yield f"Done. Classified {classified}, skipped {skipped}."
\ No newline at end of file
+    # generator: spans are opened between yields only; the root is finished explicitly
+    root = start_span("enrich.classify_role", role_id=role_id)
+    try:
+        with session_scope() as db:
+            with span("enrich.candidates", parent=root) as sp:
+                ids_all = _relevant_ids_for_role(db, role_id, topk=8, limit=10000)
+                sp.set(candidates=len(ids_all))
+            if not ids_all:
+                yield "No relevant web questions found for this role."
+                return
+            have_meta = {
+                qid for (qid,) in db.execute(
+                    select(QuestionMeta.question_id).where(QuestionMeta.question_id.in_(ids_all))
+                ).all()
+            }
+            targets = [qid for qid in ids_all if qid not in have_meta]
+            metrics.record_cache("enrich.classify", hits=len(have_meta), role_id=role_id)
+            if max_items is not None:
+                targets = targets[:max_items]
+
+            total = len(targets)
+            root.set(cached=len(have_meta), targets=total)
+            yield f"Classifying {total} web questions…"
+            for i in range(0, total, batch_size):
+                chunk = targets[i:i+batch_size]
+                with span("enrich.batch", parent=root, offset=i, size=len(chunk)):
+                    for qid in chunk:
+                        q = db.get(Question, qid)
+                        if not q:
+                            skipped += 1
+                            continue
+                        title = (q.title or "").strip()
+                        body  = (q.body_markdown or q.body_html or "").strip()
+                        try:
+                            # context is entered per call (not around the yields) so it never leaks to the consumer
+                            with llm_context("enrich.classify", role_id=role_id):
+                                meta = classify_question(title, body)
+                            upsert_question_meta(db, qid, meta.qtype, meta.difficulty, meta.evaluation_rubric.model_dump())
+                            classified += 1
+                        except Exception:
+                            skipped += 1
+                yield f"…{min(i+batch_size, total)}/{total} done (classified {classified}, skipped {skipped})"
+        root.set(classified=classified, skipped=skipped)
+        yield f"Done. Classified {classified}, skipped {skipped}."
+    except Exception as e:
+        root.finish(error=e)
+        raise
+    finally:
+        root.finish()
@@ -0,0 +1,140 @@
+# src/jd2interview/generation/assembler.py
+"""
+Package assembly: choose a role's questions from its ranked, gated candidates in one pass.
+
+Quotas are wanted counts per question type, per difficulty and per role skill (a question counts
+for every role skill its tags resolve to), plus an optional cap per skill. Walking the ranked list,
+a candidate is taken when it closes an open deficit without overfilling a bucket that is already
+full; everything else stays in rank order as reserve for the slots the quotas leave open. Duplicates
+(same URL or same normalized text) are dropped through a hash set, and the walk stops as soon as
+every deficit is closed and the reserve covers the rest, so untouched candidates are never classified.
+
+What is still missing afterwards is reported as exact per-type deficits; `generation_plan` turns
+them (and any leftover slots, spread with a seeded RNG) into the only LLM fallback requests made.
+"""
+from __future__ import annotations
+import hashlib
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+_WS = re.compile(r"\s+")
+
+
+@dataclass
+class Quotas:
+    total: int
+    per_type: Dict[str, int]
+    per_difficulty: Dict[str, int] = field(default_factory=dict)
+    per_skill: Dict[str, int] = field(default_factory=dict)
+    max_per_skill: Optional[int] = None          # cap for any one skill (None = no cap)
+
+@dataclass
+class Assembly:
+    picked: List[Tuple[Dict, Dict]]              # (candidate, meta) in pick order
+    type_deficits: Dict[str, int]                # per-type wants still open
+    total: int
+    scanned: int = 0                             # candidates looked at (and classified)
+    duplicates: int = 0
+
+    @property
+    def open_slots(self) -> int:
+        return max(0, self.total - len(self.picked))
+
+
+def dedup_key(text: str) -> str:
+    norm = _WS.sub(" ", (text or "").casefold()).strip()
+    return hashlib.blake2b(norm.encode("utf-8"), digest_size=12).hexdigest()
+
+def seeded_rng(seed: int, *scope) -> random.Random:
+    """Independent, reproducible stream per (seed, scope...), e.g. seeded_rng(seed, role_id)."""
+    return random.Random(":".join(str(x) for x in (seed, *scope)))
+
+
+def assemble(
+    ranked: Iterable[Dict],
+    quotas: Quotas,
+    meta_of: Callable[[Dict], Dict],
+    skills_of: Callable[[Dict], Sequence[str]] = lambda q: (),
+    text_of: Callable[[Dict], str] = lambda q: q.get("question", ""),
+) -> Assembly:
+    """
+    One pass over `ranked` (best first). `meta_of(q)` → {type, difficulty, ...} is called lazily,
+    only for candidates the pass actually reaches.
+    """
+    total = max(0, int(quotas.total))
+    want = {"type": {k: max(0, int(v)) for k, v in quotas.per_type.items()},
+            "difficulty": {k: max(0, int(v)) for k, v in quotas.per_difficulty.items()},
+            "skill": {k: max(0, int(v)) for k, v in quotas.per_skill.items()}}
+    have = {dim: Counter() for dim in want}
+    cap = quotas.max_per_skill
+    open_deficit = sum(sum(w.values()) for w in want.values())
+
+    picked: List[Tuple[Dict, Dict]] = []
+    reserve: List[Tuple[Dict, Dict, Tuple[str, ...]]] = []
+    seen_text, seen_url = set(), set()
+    scanned = dups = 0
+
+    def take(q, meta, keys):
+        nonlocal open_deficit
+        picked.append((q, meta))
+        for dim, key_list in keys.items():
+            for k in key_list:
+                if have[dim][k] < want[dim].get(k, 0):
+                    open_deficit -= 1
+                have[dim][k] += 1
+
+    for q in ranked:
+        if len(picked) >= total or (open_deficit <= 0 and len(reserve) >= total - len(picked)):
+            break
+        scanned += 1
+        tkey, url = dedup_key(text_of(q)), q.get("url")
+        if tkey in seen_text or (url and url in seen_url):
+            dups += 1
+            continue
+        seen_text.add(tkey)
+        if url:
+            seen_url.add(url)
+
+        meta = meta_of(q)
+        skills = tuple(dict.fromkeys(skills_of(q) or ()))
+        keys = {"type": (meta.get("type"),), "difficulty": (meta.get("difficulty"),), "skill": skills}
+        if cap is not None and any(have["skill"][s] >= cap for s in skills):
+            continue                                   # over the per-skill cap: not even as reserve
+        gains = any(have[dim][k] < want[dim].get(k, 0) for dim, ks in keys.items() for k in ks)
+        full = any(k in want[dim] and have[dim][k] >= want[dim][k] for dim, ks in keys.items() for k in ks)
+        if gains and not full:
+            take(q, meta, keys)
+        else:
+            reserve.append((q, meta, skills))
+
+    # slots the quotas leave open: best reserved candidates, still within the skill cap
+    for q, meta, skills in reserve:
+        if len(picked) >= total:
+            break
+        if cap is not None and any(have["skill"][s] >= cap for s in skills):
+            continue
+        take(q, meta, {"type": (meta.get("type"),), "difficulty": (meta.get("difficulty"),), "skill": skills})
+
+    deficits = {t: max(0, w - have["type"][t]) for t, w in want["type"].items()}
+    return Assembly(picked=picked, type_deficits=deficits, total=total, scanned=scanned, duplicates=dups)
+
+
+def generation_plan(assembly: Assembly, rng: random.Random) -> List[Tuple[str, int]]:
+    """
+    (type, count) requests for the LLM fallback: the exact per-type deficits (capped by the open
+    slots, largest first), then any slots still open spread over the quota types with `rng`.
+    """
+    slots = assembly.open_slots
+    plan: Dict[str, int] = {}
+    for t, need in sorted(assembly.type_deficits.items(), key=lambda kv: (-kv[1], kv[0])):
+        n = min(need, slots)
+        if n > 0:
+            plan[t] = n; slots -= n
+    types = sorted(assembly.type_deficits)
+    for _ in range(slots if types else 0):
+        t = rng.choice(types)
+        plan[t] = plan.get(t, 0) + 1
+    return [(t, n) for t, n in plan.items() if n > 0]
@@ -2,21 +2,33 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from functools import lru_cache
+import time
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
 from uuid import uuid4
 
-from pydantic import BaseModel, Field
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
+from pydantic import BaseModel, Field, ValidationError
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
 
 from jd2interview.utils.config import settings
+from jd2interview.utils.jsonstream import JsonArrayItems
+from jd2interview.utils.llm import (
+    chat_model, structured_chain, tool_model, run_concurrently, stream_concurrently_batches, split_count
+)
+from jd2interview.utils.metrics import llm_context
+from jd2interview.utils.tracing import span, start_span, traced
 from jd2interview.skills.query import top_k_skills_for_role
+from jd2interview.retrieval.embeddings import embed_texts
+from jd2interview.retrieval.vector_index import near_duplicates, remember
+from jd2interview.ingest.models import AnswerItem, QuestionItem
 from jd2interview.storage.db import (
-    SessionLocal,
-    upsert_question_with_answers,
-    upsert_question_meta,
-    Question,
-    Answer,
+    ReadSession,
+    session_scope,
+    bulk_upsert_questions,
+    bulk_upsert_question_meta,
+    bulk_upsert_question_vectors,
     Role,
 )
 
@@ -46,16 +58,13 @@ class GenQABatch(BaseModel):
 
 # ---------------- LLM + Prompt ----------------
 
+GEN_TEMPERATURE = 0.3
+
 def _llm() -> ChatOpenAI:
-    return ChatOpenAI(
-        model=getattr(settings, "OPENAI_MODEL", "gpt-4o-mini"),
-        temperature=0.3,
-        api_key=getattr(settings, "OPENAI_API_KEY", None),
-    )
+    return chat_model(temperature=GEN_TEMPERATURE)
 
 
-PROMPT = ChatPromptTemplate.from_template(
-    """
+PROMPT_TEMPLATE = """
 You are generating interview questions tailored to a specific role.
 
 Role: {role_title}
@@ -65,6 +74,7 @@ Requested count: {count}
 Coding language (if Coding): {code_lang}
 Difficulty policy: {difficulty_policy}
 Restrict difficulty: {restrict_difficulty}
+Batch: {batch} (other batches cover the same request; vary topics and skills across batches)
 
 Rules:
 - If restrict_difficulty is "Easy" / "Medium" / "Hard", set every item's difficulty exactly to that value.
@@ -75,79 +85,191 @@ Rules:
 
 Return ONLY JSON matching the provided schema.
 """
-)
+
+@lru_cache(maxsize=1)
+def _prompt():
+    from langchain.prompts import ChatPromptTemplate
+    return ChatPromptTemplate.from_template(PROMPT_TEMPLATE)
 
 
 # ---------------- Persistence helpers ----------------
 
-def _persist_generated(items: List[GenQA]) -> List[dict]:
+def _embed_text(it: GenQA) -> str:
+    q = it.question or ""
+    return f"{q.split(chr(10), 1)[0][:200]}\n\n{q}"   # what retrieval embeds for a stored question (title + body)
+
+def _dedup_generated(role_id: int, items: List[GenQA]) -> Tuple[List[bool], List[Optional[List[float]]]]:
+    """
+    (keep mask, embeddings): items within DEDUP_SIMILARITY cosine of the role's existing questions, or of
+    an earlier item in the batch, are marked for dropping. Embedding failures keep everything.
+    """
+    if not items or settings.DEDUP_SIMILARITY <= 0:
+        return [True] * len(items), [None] * len(items)
+    with span("generation.dedup", role_id=role_id, items=len(items)) as sp:
+        try:
+            with llm_context("generation.dedup", role_id=role_id):
+                vecs = embed_texts([_embed_text(it) for it in items])
+            with ReadSession() as db:
+                hits = near_duplicates(db, role_id, vecs)
+        except Exception as e:
+            print(f"[LLM] dedup skipped: {type(e).__name__}: {e}")
+            return [True] * len(items), [None] * len(items)
+        sp.set(dropped=sum(1 for h in hits if h))
+    for it, h in zip(items, hits):
+        if h:
+            what = "an earlier item" if h[0] < 0 else f"question #{h[0]}"
+            print(f"[LLM] dropped near-duplicate of {what} (cos={h[1]:.3f}): {(it.question or '')[:60]!r}")
+    return [h is None for h in hits], vecs
+
+@traced("generation.persist")
+def _persist_generated(items: List[GenQA], log: bool = True, vectors: Optional[List] = None,
+                       role_id: Optional[int] = None) -> List[dict]:
     """
     Upsert generated questions into DB with source='generated', persist QuestionMeta,
-    and (optionally) one Answer if the LLM included it.
+    and (optionally) one Answer if the LLM included it. Dedup embeddings, when given, are stored as
+    the questions' vectors and added to the role's vector index. One transaction, set-based writes.
     """
-    out: List[dict] = []
-    inserted = 0
-
-    with SessionLocal() as db:
-        for it in items:
-            # Minimal object with attributes that upsert_question_with_answers expects
-            class _Item:
-                pass
-
-            x = _Item()
-            x.source = "generated"
-            x.external_id = f"gen_{uuid4().hex}"
-            x.url = it.url or ""
-            x.title = (it.question or "").split("\n", 1)[0][:200]  # first line trims to title
-            x.body_markdown = it.question or ""
-            x.body_html = None
-            x.tags = it.tags or []
-            x.companies = []
-            x.question_type = it.type
-            x.difficulty = it.difficulty
-            x.created_at = datetime.utcnow()
-            x.score = 0
-            x.hash = None
-            x.answers = []  # <-- important: avoid AttributeError in DB helper
-
-            q: Question = upsert_question_with_answers(db, x)
-            upsert_question_meta(db, q.id, it.type, it.difficulty, it.evaluation_rubric.model_dump())
-
-            # Optional single answer
-            if it.answer:
-                db.add(
-                    Answer(
-                        question_id=q.id,
-                        external_id=f"gen_{uuid4().hex}_ans",
-                        body_markdown=it.answer,
-                        body_html=None,
-                        score=0,
-                        is_accepted=True,
-                        created_at_source=datetime.utcnow(),
-                    )
-                )
-                db.commit()
-
-            inserted += 1
-            out.append(
-                {
-                    "id": q.id,
-                    "question": it.question,
-                    "type": it.type,
-                    "difficulty": it.difficulty,
-                    "evaluation_rubric": it.evaluation_rubric.model_dump(),
-                    "url": q.url,
-                    "tags": it.tags,
-                    "source": "generated",
-                }
-            )
-
-    print(f"[LLM] persisted {inserted} generated questions → {settings.DB_URL}")
+    if not items:
+        return []
+    vectors = vectors or [None] * len(items)
+    now = datetime.utcnow()
+    rows = [
+        QuestionItem(
+            source="generated",
+            external_id=f"gen_{uuid4().hex}",
+            url=it.url or "",
+            title=(it.question or "").split("\n", 1)[0][:200],  # first line trims to title
+            body_markdown=it.question or "",
+            tags=it.tags or [],
+            question_type=it.type,
+            difficulty=it.difficulty,
+            created_at=now,
+            answers=[AnswerItem(external_id=f"gen_{uuid4().hex}_ans", body_markdown=it.answer,
+                                is_accepted=True, created_at=now)] if it.answer else [],
+        )
+        for it in items
+    ]
+    with session_scope() as db:
+        ids = bulk_upsert_questions(db, rows)
+        bulk_upsert_question_meta(db, [
+            {"question_id": qid, "qtype": it.type, "difficulty": it.difficulty,
+             "rubric": it.evaluation_rubric.model_dump()}
+            for qid, it in zip(ids, items)
+        ])
+        kept = [(qid, vec) for qid, vec in zip(ids, vectors) if vec is not None]
+        bulk_upsert_question_vectors(db, kept)
+
+    out = [
+        {
+            "id": qid,
+            "question": it.question,
+            "type": it.type,
+            "difficulty": it.difficulty,
+            "evaluation_rubric": it.evaluation_rubric.model_dump(),
+            "url": q.url,
+            "tags": it.tags,
+            "source": "generated",
+        }
+        for qid, it, q in zip(ids, items, rows)
+    ]
+    if role_id is not None:
+        remember(role_id, [qid for qid, _ in kept], [vec for _, vec in kept])
+    if log:
+        print(f"[LLM] persisted {len(out)} generated questions → {settings.DB_URL}")
     return out
 
 
 # ---------------- Public API ----------------
 
+def _role_context(role_id: int):
+    skills = [s for s, _ in top_k_skills_for_role(role_id, k=10)]
+    with ReadSession() as db:
+        role_name = db.query(Role.name).filter(Role.id == role_id).scalar()
+    return role_name or (skills[0] if skills else f"Role {role_id}"), skills
+
+def _normalize_type(target_type: str) -> str:
+    return "Technical" if target_type.lower() == "system design" else target_type
+
+def _plan(counts: Dict[str, int]) -> List[tuple]:
+    """[(requested type, prompt type, batch_no, n_batches, count)] with counts split into LLM_GEN_BATCH pieces."""
+    plan = []
+    for typ, cnt in counts.items():
+        parts = split_count(int(cnt or 0))
+        plan += [(typ, _normalize_type(typ), i + 1, len(parts), n) for i, n in enumerate(parts)]
+    return plan
+
+def _inputs(role_title: str, skills: List[str], code_lang: str, difficulty_policy: str, restrict_difficulty: str) -> Dict:
+    return {
+        "role_title": role_title,
+        "role_skills": ", ".join(skills) or "software engineering",
+        "code_lang": code_lang or "Python",
+        "difficulty_policy": difficulty_policy,
+        "restrict_difficulty": restrict_difficulty,
+    }
+
+async def _agenerate_batch(chain, role_id: int, target_type: str, count: int, inputs: Dict) -> List[GenQA]:
+    with span("generation.llm_invoke", role_id=role_id, type=target_type, count=int(count)) as sp, \
+            llm_context("generation", role_id=role_id):
+        res: GenQABatch = await chain.ainvoke({**inputs, "target_type": target_type, "count": int(count)})
+        items = list(res.items) if res and getattr(res, "items", None) else []
+        sp.set(returned=len(items))
+        return items
+
+@traced("generation.generate_qna")
+def generate_qna_multi(
+    role_id: int,
+    counts: Dict[str, int],
+    difficulty_policy: str = "Mixed (let the model balance)",
+    code_lang: str = "Python",
+    persist: bool = True,
+    restrict_difficulty: str = "",
+) -> Dict[str, List[dict]]:
+    """
+    Generate several question types at once: every type's count is split into sub-batches of at most
+    LLM_GEN_BATCH, all requests run concurrently (LLM_CONCURRENCY in flight), and results are merged
+    back in (type, batch) order. Returns {type: [dict, ...]} in the order of `counts`.
+    """
+    role_title, skills = _role_context(role_id)
+    plan = _plan(counts)
+
+    print(
+        f"[LLM] DB_URL={settings.DB_URL} | role_id={role_id} | role_title='{role_title}' | "
+        f"plan={[(t, n) for t, _, _, _, n in plan]} | restrict={restrict_difficulty or 'None'} | model={settings.OPENAI_MODEL}"
+    )
+    out: Dict[str, List[dict]] = {typ: [] for typ in counts}
+    if not plan:
+        return out
+
+    # Shared chain (built once per process)
+    chain = structured_chain(_prompt(), GenQABatch, temperature=GEN_TEMPERATURE, method="function_calling")
+    inputs = _inputs(role_title, skills, code_lang, difficulty_policy, restrict_difficulty)
+    results = run_concurrently([
+        (lambda t=t, b=b, nb=nb, n=n: _agenerate_batch(chain, role_id, t, n, {**inputs, "batch": f"{b} of {nb}"}))
+        for _, t, b, nb, n in plan
+    ])
+
+    merged: List[GenQA] = []
+    owner: List[str] = []
+    for (key, typ, *_), res in zip(plan, results):
+        if isinstance(res, BaseException):
+            print(f"[LLM] invoke failed ({typ}): {type(res).__name__}: {res}")
+            continue
+        merged += res
+        owner += [key] * len(res)
+    print(f"[LLM] model returned {len(merged)} items from {len(plan)} requests")
+    keep, vecs = _dedup_generated(role_id, merged)
+    merged = [it for it, k in zip(merged, keep) if k]
+    owner = [o for o, k in zip(owner, keep) if k]
+    vecs = [v for v, k in zip(vecs, keep) if k]
+    if not merged:
+        return out
+
+    # Persist or return
+    rows = _persist_generated(merged, vectors=vecs, role_id=role_id) if persist else [i.model_dump() for i in merged]
+    for key, row in zip(owner, rows):
+        out[key].append(row)
+    return out
+
 def generate_qna_for_role(
     role_id: int,
     target_type: str,
@@ -163,47 +285,91 @@ def generate_qna_for_role(
     target_type: "Coding" | "Technical" | "Behavioral"
                   ("System Design" will be mapped to "Technical")
     """
-    # Normalize type
-    if target_type.lower() == "system design":
-        target_type = "Technical"
+    return generate_qna_multi(role_id, {target_type: count}, difficulty_policy=difficulty_policy,
+                              code_lang=code_lang, persist=persist,
+                              restrict_difficulty=restrict_difficulty)[target_type]
 
-    # Role context
-    skills = [s for s, _ in top_k_skills_for_role(role_id, k=10)]
-    with SessionLocal() as db:
-        role_name = db.query(Role.name).filter(Role.id == role_id).scalar()
-    role_title = role_name or (skills[0] if skills else f"Role {role_id}")
 
-    print(
-        f"[LLM] DB_URL={settings.DB_URL} | role_id={role_id} | role_title='{role_title}' | "
-        f"target={target_type} | count={count} | restrict={restrict_difficulty or 'None'} | model={settings.OPENAI_MODEL}"
-    )
-
-    # Build chain
-    llm = _llm()
-    chain = PROMPT | llm.with_structured_output(GenQABatch, method="function_calling")
+# ---------------- Streaming ----------------
 
-    # Invoke
+async def _astream_batch(role_id: int, target_type: str, count: int, inputs: Dict, parent) -> AsyncIterator[GenQA]:
+    """Stream one request's tool-call arguments and yield each GenQA as soon as its JSON object closes."""
+    llm = tool_model(GenQABatch, temperature=GEN_TEMPERATURE)
+    messages = _prompt().format_messages(**inputs, target_type=target_type, count=int(count))
+    parser = JsonArrayItems("items")
+    sp = start_span("generation.llm_stream", parent=parent, role_id=role_id, type=target_type, count=int(count))
+    n = 0
     try:
-        res: GenQABatch = chain.invoke(
-            {
-                "role_title": role_title,
-                "role_skills": ", ".join(skills) or "software engineering",
-                "target_type": target_type,
-                "count": int(count),
-                "code_lang": code_lang or "Python",
-                "difficulty_policy": difficulty_policy,
-                "restrict_difficulty": restrict_difficulty,
-            }
-        )
+        with llm_context("generation", role_id=role_id):
+            async for chunk in llm.astream(messages):
+                pieces = [tc.get("args") or "" for tc in (getattr(chunk, "tool_call_chunks", None) or [])]
+                if isinstance(chunk.content, str) and chunk.content:
+                    pieces.append(chunk.content)          # models that answer in plain JSON content
+                for piece in pieces:
+                    for obj in parser.feed(piece):
+                        try:
+                            item = GenQA.model_validate(obj)
+                        except ValidationError:
+                            continue
+                        n += 1
+                        if n == 1:
+                            sp.set(first_item_ms=round((time.time_ns() - sp.start_ns) / 1e6, 1))
+                        yield item
     except Exception as e:
-        print(f"[LLM] invoke failed: {type(e).__name__}: {e}")
-        return []
-
-    items: List[GenQA] = list(res.items) if res and getattr(res, "items", None) else []
-    print(f"[LLM] model returned {len(items)} items")
+        sp.finish(error=e)
+        raise
+    finally:
+        sp.set(returned=n)
+        sp.finish()
 
-    if not items:
-        return []
-
-    # Persist or return
-    return _persist_generated(items) if persist else [i.model_dump() for i in items]
\ No newline at end of file
+def stream_qna_for_role(
+    role_id: int,
+    counts: Dict[str, int],
+    difficulty_policy: str = "Mixed (let the model balance)",
+    code_lang: str = "Python",
+    persist: bool = True,
+    restrict_difficulty: str = "",
+) -> Iterator[dict]:
+    """
+    Streaming variant of generate_qna_multi: all sub-batches stream concurrently and every question is
+    persisted and yielded (with "requested_type" = its key in `counts`) the moment it is complete.
+    Questions that arrive while the previous ones are being deduplicated/persisted are handled together
+    (one embedding request, one index lookup, one transaction).
+    """
+    # generator: the root span is finished explicitly, child spans never stay open across a yield
+    root = start_span("generation.stream_qna", role_id=role_id)
+    n = dropped = 0
+    try:
+        role_title, skills = _role_context(role_id)
+        plan = _plan(counts)
+        inputs = _inputs(role_title, skills, code_lang, difficulty_policy, restrict_difficulty)
+        print(f"[LLM] streaming role_id={role_id} | plan={[(t, c) for t, _, _, _, c in plan]} | model={settings.OPENAI_MODEL}")
+        jobs = [
+            (lambda t=t, b=b, nb=nb, c=c: _astream_batch(role_id, t, c, {**inputs, "batch": f"{b} of {nb}"}, root))
+            for _, t, b, nb, c in plan
+        ]
+        for arrived in stream_concurrently_batches(jobs, max_batch=settings.LLM_GEN_BATCH):
+            items, owner = [], []
+            for idx, got in arrived:
+                if isinstance(got, BaseException):
+                    print(f"[LLM] stream failed ({plan[idx][1]}): {type(got).__name__}: {got}")
+                    continue
+                items.append(got); owner.append(plan[idx][0])
+            keep, vecs = _dedup_generated(role_id, items)
+            dropped += keep.count(False)
+            kept = [(it, o, v) for it, o, v, k in zip(items, owner, vecs, keep) if k]
+            if not kept:
+                continue
+            items = [it for it, _, _ in kept]
+            rows = (_persist_generated(items, log=False, vectors=[v for _, _, v in kept], role_id=role_id)
+                    if persist else [it.model_dump() for it in items])
+            for row, (_, key, _) in zip(rows, kept):
+                n += 1
+                yield {**row, "requested_type": key}
+        print(f"[LLM] streamed {n} items from {len(plan)} requests ({dropped} near-duplicates dropped)")
+    except Exception as e:
+        root.finish(error=e)
+        raise
+    finally:
+        root.set(items=n, dropped=dropped)
+        root.finish()
@@ -1,19 +1,26 @@
 # add near imports
+import time
+from dataclasses import asdict
+from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Tuple
-import numpy as np, json, random
+import numpy as np
 from pydantic import BaseModel, Field
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
 
 from jd2interview.skills.query import top_k_skills_for_role
+from jd2interview.skills.canon import canon_index
 from jd2interview.storage.db import (
     session_scope, get_questions_with_any_tags,
-    get_or_none_question_vector, upsert_question_vector,
-    get_or_none_question_meta, upsert_question_meta
+    question_vectors_by_id, bulk_upsert_question_vectors,
+    question_meta_by_id, upsert_question_meta
 )
 from jd2interview.retrieval.embeddings import embed_texts
+from jd2interview.generation.assembler import Quotas, assemble, generation_plan, seeded_rng
 from jd2interview.enrich.metadata import classify_question, interview_gate
 from jd2interview.utils.config import settings
+from jd2interview.utils.llm import structured_chain, run_concurrently, split_count
+from jd2interview.utils.metrics import llm_context, metrics
+from jd2interview.utils.tracing import span
 
 # ---------- existing helpers (keep) ----------
 def _canon(text: str) -> str: return (text or "").strip()
@@ -24,32 +31,39 @@ def _build_query_text(role_title: str, skills: List[Tuple[str, float]]) -> str:
 def _cosine(a, b): denom=(np.linalg.norm(a)*np.linalg.norm(b)) or 1e-8; return float(np.dot(a,b)/denom)
 
 def _ensure_vectors(db, qs: List[Dict]) -> np.ndarray:
-    texts, idxs, vecs = [], [], []
-    for q in qs:
-        qv = get_or_none_question_vector(db, q["id"])
-        if qv:
-            vecs.append(np.array(json.loads(qv.embedding_json), dtype=np.float32))
-        else:
-            texts.append(_q_repr(q)); idxs.append(q["id"]); vecs.append(None)
-    if idxs:
-        new_vecs = embed_texts(texts)
-        for qid, emb in zip(idxs, new_vecs):
-            upsert_question_vector(db, qid, emb)
-        pos = 0
-        for i, v in enumerate(vecs):
-            if v is None:
-                vecs[i] = np.array(new_vecs[pos], dtype=np.float32); pos += 1
+    have = question_vectors_by_id(db, [q["id"] for q in qs])
+    missing = [q for q in qs if q["id"] not in have]
+    metrics.record_cache("retrieval.embed", hits=len(qs) - len(missing), misses=len(missing))
+    if missing:
+        with llm_context("retrieval.embed"):
+            new_vecs = embed_texts([_q_repr(q) for q in missing])
+        bulk_upsert_question_vectors(db, [(q["id"], emb) for q, emb in zip(missing, new_vecs)])
+        db.commit()
+        have.update((q["id"], emb) for q, emb in zip(missing, new_vecs))
+    vecs = [np.asarray(have[q["id"]], dtype=np.float32) for q in qs]
     return np.vstack(vecs) if vecs else np.zeros((0, 1536), dtype=np.float32)
 
-def _ensure_meta(db, qid: int, title: str, body: str) -> Dict:
-    qm = get_or_none_question_meta(db, qid)
-    if qm:
-        try: rubric = json.loads(qm.rubric_json or "{}")
-        except Exception: rubric = {}
-        return {"type": qm.qtype, "difficulty": qm.difficulty, "evaluation_rubric": rubric}
-    meta = classify_question(title, body)
-    upsert_question_meta(db, qid, meta.qtype, meta.difficulty, meta.evaluation_rubric.model_dump())
-    return {"type": meta.qtype, "difficulty": meta.difficulty, "evaluation_rubric": meta.evaluation_rubric.model_dump()}
+def _ensure_metas(db, qs: List[Dict], cache: Dict[int, Dict]) -> Dict[int, Dict]:
+    """Fill `cache` with {type, difficulty, evaluation_rubric} for `qs`: one lookup, classify only the unknown."""
+    todo = [q for q in qs if q["id"] not in cache]
+    if not todo:
+        return cache
+    cache.update(question_meta_by_id(db, [q["id"] for q in todo]))
+    missing = [q for q in todo if q["id"] not in cache]
+    metrics.record_cache("enrich.classify", hits=len(todo) - len(missing), misses=len(missing))
+    for q in missing:
+        meta = classify_question(_canon(q["title"]), _canon(q["body_md"]))
+        rubric = meta.evaluation_rubric.model_dump()
+        upsert_question_meta(db, q["id"], meta.qtype, meta.difficulty, rubric)
+        cache[q["id"]] = {"type": meta.qtype, "difficulty": meta.difficulty, "evaluation_rubric": rubric}
+    return cache
+
+def _passes_gate(q: Dict) -> bool:
+    try:
+        return bool(interview_gate(_canon(q["title"]), _canon(q["body_md"])).is_interview)
+    except Exception:
+        # if gate call fails, conservatively keep it
+        return True
 
 # ---------- LLM fallback generator ----------
 class GenQ(BaseModel):
@@ -58,8 +72,11 @@ class GenQ(BaseModel):
     difficulty: str
     evaluation_rubric: Dict = Field(default_factory=dict)
 
-FALLBACK_PROMPT = ChatPromptTemplate.from_template("""
-Generate {count} interview questions for the role below. Return ONLY a JSON array of objects with keys:
+class GenQList(BaseModel):
+    items: List[GenQ] = Field(default_factory=list)
+
+FALLBACK_PROMPT_TEMPLATE = """
+Generate {count} interview questions for the role below. Return ONLY a JSON object whose "items" array holds objects with keys:
 question, type (Behavioral|Technical|Coding|System Design), difficulty (Easy|Medium|Hard), evaluation_rubric (JSON).
 
 Role: {role_title}
@@ -68,31 +85,60 @@ Target type: {target_type}
 Guidelines:
 - Make them realistic and concise.
 - Ensure they assess the listed skills where relevant.
-""")
+"""
+
+@lru_cache(maxsize=1)
+def _fallback_prompt():
+    from langchain.prompts import ChatPromptTemplate
+    return ChatPromptTemplate.from_template(FALLBACK_PROMPT_TEMPLATE)
 
 def ensure_minimums(picked, min_per_type, role_title, skills):
+    """Top `picked` up to `min_per_type`; only types actually short are generated."""
     from collections import Counter
     have = Counter([p["type"] for p in picked])
-    adds = []
-    for t, m in min_per_type.items():
-        need = max(0, m - have.get(t, 0))
-        if need > 0:
-            adds.extend(llm_generate(role_title, skills, need, t))  # uses your existing fallback
+    plan = [(t, m - have.get(t, 0)) for t, m in min_per_type.items() if m > have.get(t, 0)]
+    if not plan:
+        return picked
+    adds = [g for gen in llm_generate_many(role_title, skills, plan) for g in gen]  # all types concurrently
     # wrap generated items like retrieved
     adds = [{**g, "source": "generated", "url": None, "tags": []} for g in adds]
     return picked + adds
 
 
 def llm_generate(role_title: str, skills: List[Tuple[str,float]], need: int, target_type: str) -> List[Dict]:
-    if need <= 0: return []
-    llm = ChatOpenAI(model=settings.OPENAI_MODEL, api_key=settings.OPENAI_API_KEY, temperature=0.3)
-    chain = FALLBACK_PROMPT | llm.with_structured_output(List[GenQ])  # type: ignore
+    return llm_generate_many(role_title, skills, [(target_type, need)])[0]
+
+def llm_generate_many(role_title: str, skills: List[Tuple[str,float]], plan: List[Tuple[str, int]]) -> List[List[Dict]]:
+    """
+    Fallback generation for several (type, need) pairs at once: needs are split into LLM_GEN_BATCH
+    sub-batches, all requests run concurrently, and results come back per pair in plan order.
+    A failed sub-batch is logged and skipped; the caller sees it as a shortfall.
+    """
+    # a bare List[GenQ] can't be turned into a tool schema; wrap it in GenQList
+    chain = structured_chain(_fallback_prompt(), GenQList, temperature=0.3, method="function_calling")
     skills_csv = ", ".join(s for s,_ in skills[:8])
-    out = chain.invoke({"count": need, "role_title": role_title, "skills_csv": skills_csv, "target_type": target_type})
-    return [q.model_dump() for q in out][:need]
+
+    async def _one(target_type: str, n: int):
+        with span("generation.fallback", type=target_type, need=n), llm_context("generation.fallback"):
+            out = await chain.ainvoke({"count": n, "role_title": role_title, "skills_csv": skills_csv,
+                                       "target_type": target_type})
+        return [q.model_dump() for q in (out.items if out else [])][:n]
+
+    jobs, owner = [], []
+    for i, (t, need) in enumerate(plan):
+        for n in split_count(need):
+            jobs.append(lambda t=t, n=n: _one(t, n)); owner.append(i)
+    results: List[List[Dict]] = [[] for _ in plan]
+    for i, res in zip(owner, run_concurrently(jobs)):
+        if isinstance(res, BaseException):
+            print(f"[LLM] fallback failed ({plan[i][0]}): {type(res).__name__}: {res}")
+            continue
+        results[i].extend(res)
+    return results
 
 # ---------- distribution resolver (you already added earlier) ----------
-def resolve_distribution(total: int, dist: Dict[str, int], flexible: bool = True):
+def resolve_distribution(total: int, dist: Dict[str, int], flexible: bool = True, seed: int | None = None):
+    rng = seeded_rng(settings.PACKAGE_SEED if seed is None else seed, "distribution")
     total = int(max(0, total))
     keys = list(dist.keys())
     vals = {k: max(0, int(dist[k])) for k in keys}
@@ -103,116 +149,192 @@ def resolve_distribution(total: int, dist: Dict[str, int], flexible: bool = True
     if s == total: return vals, total, "ok"
     if s < total:
         rem = total - s
-        for _ in range(rem): vals[random.choice(keys)] += 1
+        for _ in range(rem): vals[rng.choice(keys)] += 1
         return vals, total, "filled"
     return vals, s, "raised"
 
 # ---------- main: build package + stats + fallback ----------
+DEFAULT_PER_TYPE = {"Behavioral": 1, "Technical": 2, "Coding": 1, "System Design": 1}
+PEEK_META = 400       # candidates per role classified up front for the availability stats
+
 def build_interview_package(
     role_id: int,
     total_q: int = 5,
     per_type_target: Dict[str, int] | None = None,
     allow_fallback: bool = True,
+    per_difficulty_target: Dict[str, int] | None = None,
+    per_skill_target: Dict[str, int] | None = None,
+    max_per_skill: int | None = None,
+    seed: int | None = None,
+    use_cache: bool = True,
+    force: bool = False,
 ) -> Dict:
-    per_type_target = per_type_target or {"Behavioral":1,"Technical":2,"Coding":1,"System Design":1}
-    stats = {"requested_total": total_q, "per_type_target": dict(per_type_target), "candidates": 0,
-             "after_gate": 0, "per_type_available": {"Behavioral":0,"Technical":0,"Coding":0,"System Design":0}}
+    """
+    One role's package; served from the package cache when the role and parameters are unchanged.
+    force=True skips the lookup but still stores the result; use_cache=False bypasses the cache entirely.
+    """
+    quotas = _quotas(total_q, per_type_target, per_difficulty_target, per_skill_target, max_per_skill)
+    with span("generation.build_package", role_id=role_id, total_q=total_q) as sp, \
+            llm_context("package", role_id=role_id):
+        out = _cached_build([role_id], quotas, allow_fallback, seed, use_cache, force)[role_id]
+        sp.set(produced=len(out["package"]), candidates=out["stats"]["candidates"], cache=out["cache"]["status"])
+        return out
+
+def build_interview_packages(
+    role_ids: List[int],
+    total_q: int = 5,
+    per_type_target: Dict[str, int] | None = None,
+    allow_fallback: bool = True,
+    per_difficulty_target: Dict[str, int] | None = None,
+    per_skill_target: Dict[str, int] | None = None,
+    max_per_skill: int | None = None,
+    seed: int | None = None,
+    use_cache: bool = True,
+    force: bool = False,
+) -> Dict[int, Dict]:
+    """
+    Packages for many roles (a hiring batch) from one shared candidate pool: candidates are fetched once
+    for the union of the roles' skills, all role queries are embedded in one call and scored with one
+    roles × questions product, and each candidate is gated / classified at most once.
+    Returns {role_id: {"package", "stats"}}, each the same as build_interview_package(role_id) would give.
+    """
+    role_ids = list(dict.fromkeys(role_ids))
+    quotas = _quotas(total_q, per_type_target, per_difficulty_target, per_skill_target, max_per_skill)
+    with span("generation.build_packages", roles=len(role_ids), total_q=total_q) as sp, llm_context("package"):
+        out = _cached_build(role_ids, quotas, allow_fallback, seed, use_cache, force)
+        sp.set(produced=sum(len(o["package"]) for o in out.values()),
+               cached=sum(o["cache"]["status"] == "cached" for o in out.values()))
+        return out
+
+def _quotas(total_q, per_type, per_difficulty, per_skill, max_per_skill) -> Quotas:
+    return Quotas(total=int(max(0, total_q)), per_type=dict(per_type or DEFAULT_PER_TYPE),
+                  per_difficulty=dict(per_difficulty or {}), per_skill=dict(per_skill or {}),
+                  max_per_skill=max_per_skill)
 
-    skills = top_k_skills_for_role(role_id, k=8)  # [(skill, weight)]
+def _cached_build(role_ids: List[int], quotas: Quotas, allow_fallback: bool, seed: int | None,
+                  use_cache: bool, force: bool = False) -> Dict[int, Dict]:
+    """Fresh cache hits as they are (none when forced); the remaining roles built together and stored. Adds out["cache"]."""
+    from jd2interview.generation import package_cache
+    seed = settings.PACKAGE_SEED if seed is None else int(seed)
+    params = {"quotas": asdict(quotas), "allow_fallback": bool(allow_fallback), "seed": seed}
+    use_cache = use_cache and settings.PACKAGE_CACHE
+    hits, keys = package_cache.lookup(role_ids, params, serve=not force) if use_cache else ({}, {})
+    misses = [rid for rid in role_ids if rid not in hits]
+    if not misses:
+        return hits
+    t0 = time.perf_counter()
+    built = _build_interview_packages(misses, quotas, allow_fallback, seed)
+    build_ms = (time.perf_counter() - t0) * 1000.0
+    if use_cache:
+        package_cache.store(built, keys, build_ms)
+    for rid, out in built.items():
+        out["cache"] = {"status": "rebuilt", "fingerprint": keys[rid].fingerprint if rid in keys else None,
+                        "built_at": datetime.utcnow().isoformat(timespec="seconds"), "build_ms": build_ms}
+    return {rid: hits.get(rid) or built[rid] for rid in role_ids}
+
+def _build_interview_packages(role_ids: List[int], quotas: Quotas, allow_fallback: bool,
+                              seed: int | None) -> Dict[int, Dict]:
+    seed = settings.PACKAGE_SEED if seed is None else int(seed)
+    total_q = quotas.total
     role_title = "Role"
+    skills = {rid: top_k_skills_for_role(rid, k=8) for rid in role_ids}  # {role: [(skill, weight)]}
+    stats = {rid: {"requested_total": total_q, "per_type_target": dict(quotas.per_type), "seed": seed,
+                   "candidates": 0, "pool": 0, "after_gate": 0,
+                   "per_type_available": {"Behavioral":0,"Technical":0,"Coding":0,"System Design":0}}
+             for rid in role_ids}
+    out = {rid: {"package": [], "stats": stats[rid]} for rid in role_ids}
 
     with session_scope() as db:
-        candidates = get_questions_with_any_tags(db, [s for s,_ in skills], limit=1200)
-        stats["candidates"] = len(candidates)
-        if not candidates:
-            return {"package": [], "stats": stats}
-
-        qvec = np.array(embed_texts([_build_query_text(role_title, skills)])[0], dtype=np.float32)
-        M = _ensure_vectors(db, candidates)
-
-        sims = M @ (qvec / (np.linalg.norm(qvec) or 1e-8))
-        order = np.argsort(-sims)
-
-        picked: List[Dict] = []
-        counts = {k:0 for k in per_type_target.keys()}
-
-        # First pass: gate + count availability
-        gated = []
-        for idx in order:
-            q = candidates[int(idx)]
-            title = _canon(q["title"]); body = _canon(q["body_md"])
-            try:
-                gate = interview_gate(title, body)
-                if not gate.is_interview:
-                    continue
-            except Exception:
-                # if gate call fails, conservatively keep it
-                pass
-            gated.append(q)
-        stats["after_gate"] = len(gated)
-
-        # Peek meta types to know availability (cheap cache)
-        type_cache = {}
-        for q in gated[:400]:  # limit classification for stats
-            meta = _ensure_meta(db, q["id"], _canon(q["title"]), _canon(q["body_md"]))
-            type_cache[q["id"]] = meta["type"]
-            stats["per_type_available"][meta["type"]] = stats["per_type_available"].get(meta["type"], 0) + 1
-
-        # Second pass: pick to fill target per type
-        for q in gated:
-            if len(picked) >= total_q: break
-            meta = type_cache.get(q["id"]) or _ensure_meta(db, q["id"], _canon(q["title"]), _canon(q["body_md"]))["type"]
-            if counts.get(meta, 0) < per_type_target.get(meta, 0):
-                picked.append({
-                    "question": f"{_canon(q['title'])}\n\n{_canon(q['body_md'])}",
-                    "type": meta,
-                    "difficulty": _ensure_meta(db, q["id"], _canon(q["title"]), _canon(q["body_md"]))["difficulty"],
-                    "evaluation_rubric": _ensure_meta(db, q["id"], _canon(q["title"]), _canon(q["body_md"]))["evaluation_rubric"],
-                    "source": "retrieved",
-                    "url": q["url"],
-                    "tags": q["tags"],
-                })
-                counts[meta] += 1
-
-        # Third pass: top-up regardless of type
-        i = 0
-        while len(picked) < total_q and i < len(gated):
-            q = gated[i]; i += 1
-            meta = type_cache.get(q["id"]) or _ensure_meta(db, q["id"], _canon(q["title"]), _canon(q["body_md"]))["type"]
-            item = {
-                "question": f"{_canon(q['title'])}\n\n{_canon(q['body_md'])}",
-                "type": meta,
-                "difficulty": _ensure_meta(db, q["id"], _canon(q["title"]), _canon(q["body_md"]))["difficulty"],
-                "evaluation_rubric": _ensure_meta(db, q["id"], _canon(q["title"]), _canon(q["body_md"]))["evaluation_rubric"],
-                "source": "retrieved",
-                "url": q["url"],
-                "tags": q["tags"],
-            }
-            # avoid exact duplicates
-            if not any(item["url"] == p.get("url") and item["question"] == p["question"] for p in picked):
-                picked.append(item)
-
-        # Fallback to LLM if still short
-        shortfall = total_q - len(picked)
-        if shortfall > 0 and allow_fallback:
-            # fill via types that are underfilled first
-            need_by_type = {t: max(0, per_type_target.get(t,0) - sum(1 for p in picked if p["type"]==t))
-                            for t in per_type_target}
-            types_order = sorted(need_by_type.items(), key=lambda kv: -kv[1])
-            for t, need in types_order:
-                if shortfall <= 0: break
-                gen = llm_generate(role_title, skills, min(shortfall, max(0, need)), t)
-                for g in gen:
-                    picked.append({**g, "source": "generated", "url": None, "tags": []})
-                shortfall = total_q - len(picked)
-            # still short? fill any type
-            if shortfall > 0:
-                gen = llm_generate(role_title, skills, shortfall, target_type=random.choice(list(per_type_target.keys())))
-                for g in gen:
-                    picked.append({**g, "source": "generated", "url": None, "tags": []})
-
-        stats["produced"] = len(picked)
-        stats["shortfall"] = max(0, total_q - len(picked))
-        min_per_type = {"Behavioral": 5, "Technical": 5, "Coding": 5, "System Design": 5}
-        picked = ensure_minimums(picked, min_per_type, role_title, skills)
-        return {"package": picked[:total_q], "stats": stats}
\ No newline at end of file
+        # one scan serves every role: the score-ordered window is the same, only the tag filter differs
+        ci = canon_index()
+        matchers = {rid: ci.matcher([s for s, _ in skills[rid]]) for rid in role_ids}
+        names = list(dict.fromkeys(s for rid in role_ids for s, _ in skills[rid]))
+        pool = get_questions_with_any_tags(db, names, limit=1200,
+                                           match=lambda tags: any(m(tags) for m in matchers.values()))
+        members = {rid: np.array([i for i, q in enumerate(pool) if matchers[rid](q["tags"])], dtype=np.int64)
+                   for rid in role_ids}
+        active = [rid for rid in role_ids if len(members[rid])]
+        for rid in role_ids:
+            stats[rid]["candidates"], stats[rid]["pool"] = len(members[rid]), len(pool)
+        if not active:
+            return out
+
+        with span("retrieval.rank", candidates=len(pool), roles=len(active)):
+            texts = [_build_query_text(role_title, skills[rid]) for rid in active]
+            uniq = list(dict.fromkeys(texts))          # roles with the same top skills share a query
+            with llm_context("retrieval.embed"):
+                E = np.asarray(embed_texts(uniq), dtype=np.float32)
+            Q = E[[uniq.index(t) for t in texts]]
+            Q = Q / np.maximum(np.linalg.norm(Q, axis=1, keepdims=True), 1e-8)
+            M = _ensure_vectors(db, pool)
+            S = Q @ M.T                                 # roles × pool
+            orders = {rid: members[rid][np.argsort(-S[r, members[rid]], kind="stable")]
+                      for r, rid in enumerate(active)}
+
+        # gate every pooled candidate once, whichever roles it serves
+        with span("enrich.gate_candidates", candidates=len(pool)) as gsp:
+            keep = [_passes_gate(q) for q in pool]
+            gsp.set(kept=sum(keep))
+        gated = {rid: [pool[int(i)] for i in orders[rid] if keep[int(i)]] for rid in active}
+
+        # Peek meta types to know availability; the union of every role's head is classified once
+        metas: Dict[int, Dict] = {}
+        with span("enrich.peek_meta", items=len({q["id"] for rid in active for q in gated[rid][:PEEK_META]})):
+            _ensure_metas(db, [q for rid in active for q in gated[rid][:PEEK_META]], metas)
+
+        for rid in active:
+            st = stats[rid]
+            st["after_gate"] = len(gated[rid])
+            for q in gated[rid][:PEEK_META]:
+                t = metas[q["id"]]["type"]
+                st["per_type_available"][t] = st["per_type_available"].get(t, 0) + 1
+            with llm_context("package", role_id=rid):
+                out[rid]["package"] = _assemble_package(db, gated[rid], metas, quotas, allow_fallback, role_title,
+                                                        skills[rid], st, seeded_rng(seed, rid), ci)
+        return out
+
+def _retrieved_item(q: Dict, meta: Dict) -> Dict:
+    return {
+        "question": _q_text(q),
+        "type": meta["type"],
+        "difficulty": meta["difficulty"],
+        "evaluation_rubric": meta["evaluation_rubric"],
+        "source": "retrieved",
+        "url": q["url"],
+        "tags": q["tags"],
+    }
+
+def _q_text(q: Dict) -> str:
+    return f"{_canon(q['title'])}\n\n{_canon(q['body_md'])}"
+
+def _generated(role_title: str, skills: List[Tuple[str, float]], plan: List[Tuple[str, int]]) -> List[Dict]:
+    return [{**g, "source": "generated", "url": None, "tags": []}
+            for gen in llm_generate_many(role_title, skills, plan) for g in gen]   # types concurrently
+
+def _assemble_package(db, gated: List[Dict], metas: Dict[int, Dict], quotas: Quotas, allow_fallback: bool,
+                      role_title: str, skills: List[Tuple[str, float]], stats: Dict, rng, ci) -> List[Dict]:
+    """One role's package: quota-driven pick over its ranked candidates, then LLM only for what is missing."""
+    skills_of = lambda q: ()
+    if quotas.per_skill or quotas.max_per_skill is not None:
+        by_id = {ci.resolve(s): s for s, _ in skills}
+        by_id.pop(None, None)
+        skills_of = lambda q: [by_id[sid] for t in q["tags"] if (sid := ci.resolve(t)) in by_id]
+
+    res = assemble(gated, quotas, meta_of=lambda q: _ensure_metas(db, [q], metas)[q["id"]],
+                   skills_of=skills_of, text_of=_q_text)
+    picked = [_retrieved_item(q, meta) for q, meta in res.picked]
+    stats["scanned"], stats["duplicates"] = res.scanned, res.duplicates
+
+    # Fallback to LLM only for the exact deficits (then any slots no candidate could fill)
+    plan = generation_plan(res, rng) if allow_fallback else []
+    stats["generation_plan"] = dict(plan)
+    if plan:
+        picked += _generated(role_title, skills, plan)
+        short = quotas.total - len(picked)
+        if short > 0:    # the model returned fewer than asked; one more request for the rest
+            types = sorted(quotas.per_type)
+            picked += _generated(role_title, skills, [(rng.choice(types), short)]) if types else []
+
+    stats["produced"] = len(picked[:quotas.total])
+    stats["shortfall"] = max(0, quotas.total - len(picked))
+    return picked[:quotas.total]
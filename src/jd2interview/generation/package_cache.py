@@ -0,0 +1,104 @@
+# src/jd2interview/generation/package_cache.py
+"""
+Stored interview packages, so a repeat request for the same role and parameters is a lookup.
+
+An entry is keyed by sha256(role id, role skill-graph version, package parameters, seed). A new
+skill graph for the role bumps `role_skills:<id>`, which changes the fingerprint (older entries for
+the role are dropped on the next store). Each entry also records the corpus watermark it was built
+against (highest question id); it is served until PACKAGE_CACHE_NEW_QUESTIONS questions relevant to
+the role have arrived beyond that mark. The entry also keeps how far it has been checked and the count
+so far, so each lookup only tag-matches questions that arrived since the previous one.
+"""
+from __future__ import annotations
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Dict, List
+
+from sqlalchemy import func, select
+
+from jd2interview.skills.canon import canon_index
+from jd2interview.skills.query import role_version_key, top_k_skills_for_role
+from jd2interview.storage.db import (
+    Question, QuestionSummary, ReadSession, advance_package_cache, get_package_cache, get_version,
+    put_package_cache, session_scope,
+)
+from jd2interview.utils.config import settings
+
+FORMAT = 1      # bump when the stored payload shape or the assembly logic changes
+
+
+@dataclass
+class CacheKey:
+    role_id: int
+    fingerprint: str
+    role_version: int
+    corpus_mark: int
+
+
+def fingerprint(role_id: int, role_version: int, params: Dict) -> str:
+    blob = json.dumps({"format": FORMAT, "role": int(role_id), "role_version": int(role_version), "params": params},
+                      sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+def _new_relevant(db, role_id: int, since_id: int, upto_id: int, stop_at: int) -> int:
+    """Questions in (`since_id`, `upto_id`] that match the role's skills (counting stops at `stop_at`)."""
+    match = canon_index().matcher([s for s, _ in top_k_skills_for_role(role_id, k=8)])
+    n = 0
+    for tags_json in db.execute(select(QuestionSummary.tags_json)
+                                .where(QuestionSummary.question_id > since_id,
+                                       QuestionSummary.question_id <= upto_id)).scalars():
+        try:
+            tags = {t.lower() for t in json.loads(tags_json or "[]")}
+        except Exception:
+            continue
+        if match(tags):
+            n += 1
+            if n >= stop_at:
+                break
+    return n
+
+def lookup(role_ids: List[int], params: Dict, serve: bool = True) -> tuple[Dict[int, Dict], Dict[int, CacheKey]]:
+    """
+    ({role_id: cached result}, {role_id: CacheKey}) — keys for every role, results only for fresh hits
+    (serve=False: keys only, for a forced rebuild that should still be stored).
+    """
+    with ReadSession() as db:
+        mark = int(db.execute(select(func.max(Question.id))).scalar() or 0)
+        keys = {}
+        for rid in role_ids:
+            rv = get_version(db, role_version_key(rid))
+            keys[rid] = CacheKey(rid, fingerprint(rid, rv, params), rv, mark)
+        if not serve:
+            return {}, keys
+        rows = get_package_cache(db, [k.fingerprint for k in keys.values()])
+        hits: Dict[int, Dict] = {}
+        advanced = []
+        threshold = max(1, settings.PACKAGE_CACHE_NEW_QUESTIONS)
+        for rid, key in keys.items():
+            row = rows.get(key.fingerprint)
+            if row is None:
+                continue
+            checked, seen = max(row.checked_mark or 0, row.corpus_mark), row.new_relevant or 0
+            if checked < mark:      # only questions that arrived since the previous lookup
+                seen += _new_relevant(db, rid, checked, mark, threshold - seen)
+                advanced.append((key.fingerprint, row.corpus_mark, mark, seen))
+            if seen >= threshold:
+                continue
+            out = json.loads(row.payload_json)
+            out["cache"] = {"status": "cached", "fingerprint": key.fingerprint,
+                            "built_at": row.created_at.isoformat(timespec="seconds"), "build_ms": row.build_ms}
+            hits[rid] = out
+    if advanced:
+        with session_scope() as db:
+            for fp, built_mark, checked, seen in advanced:
+                advance_package_cache(db, fp, built_mark, checked, seen)
+    return hits, keys
+
+def store(results: Dict[int, Dict], keys: Dict[int, CacheKey], build_ms: float):
+    rows = [{"fingerprint": keys[rid].fingerprint, "role_id": rid, "role_version": keys[rid].role_version,
+             "corpus_mark": keys[rid].corpus_mark, "payload": {"package": out["package"], "stats": out["stats"]},
+             "build_ms": build_ms} for rid, out in results.items()]
+    if rows:
+        with session_scope() as db:
+            put_package_cache(db, rows)
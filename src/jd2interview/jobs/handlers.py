@@ -0,0 +1,65 @@
+# src/jd2interview/jobs/handlers.py
+from __future__ import annotations
+from typing import Dict, Optional
+
+from jd2interview.jobs.runner import job_handler
+from jd2interview.crawl.role_aware import crawl_for_role_stream
+from jd2interview.enrich.metadata import classify_role_questions_stream
+from jd2interview.generation.llm_qna import generate_qna_multi, stream_qna_for_role
+from jd2interview.utils.config import settings
+
+WEB_MODES = ("Web only", "Web + LLM")
+LLM_MODES = ("LLM only", "Web + LLM")
+NEW_ITEM_PREFIX = "[llm] + "   # progress lines announcing a newly persisted question
+
+
+@job_handler("crawl")
+def crawl_job(role_id: Optional[int], params: Dict):
+    for msg in crawl_for_role_stream(int(role_id)):
+        yield f"[crawl] {msg}"
+
+
+@job_handler("classify")
+def classify_job(role_id: Optional[int], params: Dict):
+    for msg in classify_role_questions_stream(int(role_id), batch_size=int(params.get("batch_size", 25)),
+                                              max_items=params.get("max_items")):
+        yield f"[classify] {msg}"
+
+
+@job_handler("generate")
+def generate_job(role_id: Optional[int], params: Dict):
+    counts = params.get("counts") or settings.LLM_GEN_COUNTS
+    todo = {typ: int(cnt) for typ, cnt in counts.items() if int(cnt) > 0}
+    yield f"[llm] Generating {todo} (all types concurrently)…", 0.0
+    if settings.LLM_STREAM:
+        # every question is persisted as it completes; the "[llm] +" lines tell the UI to refresh
+        got = {typ: 0 for typ in todo}
+        total = max(1, sum(todo.values()))
+        for row in stream_qna_for_role(int(role_id), todo, persist=True):
+            got[row["requested_type"]] += 1
+            title = (row.get("question") or "").split("\n", 1)[0][:60]
+            yield f"{NEW_ITEM_PREFIX}{row['requested_type']}: {title}", min(1.0, sum(got.values()) / total)
+    else:
+        out = generate_qna_multi(int(role_id), todo, persist=True)
+        got = {typ: len(rows) for typ, rows in out.items()}
+    yield f"[llm] Generated: {got}", 1.0
+
+
+@job_handler("generate_questions")
+def generate_questions_job(role_id: Optional[int], params: Dict):
+    """What the UI 'Generate questions' button runs: crawl → classify and/or LLM generation."""
+    source_mode = params.get("source_mode") or "Web only"
+    stages = []
+    if source_mode in WEB_MODES:
+        stages += [crawl_job, classify_job]
+    if source_mode in LLM_MODES:
+        stages.append(generate_job)
+
+    for i, stage in enumerate(stages):
+        lo, hi = i / len(stages), (i + 1) / len(stages)
+        for upd in stage(role_id, params):
+            if isinstance(upd, tuple):
+                yield upd[0], lo + (hi - lo) * upd[1]
+            else:
+                yield upd, lo
+        yield f"Stage {i + 1}/{len(stages)} finished", hi
@@ -0,0 +1,233 @@
+# src/jd2interview/jobs/runner.py
+from __future__ import annotations
+import hashlib
+import json
+import os
+import socket
+import threading
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy import or_, select, update
+
+from jd2interview.storage.db import session_scope, SessionLocal, init_db, Job
+from jd2interview.utils.config import settings
+from jd2interview.utils.tracing import span
+
+# A handler is a generator: it receives (role_id, params) and yields progress
+# lines, either plain strings or (message, fraction_done) tuples.
+Progress = Union[str, Tuple[str, float]]
+Handler = Callable[[Optional[int], Dict], Iterator[Progress]]
+
+ACTIVE_STATES = ("queued", "running")
+FINAL_STATES = ("done", "failed")
+_LOG_KEEP = 50  # recent progress lines kept on the job row
+
+_HANDLERS: Dict[str, Handler] = {}
+
+def job_handler(kind: str):
+    """Register a generator function as the handler for a job kind."""
+    def deco(fn: Handler) -> Handler:
+        _HANDLERS[kind] = fn
+        return fn
+    return deco
+
+def _load_handlers():
+    # handlers import the heavy pipeline modules; only pull them in when a job runs
+    import jd2interview.jobs.handlers  # noqa: F401
+
+def dedup_key(kind: str, role_id: Optional[int], params: Dict) -> str:
+    raw = json.dumps({"kind": kind, "role_id": role_id, "params": params or {}}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def job_to_dict(j: Job) -> Dict:
+    try:
+        log = json.loads(j.log_json or "[]")
+    except Exception:
+        log = []
+    return {
+        "id": j.id,
+        "kind": j.kind,
+        "role_id": j.role_id,
+        "params": json.loads(j.params_json or "{}"),
+        "status": j.status,
+        "progress": float(j.progress or 0.0),
+        "message": j.message or "",
+        "log": log,
+        "error": j.error,
+        "created_at": j.created_at,
+        "started_at": j.started_at,
+        "finished_at": j.finished_at,
+    }
+
+
+class JobRunner:
+    """
+    Persisted job queue backed by the `jobs` table plus a thread pool.
+    Identical active requests (same kind, role and params) are collapsed onto one job.
+    Every job carries its runner's `owner` id and a heartbeat the owner keeps fresh, so `resume()`
+    only picks up queued/running jobs whose owner has stopped (heartbeat older than JOB_STALE_SECONDS).
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max(1, int(max_workers or settings.JOB_WORKERS))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="jd2i-job")
+        self._lock = threading.Lock()   # serializes dedup check + insert within this process
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stop = threading.Event()
+        self._beat = threading.Thread(target=self._heartbeat_loop, name="jd2i-job-heartbeat", daemon=True)
+        self._beat.start()
+
+    # ----- submission -----
+    def submit(self, kind: str, role_id: Optional[int] = None, params: Optional[Dict] = None) -> int:
+        _load_handlers()
+        if kind not in _HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind!r}")
+        params = params or {}
+        key = dedup_key(kind, role_id, params)
+        with self._lock:
+            with session_scope() as db:
+                existing = db.execute(
+                    select(Job.id)
+                    .where(Job.dedup_key == key, Job.status.in_(ACTIVE_STATES))
+                    .order_by(Job.id.desc())
+                    .limit(1)
+                ).scalar_one_or_none()
+                if existing is not None:
+                    return int(existing)
+                job = Job(kind=kind, role_id=role_id, params_json=json.dumps(params, default=str),
+                          dedup_key=key, status="queued", progress=0.0, message="Queued", log_json="[]",
+                          owner=self.owner, heartbeat_at=datetime.utcnow())
+                db.add(job); db.flush()
+                job_id = int(job.id)
+        self._pool.submit(self._run, job_id)
+        return job_id
+
+    def resume(self) -> List[int]:
+        """Take over queued/running jobs whose owner stopped heartbeating, and re-queue them here."""
+        _load_handlers()
+        stale = or_(Job.heartbeat_at.is_(None), Job.heartbeat_at < datetime.utcnow() - timedelta(
+            seconds=settings.JOB_STALE_SECONDS))
+        ids = []
+        with session_scope() as db:
+            candidates = db.execute(
+                select(Job.id).where(Job.status.in_(ACTIVE_STATES), stale).order_by(Job.id)
+            ).scalars().all()
+            for job_id in candidates:
+                # conditional claim: if another process took the job over first, this matches no row
+                claimed = db.execute(
+                    update(Job).where(Job.id == job_id, Job.status.in_(ACTIVE_STATES), stale)
+                    .values(owner=self.owner, heartbeat_at=datetime.utcnow(), status="queued",
+                            message="Resumed after restart")
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                if claimed:
+                    ids.append(int(job_id))
+        for job_id in ids:
+            self._pool.submit(self._run, job_id)
+        return ids
+
+    # ----- ownership -----
+    def _heartbeat_loop(self):
+        interval = max(0.5, settings.JOB_HEARTBEAT_SECONDS)
+        while not self._stop.wait(interval):
+            try:
+                with session_scope() as db:
+                    db.execute(update(Job).where(Job.owner == self.owner, Job.status.in_(ACTIVE_STATES))
+                               .values(heartbeat_at=datetime.utcnow())
+                               .execution_options(synchronize_session=False))
+            except Exception as e:
+                print(f"[jobs] heartbeat failed: {type(e).__name__}: {e}")
+
+    # ----- execution -----
+    def _update(self, job_id: int, **fields):
+        with session_scope() as db:
+            j = db.get(Job, job_id)
+            if j is None:
+                return
+            line = fields.pop("append_log", None)
+            for k, v in fields.items():
+                setattr(j, k, v)
+            if line:
+                try:
+                    log = json.loads(j.log_json or "[]")
+                except Exception:
+                    log = []
+                log.append(line)
+                j.log_json = json.dumps(log[-_LOG_KEEP:], ensure_ascii=False)
+
+    def _run(self, job_id: int):
+        with SessionLocal() as db:
+            j = db.get(Job, job_id)
+            if j is None or j.status not in ACTIVE_STATES or j.owner != self.owner:
+                return
+            kind, role_id = j.kind, j.role_id
+            params = json.loads(j.params_json or "{}")
+        handler = _HANDLERS.get(kind)
+        if handler is None:
+            self._update(job_id, status="failed", error=f"Unknown job kind: {kind!r}", finished_at=datetime.utcnow())
+            return
+
+        self._update(job_id, status="running", started_at=datetime.utcnow(), message="Started")
+        progress = 0.0
+        # the handler generator is driven from this thread, so its spans nest under the job span
+        with span(f"job.{kind}", job_id=job_id, role_id=role_id) as sp:
+            try:
+                for upd in handler(role_id, params):
+                    if isinstance(upd, tuple):
+                        msg, progress = upd[0], max(progress, min(1.0, float(upd[1])))
+                    else:
+                        msg = upd
+                    self._update(job_id, message=str(msg), progress=progress, append_log=str(msg))
+            except Exception as e:
+                print(f"[jobs] job {job_id} ({kind}) failed: {type(e).__name__}: {e}")
+                sp.finish(error=e)
+                self._update(job_id, status="failed", error=f"{type(e).__name__}: {e}\n{traceback.format_exc()}",
+                             message=f"Failed: {type(e).__name__}: {e}", finished_at=datetime.utcnow())
+                return
+        self._update(job_id, status="done", progress=1.0, message="Done", append_log="Done",
+                     finished_at=datetime.utcnow())
+
+    def shutdown(self, wait: bool = False):
+        self._stop.set()
+        self._pool.shutdown(wait=wait)
+
+
+# ----- process-wide runner + read helpers -----
+_runner: Optional[JobRunner] = None
+_runner_lock = threading.Lock()
+
+def get_runner() -> JobRunner:
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            init_db()
+            _runner = JobRunner()
+        return _runner
+
+def submit_job(kind: str, role_id: Optional[int] = None, params: Optional[Dict] = None) -> int:
+    return get_runner().submit(kind, role_id=role_id, params=params)
+
+def get_job(job_id: int) -> Optional[Dict]:
+    with SessionLocal() as db:
+        j = db.get(Job, int(job_id))
+        return job_to_dict(j) if j else None
+
+def active_job_for(kind: str, role_id: Optional[int], params: Optional[Dict] = None) -> Optional[Dict]:
+    key = dedup_key(kind, role_id, params or {})
+    with SessionLocal() as db:
+        j = db.execute(
+            select(Job).where(Job.dedup_key == key, Job.status.in_(ACTIVE_STATES))
+            .order_by(Job.id.desc()).limit(1)
+        ).scalar_one_or_none()
+        return job_to_dict(j) if j else None
+
+def recent_jobs(limit: int = 20, role_id: Optional[int] = None) -> List[Dict]:
+    with SessionLocal() as db:
+        q = select(Job).order_by(Job.id.desc()).limit(limit)
+        if role_id is not None:
+            q = q.where(Job.role_id == role_id)
+        return [job_to_dict(j) for j in db.execute(q).scalars().all()]
@@ -1,16 +1,16 @@
 import json
 import os
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Iterable, Tuple
 
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
 from jd2interview.utils.config import settings
+from jd2interview.utils.metrics import llm_context
+from jd2interview.utils.tracing import span
 
 # Prompt (doubling braces to show literal JSON braces)
-PROMPT = ChatPromptTemplate.from_template("""
+PROMPT_TEMPLATE = """
 You are an assistant that extracts structured fields from a job description.
 Given the text of the complete job description, output a JSON object with keys:
 {{
@@ -25,16 +25,17 @@ Input Job Description:
 ```{jd_text}```
 
 Respond with only the JSON object — no markdown, no backticks, no commentary.
-""")
+"""
 
-# IMPORTANT: use model= and api_key= on modern langchain_openai
-llm = ChatOpenAI(
-    model=getattr(settings, "OPENAI_MODEL", "gpt-5-mini"),  # Fixed model name
-    temperature=0.0,
-    api_key= getattr(settings, "OPENAI_API_KEY", None),
-)
-# Runnable pipeline - this is correct
-chain = PROMPT | llm | StrOutputParser()
+# langchain/openai are heavy to import and the client is pointless until a JD is parsed,
+# so the prompt → LLM → parser chain is built on first use and reused afterwards.
+@lru_cache(maxsize=1)
+def get_chain():
+    from langchain.prompts import ChatPromptTemplate
+    from langchain_core.output_parsers import StrOutputParser
+    from jd2interview.utils.llm import chat_model
+
+    return ChatPromptTemplate.from_template(PROMPT_TEMPLATE) | chat_model(temperature=0.0) | StrOutputParser()
 
 def _coerce_json(text: str) -> Dict:
     t = text.strip()
@@ -51,8 +52,15 @@ def _coerce_json(text: str) -> Dict:
         raise
 
 def extract_structured(jd_text: str) -> Dict:
+    with span("parse.extract_structured", chars=len(jd_text or "")) as sp:
+        out = _extract_structured(jd_text)
+        sp.set(n_skills=len(out["skills"]), n_tools=len(out["tools"]))
+        return out
+
+def _extract_structured(jd_text: str) -> Dict:
     try:
-        raw_text = chain.invoke({"jd_text": jd_text})  # returns a string
+        with llm_context("parse"):
+            raw_text = get_chain().invoke({"jd_text": jd_text})  # returns a string
     except Exception as e:
         # Surface the real error (API key, model access, network, etc.)
         raise RuntimeError(f"LLM call failed: {type(e).__name__}: {e}") from e
@@ -3,39 +3,44 @@ import json
 from collections import Counter
 from typing import Dict, List, Tuple, Optional
 from sqlalchemy import select
-from jd2interview.skills.query import top_k_skills_for_role
-from jd2interview.storage.db import SessionLocal, Question, QuestionMeta
+from jd2interview.skills.query import role_skill_terms
+from jd2interview.skills.canon import canon_index
+from jd2interview.utils.config import settings
+from jd2interview.storage.db import ReadSession, QuestionSummary, SUMMARY_LIST_COLUMNS, summary_items
+from jd2interview.utils.tracing import span
 
-def _rows_for_role(db, role_id: int, topk: int = 8, limit: int = 5000):
-    skills = [s for s,_ in top_k_skills_for_role(role_id, k=topk)]
+def _relevant_summaries(db, role_id: int, topk: int = 8, limit: int = 10000, columns=SUMMARY_LIST_COLUMNS) -> list:
+    """Role-relevant question_summary rows (`columns`, incl. tags_json), best-scored first."""
+    skills = role_skill_terms(role_id, k=topk, related=settings.RETRIEVAL_RELATED_SKILLS)
     if not skills:
         return []
+    match = canon_index().matcher(skills)     # aliases / tag synonyms / tag families
     rows = db.execute(
-        select(Question.id, Question.tags_json)
-        .order_by(Question.score.desc(), Question.id.desc())
+        select(*columns)
+        .order_by(QuestionSummary.score.desc(), QuestionSummary.question_id.desc())
         .limit(limit)
     ).all()
-    skillset = {s.lower() for s in skills}
-    out_ids = []
-    for qid, tj in rows:
+    out = []
+    for r in rows:
         try:
-            tags = {t.lower() for t in json.loads(tj or "[]")}
+            tags = json.loads(r.tags_json or "[]")
         except Exception:
-            tags = set()
-        if tags & skillset:
-            out_ids.append(qid)
-    return out_ids
+            tags = []
+        if match(tags):
+            out.append(r)
+    return out
+
+def typed_summaries_for_role(db, role_id: int, qtype: Optional[str] = None,
+                             sources: Optional[List[str]] = None, limit: int = 10000) -> list:
+    """Classified, role-relevant summary rows (optionally one type / some sources); no text or rubric loaded."""
+    return [r for r in _relevant_summaries(db, role_id, topk=8, limit=limit)
+            if r.qtype and (not qtype or r.qtype == qtype) and (not sources or r.source in sources)]
 
 def available_counts_for_role(role_id: int) -> Dict[str, int]:
     """Return counts per type in DB for this role (based on tag overlap)."""
-    with SessionLocal() as db:
-        ids = _rows_for_role(db, role_id)
-        if not ids:
-            return {"Behavioral":0,"Technical":0,"Coding":0,"System Design":0,"Total":0}
-        rows = db.execute(
-            select(QuestionMeta.qtype).where(QuestionMeta.question_id.in_(ids))
-        ).scalars().all()
-    c = Counter(rows)
+    with ReadSession() as db:
+        rows = _relevant_summaries(db, role_id, limit=5000, columns=(QuestionSummary.tags_json, QuestionSummary.qtype))
+    c = Counter(r.qtype for r in rows)
     out = {k: c.get(k,0) for k in ["Behavioral","Technical","Coding","System Design"]}
     out["Total"] = sum(out.values())
     return out
@@ -97,72 +102,23 @@ def fetch_typed_questions_for_role(
     sources: Optional[List[str]] = None,
     limit: int = 10000,
 ) -> List[Dict]:
-    out: List[Dict] = []
-    with SessionLocal() as db:
-        ids = relevant_question_ids_for_role(db, role_id, topk=8, limit=limit)
-        if not ids:
-            return out
-        q = (
-            select(Question, QuestionMeta)
-            .join(QuestionMeta, QuestionMeta.question_id == Question.id)
-            .where(Question.id.in_(ids))
-            .order_by(Question.score.desc(), Question.id.desc())
-        )
-        for Q, M in db.execute(q).all():
-            if qtype and M.qtype != qtype:
-                continue
-            if sources and Q.source not in sources:
-                continue
-            try:
-                rubric = json.loads(M.rubric_json or "{}")
-            except Exception:
-                rubric = {}
-            try:
-                tags = json.loads(Q.tags_json or "[]")
-            except Exception:
-                tags = []
-            out.append({
-                "id": Q.id,
-                "question": (Q.title or "") + (
-                    "\n\n" + (Q.body_markdown or Q.body_html or "")
-                    if (Q.body_markdown or Q.body_html) else ""
-                ),
-                "type": M.qtype,
-                "difficulty": M.difficulty,
-                "evaluation_rubric": rubric,
-                "url": Q.url,
-                "tags": tags,
-                "source": Q.source,
-            })
+    with span("retrieval.fetch_typed", role_id=role_id, qtype=qtype) as sp, ReadSession() as db:
+        out = summary_items(db, typed_summaries_for_role(db, role_id, qtype=qtype, sources=sources, limit=limit))
+        sp.set(items=len(out))
     return out
 
 def relevant_question_ids_for_role(
     db, role_id: int, topk: int = 8, limit: int = 10000
 ) -> List[int]:
     """
-    Return IDs of questions whose tags overlap with the role's top-k skills.
+    Return IDs of questions whose tags overlap with the role's top-k skills (plus graph-related ones).
     This is our 'role relevance' filter used by classification, counts, and retrieval.
     """
-    skills = [s for s, _ in top_k_skills_for_role(role_id, k=topk)]
-    if not skills:
-        return []
-    wanted = {s.lower() for s in skills}
-
-    rows = db.execute(
-        select(Question.id, Question.tags_json)
-        .order_by(Question.score.desc(), Question.id.desc())
-        .limit(limit)
-    ).all()
-
-    ids: List[int] = []
-    for qid, tj in rows:
-        try:
-            tags = {t.lower() for t in json.loads(tj or "[]")}
-        except Exception:
-            tags = set()
-        if tags & wanted:
-            ids.append(qid)
-    return ids
+    with span("retrieval.relevant_ids", role_id=role_id, topk=topk) as sp:
+        ids = [r.question_id for r in _relevant_summaries(
+            db, role_id, topk=topk, limit=limit, columns=(QuestionSummary.question_id, QuestionSummary.tags_json))]
+        sp.set(matched=len(ids))
+        return ids
 
 # (optional) keep the old private name as an alias so other code continues to work
 _relevant_ids_for_role = relevant_question_ids_for_role
\ No newline at end of file
@@ -1,17 +1,42 @@
+import time
 from typing import List
 from jd2interview.utils.config import settings
-from openai import OpenAI
+from jd2interview.utils.metrics import metrics
+from jd2interview.utils.tracing import span
 
 _client = None
+_embedder = None   # optional override: fn(texts, model) -> vectors (offline runs / benchmarks)
+
+def set_embedder(fn):
+    """Route embed_texts through `fn(texts, model)` instead of the OpenAI API; None restores the default."""
+    global _embedder
+    _embedder = fn
+
 def _client_once():
     global _client
     if _client is None:
-        _client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        from openai import OpenAI   # deferred: the SDK is slow to import
+        from jd2interview.utils.llm import sync_http_client
+        _client = OpenAI(api_key=settings.OPENAI_API_KEY, http_client=sync_http_client(),
+                         max_retries=settings.OPENAI_MAX_RETRIES)
     return _client
 
 def embed_texts(texts: List[str], model: str | None = None) -> List[List[float]]:
     model = model or getattr(settings, "EMBED_MODEL", "text-embedding-3-small")
-    client = _client_once()
-    # OpenAI Python SDK v1 returns .data with embeddings in order
-    resp = client.embeddings.create(model=model, input=texts)
-    return [d.embedding for d in resp.data]
\ No newline at end of file
+    with span("retrieval.embed_texts", model=model, texts=len(texts)) as sp:
+        t0 = time.perf_counter()
+        if _embedder is not None:
+            vecs = _embedder(texts, model)
+            metrics.record_call("embedding", model, latency_s=time.perf_counter() - t0)
+            return vecs
+        try:
+            # OpenAI Python SDK v1 returns .data with embeddings in order
+            resp = _client_once().embeddings.create(model=model, input=texts)
+        except Exception:
+            metrics.record_call("embedding", model, latency_s=time.perf_counter() - t0, error=True)
+            raise
+        usage = getattr(resp, "usage", None)
+        prompt_tokens = int(getattr(usage, "prompt_tokens", 0) or 0)
+        metrics.record_call("embedding", model, prompt_tokens=prompt_tokens, latency_s=time.perf_counter() - t0)
+        sp.set(prompt_tokens=prompt_tokens)
+        return [d.embedding for d in resp.data]
\ No newline at end of file
@@ -0,0 +1,176 @@
+# src/jd2interview/retrieval/vector_index.py
+"""
+Exact cosine-similarity index over question embeddings, and the per-role index used to drop
+near-duplicate generated questions before they are persisted.
+
+    idx = VectorIndex(dim)
+    idx.add([qid, ...], vectors)
+    sims, ids = idx.search(query_vectors, k=1)
+
+faiss (IndexFlatIP) is used when installed, NumPy matmul otherwise. Role indexes are cached per
+process and topped up incrementally from `question_vectors`: only rows past the last one loaded are
+read and tag-matched. An index is rebuilt when the role's skills (`role_skills:<id>`), the canon
+index or any stored vector (VECTORS_VERSION_KEY, bumped on in-place rewrites) changes.
+"""
+from __future__ import annotations
+import json
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from sqlalchemy import select
+
+from jd2interview.storage.db import Question, QuestionVector, VECTORS_VERSION_KEY, get_version
+from jd2interview.utils.config import settings
+from jd2interview.utils.tracing import span
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def _normalize(vecs) -> "np.ndarray":
+    import numpy as np
+    v = np.asarray(vecs, dtype=np.float32)
+    if v.ndim == 1:
+        v = v[None, :]
+    norms = np.linalg.norm(v, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return v / norms
+
+def _faiss_index(dim: int):
+    try:
+        import faiss  # optional
+    except ImportError:
+        return None
+    return faiss.IndexFlatIP(dim)
+
+
+class VectorIndex:
+    """Inner-product index over L2-normalised vectors (i.e. cosine similarity); ids are question ids."""
+
+    def __init__(self, dim: int):
+        import numpy as np
+        self.dim = int(dim)
+        self.ids: List[int] = []
+        self._known = set()
+        self._faiss = _faiss_index(self.dim)
+        self._mat = np.zeros((0 if self._faiss is not None else 256, self.dim), dtype=np.float32)
+        self._n = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def add(self, ids: Sequence[int], vecs) -> int:
+        """Add vectors (skipping ids already present and vectors of another dimension); returns rows added."""
+        import numpy as np
+        rows = [(int(i), v) for i, v in zip(ids, vecs) if int(i) not in self._known and len(v) == self.dim]
+        if not rows:
+            return 0
+        v = _normalize([r[1] for r in rows])
+        if self._faiss is not None:
+            self._faiss.add(v)
+        else:
+            need = self._n + len(rows)
+            if need > self._mat.shape[0]:
+                grown = np.zeros((max(need, 2 * self._mat.shape[0]), self.dim), dtype=np.float32)
+                grown[:self._n] = self._mat[:self._n]
+                self._mat = grown
+            self._mat[self._n:need] = v
+        for i, _ in rows:
+            self.ids.append(i); self._known.add(i)
+        self._n += len(rows)
+        return len(rows)
+
+    def search(self, vecs, k: int = 1) -> Tuple["np.ndarray", "np.ndarray"]:
+        """(similarities, ids), both shape (m, k); missing neighbours have id -1 and similarity -inf."""
+        import numpy as np
+        q = _normalize(vecs)
+        m, k = q.shape[0], max(1, int(k))
+        sims = np.full((m, k), -np.inf, dtype=np.float32)
+        ids = np.full((m, k), -1, dtype=np.int64)
+        if self._n == 0 or q.shape[1] != self.dim:
+            return sims, ids
+        kk = min(k, self._n)
+        if self._faiss is not None:
+            s, pos = self._faiss.search(q, kk)
+        else:
+            scores = q @ self._mat[:self._n].T
+            pos = np.argsort(-scores, axis=1)[:, :kk]
+            s = np.take_along_axis(scores, pos, axis=1)
+        id_arr = np.asarray(self.ids, dtype=np.int64)
+        sims[:, :kk], ids[:, :kk] = s, id_arr[pos]
+        return sims, ids
+
+
+# ---------- per-role index (bank questions relevant to the role + every generated question) ----------
+_ROLE_CACHE_MAX = 16
+# (role, dim) → (stamp, last vector row, index); stamp = (role skills, canon index, vectors) versions
+_roles: "OrderedDict[Tuple[int, int], Tuple[Tuple[int, int, int], int, VectorIndex]]" = OrderedDict()
+_lock = threading.Lock()
+
+def role_vector_index(db, role_id: int, dim: int) -> VectorIndex:
+    """Index over stored vectors of the role's questions; new `question_vectors` rows are loaded incrementally."""
+    from jd2interview.skills.canon import canon_index
+    from jd2interview.skills.query import role_skill_terms, role_version_key
+    key = (int(role_id), int(dim))
+    canon = canon_index()
+    stamp = (get_version(db, role_version_key(role_id)), canon.version, get_version(db, VECTORS_VERSION_KEY))
+    with _lock:
+        cached_stamp, last_row, idx = _roles.get(key, (None, 0, None))
+        if idx is None or cached_stamp != stamp:
+            last_row, idx = 0, VectorIndex(dim)
+        with span("retrieval.vector_index", role_id=role_id, cached=len(idx)) as sp:
+            rows = db.execute(
+                select(QuestionVector.id, QuestionVector.question_id, QuestionVector.embedding_json,
+                       Question.source, Question.tags_json)
+                .join(Question, Question.id == QuestionVector.question_id)
+                .where(QuestionVector.id > last_row, QuestionVector.dim == dim)
+                .order_by(QuestionVector.id)
+            ).all()
+            if rows:
+                # relevance only for the rows just read: generated questions, or tags matching the role
+                match = canon.matcher(role_skill_terms(role_id, k=8, related=settings.RETRIEVAL_RELATED_SKILLS))
+                picked = [(r.question_id, r.embedding_json) for r in rows
+                          if r.source == "generated" or match(json.loads(r.tags_json or "[]"))]
+                added = idx.add([q for q, _ in picked], [json.loads(ej) for _, ej in picked])
+            else:
+                added = 0
+            sp.set(loaded=added, size=len(idx))
+        _roles[key] = (stamp, rows[-1][0] if rows else last_row, idx)
+        _roles.move_to_end(key)
+        while len(_roles) > _ROLE_CACHE_MAX:
+            _roles.popitem(last=False)
+        return idx
+
+def remember(role_id: int, ids: Sequence[int], vecs) -> None:
+    """Add freshly persisted vectors to a cached role index (if there is one)."""
+    if not ids:
+        return
+    with _lock:
+        hit = _roles.get((int(role_id), len(vecs[0])))
+        if hit is not None:
+            hit[2].add(ids, vecs)
+
+def near_duplicates(db, role_id: int, vecs, threshold: Optional[float] = None) -> List[Optional[Tuple[int, float]]]:
+    """
+    For each vector (in order): (existing question id, similarity) if it is within `threshold` cosine
+    of the role's bank, (-1, similarity) if it duplicates an earlier vector of the same batch, else None.
+    """
+    threshold = settings.DEDUP_SIMILARITY if threshold is None else float(threshold)
+    if not len(vecs):
+        return []
+    bank = role_vector_index(db, role_id, len(vecs[0]))
+    sims, ids = bank.search(vecs, k=1)
+    batch = VectorIndex(len(vecs[0]))
+    out: List[Optional[Tuple[int, float]]] = []
+    for i, v in enumerate(vecs):
+        if sims[i, 0] >= threshold:
+            out.append((int(ids[i, 0]), float(sims[i, 0])))
+            continue
+        s, _ = batch.search([v], k=1)
+        if s[0, 0] >= threshold:
+            out.append((-1, float(s[0, 0])))
+            continue
+        batch.add([-(i + 1)], [v])
+        out.append(None)
+    return out
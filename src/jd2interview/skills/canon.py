@@ -0,0 +1,173 @@
+# src/jd2interview/skills/canon.py
+"""
+Skill canonicalization: map raw StackExchange tags and JD terms to canonical skill ids.
+
+The index is a hash map over normalised keys built from skill names, `canonical_name`,
+`skill_aliases` and a table of StackExchange tag synonyms. Tags that are not known as such
+fall back to their hyphen-segment prefixes ("kubernetes-helm" → "kubernetes",
+"python-3.x" → "python"), longest first. Stored question tags stay as crawled; all of this
+is applied when tags are matched, never written back.
+
+    idx = canon_index()
+    idx.resolve("k8s")                    # skill id of "Kubernetes", or None
+    idx.crawl_tags(["PostgreSQL", "AWS"]) # ["postgresql", "amazon-web-services"]
+    idx.matcher(skills)(question_tags)    # relevance test used by retrieval
+"""
+from __future__ import annotations
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import select
+
+from jd2interview.storage.db import Skill, SkillAlias, VersionedSnapshot
+
+VERSION_KEY = "skill_graph"   # aliases are written together with the skill graph
+
+# synonym → StackExchange master tag (the spelling crawl requests should use). Only true
+# equivalents: ambiguous short forms ("node", "react", "tf") and related-but-different
+# technologies ("unix" vs "linux") are left alone.
+TAG_SYNONYMS: Dict[str, str] = {
+    "k8s": "kubernetes", "kube": "kubernetes",
+    "postgres": "postgresql", "psql": "postgresql", "pgsql": "postgresql",
+    "mongo": "mongodb", "elastic-search": "elasticsearch", "elastic": "elasticsearch",
+    "js": "javascript", "ecmascript": "javascript", "ts": "typescript",
+    "nodejs": "node.js", "node-js": "node.js",
+    "react.js": "reactjs", "vue": "vue.js", "vuejs": "vue.js",
+    "golang": "go", "py": "python", "python3": "python-3.x", "c-sharp": "c#", "cpp": "c++",
+    "aws": "amazon-web-services", "amazon-aws": "amazon-web-services",
+    "gcp": "google-cloud-platform", "google-cloud": "google-cloud-platform", "ms-azure": "azure",
+    "kafka": "apache-kafka", "spark": "apache-spark", "pyspark": "apache-spark", "airflow": "apache-airflow",
+    "sklearn": "scikit-learn", "scikit": "scikit-learn",
+    "ml": "machine-learning", "dl": "deep-learning", "nlp": "nlp", "natural-language-processing": "nlp",
+    "ci/cd": "continuous-integration", "ci-cd": "continuous-integration", "cicd": "continuous-integration",
+    "restful": "rest", "rest-api": "rest", "restful-api": "rest",
+    "mssql": "sql-server", "ms-sql": "sql-server", "t-sql": "tsql",
+    "bash-script": "bash", "shell-script": "shell",
+    "terraform-provider": "terraform", "docker-container": "docker",
+    "data-structure": "data-structures", "algorithm": "algorithms", "system-designs": "system-design",
+    "unit-test": "unit-testing", "unittest": "unit-testing",
+}
+
+_WS = re.compile(r"[\s_]+")
+_DASHES = re.compile(r"-{2,}")
+
+def norm_key(term: str) -> str:
+    """Lowercase, trim, spaces/underscores → '-' (StackExchange tag shape)."""
+    k = _WS.sub("-", (term or "").strip().lower())
+    return _DASHES.sub("-", k).strip("-")
+
+
+class CanonIndex:
+    """Immutable term → skill id index (one per skill-graph version)."""
+
+    _MEMO_MAX = 200_000
+
+    def __init__(self, version: int, names: Dict[int, str], keys: Dict[str, int], tag_for: Dict[int, str]):
+        self.version = version
+        self.names = names          # skill id → display name
+        self._keys = keys           # normalised key → skill id
+        self._tag_for = tag_for     # skill id → preferred StackExchange tag
+        self._memo: Dict[str, Optional[int]] = {}
+
+    @classmethod
+    def load(cls, db, version: int) -> "CanonIndex":
+        names: Dict[int, str] = {}
+        keys: Dict[str, int] = {}
+        own: Dict[int, List[str]] = {}
+        for sid, name, canonical in db.execute(select(Skill.id, Skill.name, Skill.canonical_name).order_by(Skill.id)).all():
+            names[sid] = name
+            for k in (norm_key(name), norm_key(canonical or "")):
+                if k and k not in keys:       # first (oldest) skill wins a contested spelling
+                    keys[k] = sid; own.setdefault(sid, []).append(k)
+        for sid, alias in db.execute(select(SkillAlias.skill_id, SkillAlias.alias).order_by(SkillAlias.id)).all():
+            k = norm_key(alias)
+            if k and k not in keys and sid in names:
+                keys[k] = sid; own.setdefault(sid, []).append(k)
+        for syn, master in TAG_SYNONYMS.items():
+            sid = keys.get(syn, keys.get(master))
+            if sid is not None:
+                keys.setdefault(syn, sid); keys.setdefault(master, sid)
+                own.setdefault(sid, []).append(master)
+
+        masters = set(TAG_SYNONYMS.values())
+        tag_for: Dict[int, str] = {}
+        for sid, ks in own.items():
+            k0 = ks[0]
+            tag_for[sid] = TAG_SYNONYMS.get(k0) or next((k for k in ks if k in masters), k0)
+        return cls(version, names, keys, tag_for)
+
+    # ---------- lookups ----------
+    def _lookup(self, key: str) -> Optional[int]:
+        sid = self._keys.get(key)
+        if sid is None and key in TAG_SYNONYMS:
+            sid = self._keys.get(TAG_SYNONYMS[key])
+        if sid is None and "-" in key:
+            parts = key.split("-")
+            for i in range(len(parts) - 1, 0, -1):       # longest hyphen prefix first
+                sid = self._keys.get("-".join(parts[:i]))
+                if sid is not None:
+                    break
+        return sid
+
+    def resolve(self, term: str, families: bool = True) -> Optional[int]:
+        """Canonical skill id for a tag / JD term, or None (families=False: no hyphen-prefix fallback)."""
+        key = norm_key(term)
+        if not key:
+            return None
+        if not families:
+            sid = self._keys.get(key)
+            return self._keys.get(TAG_SYNONYMS[key]) if sid is None and key in TAG_SYNONYMS else sid
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        sid = self._lookup(key)
+        if len(self._memo) < self._MEMO_MAX:
+            self._memo[key] = sid
+        return sid
+
+    def resolve_many(self, terms: Iterable[str]) -> Set[int]:
+        return {sid for sid in (self.resolve(t) for t in terms or []) if sid is not None}
+
+    def canonical_name(self, term: str, families: bool = True) -> Optional[str]:
+        sid = self.resolve(term, families=families)
+        return self.names.get(sid) if sid is not None else None
+
+    def crawl_tag(self, term: str) -> str:
+        """The StackExchange tag to query for a skill name."""
+        sid = self.resolve(term)
+        if sid is not None and sid in self._tag_for:
+            return self._tag_for[sid]
+        k = norm_key(term)
+        return TAG_SYNONYMS.get(k, k)
+
+    def crawl_tags(self, terms: Iterable[str]) -> List[str]:
+        out, seen = [], set()
+        for t in terms or []:
+            tag = self.crawl_tag(t)
+            if tag and tag not in seen:
+                seen.add(tag); out.append(tag)
+        return out
+
+    def matcher(self, skills: Iterable[str]) -> Callable[[Iterable[str]], bool]:
+        """Predicate: do any of a question's tags resolve to one of `skills`?"""
+        skills = list(skills or [])
+        ids = self.resolve_many(skills)
+        loose = {TAG_SYNONYMS.get(norm_key(s), norm_key(s)) for s in skills if self.resolve(s) is None}
+        loose.discard("")
+
+        def _match(tags: Iterable[str]) -> bool:
+            for t in tags or []:
+                if self.resolve(t) in ids:
+                    return True
+                if loose and TAG_SYNONYMS.get(norm_key(t), norm_key(t)) in loose:
+                    return True
+            return False
+        return _match
+
+
+_snapshot = VersionedSnapshot(VERSION_KEY, CanonIndex.load)
+
+def canon_index() -> CanonIndex:
+    """Current index; rebuilt when skills or aliases change (same version stamp as the skill graph)."""
+    return _snapshot.get()
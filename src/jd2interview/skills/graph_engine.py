@@ -0,0 +1,306 @@
+# src/jd2interview/skills/graph_engine.py
+"""
+In-memory skill graph: `skill_edges` + `skill_tools` as array-backed CSR adjacency.
+
+Skills and tools are interned to dense node indices; adjacency is stored twice (out / in) as
+NumPy index arrays, so neighbour lookups, k-hop expansion, relation-filtered traversal and
+personalized PageRank never touch the database.
+
+    g = skill_graph()                       # process-wide snapshot, reloaded when the graph changes
+    g.neighbors("Python", relation="requires")
+    g.k_hop(["Python"], k=2, relations=["related_to"])
+    g.related_to_role(role_id, k=5, exclude=top8)
+
+The snapshot is rebuilt when persist_skill_graph() bumps the 'skill_graph' data version:
+immediately in the writing process (db.mark_stale), within SKILL_GRAPH_RELOAD_SECONDS elsewhere.
+"""
+from __future__ import annotations
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from sqlalchemy import select
+
+from jd2interview.storage.db import Skill, Tool, SkillEdge, SkillTool, RoleSkill, VersionedSnapshot
+from jd2interview.utils.tracing import span
+
+if TYPE_CHECKING:
+    import numpy as np
+
+VERSION_KEY = "skill_graph"
+SKILL, TOOL = 0, 1
+DIRECTIONS = ("out", "in", "both")
+
+
+class _CSR:
+    """Compressed sparse rows over (src → dst) edges: row i's edges are indices[indptr[i]:indptr[i+1]]."""
+    __slots__ = ("indptr", "indices", "weights", "rels")
+
+    def __init__(self, n: int, src, dst, weights, rels):
+        import numpy as np
+        order = np.argsort(src, kind="stable")
+        self.indices = dst[order]
+        self.weights = weights[order]
+        self.rels = rels[order]
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=self.indptr[1:])
+
+    def gather(self, nodes):
+        """(edge_positions, owner_nodes) of all edges leaving `nodes` (vectorised slice concat)."""
+        import numpy as np
+        starts, ends = self.indptr[nodes], self.indptr[nodes + 1]
+        lens = ends - starts
+        total = int(lens.sum())
+        if total == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        offs = np.repeat(starts - np.cumsum(lens) + lens, lens) + np.arange(total)
+        return offs, np.repeat(nodes, lens)
+
+
+class SkillGraphEngine:
+    """Immutable snapshot of the skill graph; safe to share between threads."""
+
+    def __init__(self, version: int, names: List[str], kinds, db_ids, src, dst, weights, rels,
+                 rel_names: List[str], role_skills: Dict[int, Tuple["np.ndarray", "np.ndarray"]]):
+        self.version = version
+        self.names = names
+        self.kinds = kinds
+        self.db_ids = db_ids
+        self.n = len(names)
+        self.rel_names = rel_names
+        self._rel_code = {r: i for i, r in enumerate(rel_names)}
+        self._src, self._dst, self._w, self._rel = src, dst, weights, rels
+        self.out = _CSR(self.n, src, dst, weights, rels)
+        self.inn = _CSR(self.n, dst, src, weights, rels)
+        self.role_skills = role_skills
+        self._by_name: Dict[str, int] = {}
+        for i in range(self.n - 1, -1, -1):          # skills win over same-named tools
+            self._by_name[names[i].lower()] = i
+        self._skill_idx = {int(db_ids[i]): i for i in range(self.n) if kinds[i] == SKILL}
+        self._ppr_cache: Dict[Tuple, Tuple] = {}
+        self._lock = threading.Lock()
+
+    # ---------- loading ----------
+    @classmethod
+    def load(cls, db, version: int) -> "SkillGraphEngine":
+        import numpy as np
+        skills = db.execute(select(Skill.id, Skill.name).order_by(Skill.id)).all()
+        tools = db.execute(select(Tool.id, Tool.name).order_by(Tool.id)).all()
+        names = [n for _, n in skills] + [n for _, n in tools]
+        kinds = np.array([SKILL] * len(skills) + [TOOL] * len(tools), dtype=np.int8)
+        db_ids = np.array([i for i, _ in skills] + [i for i, _ in tools], dtype=np.int64)
+        s_idx = {sid: i for i, (sid, _) in enumerate(skills)}
+        t_idx = {tid: len(skills) + i for i, (tid, _) in enumerate(tools)}
+
+        rel_names: List[str] = []
+        rel_code: Dict[str, int] = {}
+        src, dst, w, rel = [], [], [], []
+
+        def _add(a: Optional[int], b: Optional[int], r: str, wt: float):
+            if a is None or b is None:
+                return
+            if r not in rel_code:
+                rel_code[r] = len(rel_names); rel_names.append(r)
+            src.append(a); dst.append(b); w.append(float(wt or 0.0)); rel.append(rel_code[r])
+
+        for a, b, r, wt in db.execute(select(SkillEdge.src_skill_id, SkillEdge.dst_skill_id,
+                                             SkillEdge.relation_type, SkillEdge.weight)).all():
+            _add(s_idx.get(a), s_idx.get(b), r, wt)
+        for a, b, r, wt in db.execute(select(SkillTool.skill_id, SkillTool.tool_id,
+                                             SkillTool.relation_type, SkillTool.weight)).all():
+            _add(s_idx.get(a), t_idx.get(b), r or "uses_tool", wt)
+
+        per_role: Dict[int, List[Tuple[int, float]]] = {}
+        for role_id, sid, wt in db.execute(select(RoleSkill.role_id, RoleSkill.skill_id, RoleSkill.weight)).all():
+            if sid in s_idx:
+                per_role.setdefault(int(role_id), []).append((s_idx[sid], float(wt or 0.0)))
+        role_skills = {r: (np.array([i for i, _ in xs], dtype=np.int64), np.array([x for _, x in xs], dtype=np.float64))
+                       for r, xs in per_role.items()}
+
+        return cls(version, names, kinds, db_ids,
+                   np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64),
+                   np.array(w, dtype=np.float64), np.array(rel, dtype=np.int16), rel_names, role_skills)
+
+    # ---------- lookups ----------
+    def node(self, name: str) -> Optional[int]:
+        return self._by_name.get((name or "").strip().lower())
+
+    def node_for_skill_id(self, skill_id: int) -> Optional[int]:
+        return self._skill_idx.get(int(skill_id))
+
+    def _nodes(self, names: Iterable[str]):
+        import numpy as np
+        idx = [i for i in (self.node(n) for n in names) if i is not None]
+        return np.array(sorted(set(idx)), dtype=np.int64)
+
+    def _rel_mask(self, rels, relations: Optional[Sequence[str]]):
+        import numpy as np
+        if not relations:
+            return None
+        codes = [self._rel_code[r] for r in relations if r in self._rel_code]
+        return np.isin(rels, np.array(codes, dtype=rels.dtype)) if codes else np.zeros(len(rels), dtype=bool)
+
+    def _expand(self, frontier, relations, direction: str):
+        """(neighbor_nodes, weights, relation_codes) one hop from `frontier`."""
+        import numpy as np
+        parts = []
+        for csr in ((self.out,) if direction == "out" else (self.inn,) if direction == "in" else (self.out, self.inn)):
+            pos, _ = csr.gather(frontier)
+            nb, wt, rl = csr.indices[pos], csr.weights[pos], csr.rels[pos]
+            mask = self._rel_mask(rl, relations)
+            if mask is not None:
+                nb, wt, rl = nb[mask], wt[mask], rl[mask]
+            parts.append((nb, wt, rl))
+        return (np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts]),
+                np.concatenate([p[2] for p in parts]))
+
+    # ---------- queries ----------
+    def neighbors(self, name: str, relation: Optional[str] = None, direction: str = "out",
+                  skills_only: bool = True, limit: Optional[int] = None) -> List[Tuple[str, float, str]]:
+        """[(name, weight, relation)] one hop from `name`, strongest first (ties by name)."""
+        import numpy as np
+        i = self.node(name)
+        if i is None:
+            return []
+        nb, wt, rl = self._expand(np.array([i], dtype=np.int64), [relation] if relation else None, direction)
+        best: Dict[int, Tuple[float, int]] = {}
+        for j, x, r in zip(nb.tolist(), wt.tolist(), rl.tolist()):
+            if j != i and (not skills_only or self.kinds[j] == SKILL) and (j not in best or x > best[j][0]):
+                best[j] = (x, r)
+        out = sorted(((self.names[j], float(x), self.rel_names[r]) for j, (x, r) in best.items()),
+                     key=lambda t: (-t[1], t[0]))
+        return out[:limit] if limit else out
+
+    def incident_edges(self, nodes: Sequence[int], skills_only: bool = True) -> List[Tuple[int, int, str, float]]:
+        """Distinct (src, dst, relation, weight) edges touching any of `nodes`, strongest first."""
+        import numpy as np
+        arr = np.array(sorted(set(int(i) for i in nodes)), dtype=np.int64)
+        if arr.size == 0:
+            return []
+        pos_o, own_o = self.out.gather(arr)
+        pos_i, own_i = self.inn.gather(arr)
+        src = np.concatenate([own_o, self.inn.indices[pos_i]])
+        dst = np.concatenate([self.out.indices[pos_o], own_i])
+        wt = np.concatenate([self.out.weights[pos_o], self.inn.weights[pos_i]])
+        rl = np.concatenate([self.out.rels[pos_o], self.inn.rels[pos_i]])
+        if skills_only:
+            keep = (self.kinds[src] == SKILL) & (self.kinds[dst] == SKILL)
+            src, dst, wt, rl = src[keep], dst[keep], wt[keep], rl[keep]
+        seen, out = set(), []
+        for a, b, r, x in zip(src.tolist(), dst.tolist(), rl.tolist(), wt.tolist()):
+            if (a, b, r) not in seen:
+                seen.add((a, b, r))
+                out.append((a, b, self.rel_names[r], float(x)))
+        out.sort(key=lambda t: (-t[3], self.names[t[0]], self.names[t[1]]))
+        return out
+
+    def k_hop(self, seeds: Iterable[str], k: int = 2, relations: Optional[Sequence[str]] = None,
+              direction: str = "both", skills_only: bool = True) -> Dict[str, int]:
+        """{name: hop distance} for every node within k hops of the seeds (seeds at distance 0)."""
+        import numpy as np
+        frontier = self._nodes(seeds)
+        dist = np.full(self.n, -1, dtype=np.int32)
+        dist[frontier] = 0
+        for hop in range(1, max(0, int(k)) + 1):
+            if frontier.size == 0:
+                break
+            nb, _, _ = self._expand(frontier, relations, direction)
+            nb = np.unique(nb)
+            nb = nb[dist[nb] < 0]
+            dist[nb] = hop
+            frontier = nb
+        hit = np.nonzero(dist >= 0)[0]
+        return {self.names[i]: int(dist[i]) for i in hit.tolist() if not skills_only or self.kinds[i] == SKILL}
+
+    def _transition(self, relations: Optional[Sequence[str]], direction: str):
+        """Cached (src, dst, normalised weight, has_out) edge arrays for PageRank."""
+        import numpy as np
+        key = (tuple(sorted(relations)) if relations else None, direction)
+        with self._lock:
+            hit = self._ppr_cache.get(key)
+        if hit is not None:
+            return hit
+        src, dst, w = self._src, self._dst, self._w
+        mask = self._rel_mask(self._rel, relations)
+        if mask is not None:
+            src, dst, w = src[mask], dst[mask], w[mask]
+        if direction == "in":
+            src, dst = dst, src
+        elif direction == "both":
+            src, dst, w = np.concatenate([src, dst]), np.concatenate([dst, src]), np.concatenate([w, w])
+        w = np.maximum(w, 1e-6)
+        out_w = np.bincount(src, weights=w, minlength=self.n)
+        wn = w / out_w[src] if len(src) else w
+        res = (src, dst, wn, out_w > 0)
+        with self._lock:
+            self._ppr_cache[key] = res
+        return res
+
+    def personalized_pagerank(self, seeds: Dict[int, float], alpha: float = 0.15, iters: int = 50,
+                              tol: float = 1e-8, relations: Optional[Sequence[str]] = None,
+                              direction: str = "both"):
+        """PageRank scores (np.ndarray over nodes) restarting at `seeds` ({node: weight}) with prob. alpha."""
+        import numpy as np
+        p = np.zeros(self.n, dtype=np.float64)
+        for i, x in seeds.items():
+            p[i] += max(0.0, float(x))
+        if p.sum() <= 0:
+            return p
+        p /= p.sum()
+        src, dst, wn, has_out = self._transition(relations, direction)
+        x = p.copy()
+        for _ in range(int(iters)):
+            spread = np.bincount(dst, weights=x[src] * wn, minlength=self.n)
+            dangling = x[~has_out].sum()
+            nxt = alpha * p + (1 - alpha) * (spread + dangling * p)
+            if np.abs(nxt - x).sum() < tol:
+                x = nxt
+                break
+            x = nxt
+        return x
+
+    def _top_skills(self, scores, k: int, banned) -> List[Tuple[str, float]]:
+        import numpy as np
+        scores = np.where(self.kinds == SKILL, scores, 0.0)
+        out = []
+        for i in np.argsort(-scores, kind="stable").tolist():
+            if scores[i] <= 0 or len(out) >= k:
+                break
+            if i not in banned:
+                out.append((self.names[i], float(scores[i])))
+        return out
+
+    def related(self, seeds: Dict[str, float], k: int = 10, exclude: Iterable[str] = (),
+                relations: Optional[Sequence[str]] = None, direction: str = "both") -> List[Tuple[str, float]]:
+        """Top-k skills by personalized PageRank from weighted seed names, minus `exclude` (and the seeds)."""
+        seed_idx = {i: w for i, w in ((self.node(n), w) for n, w in seeds.items()) if i is not None}
+        if not seed_idx or k <= 0:
+            return []
+        scores = self.personalized_pagerank(seed_idx, relations=relations, direction=direction)
+        banned = set(seed_idx) | {i for i in (self.node(n) for n in exclude) if i is not None}
+        return self._top_skills(scores, k, banned)
+
+    def related_to_role(self, role_id: int, k: int = 5, exclude: Iterable[str] = (),
+                        relations: Optional[Sequence[str]] = None) -> List[Tuple[str, float]]:
+        """Skills the graph links to the role (PageRank seeded by its role_skills weights)."""
+        hit = self.role_skills.get(int(role_id))
+        if hit is None or k <= 0:
+            return []
+        idx, w = hit
+        seed_idx = {int(i): float(x) for i, x in zip(idx.tolist(), w.tolist())}
+        scores = self.personalized_pagerank(seed_idx, relations=relations)
+        banned = {i for i in (self.node(n) for n in exclude) if i is not None}
+        return self._top_skills(scores, k, banned)
+
+
+# ---------- process-wide snapshot ----------
+def _load(db, version: int) -> SkillGraphEngine:
+    with span("skills.graph_reload", version=version) as sp:
+        eng = SkillGraphEngine.load(db, version)
+        sp.set(nodes=eng.n, edges=int(eng.out.indices.size))
+    return eng
+
+_snapshot = VersionedSnapshot(VERSION_KEY, _load)
+
+def skill_graph() -> SkillGraphEngine:
+    """Current graph snapshot; reloads when the 'skill_graph' data version moved."""
+    return _snapshot.get()
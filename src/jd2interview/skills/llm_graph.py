@@ -1,11 +1,12 @@
 import json
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
+from functools import lru_cache
 from jd2interview.utils.config import settings
+from jd2interview.utils.llm import structured_chain
+from jd2interview.utils.metrics import llm_context
+from jd2interview.utils.tracing import span
 from jd2interview.skills.models import SkillGraph, Category, Relation
 
-PROMPT = ChatPromptTemplate.from_template(
-"""You are building a compact skill graph for interview design.
+PROMPT_TEMPLATE = """You are building a compact skill graph for interview design.
 Given a parsed JD and its raw text, output a JSON SkillGraph capturing key skills and relations.
 
 Rules:
@@ -29,27 +30,26 @@ Parsed JD (JSON):
 
 Raw JD: {jd_text}
 """
-).partial(
-    categories=list(Category.__args__),
-    relations=list(Relation.__args__),
-)
-
-def _structured_llm():
-    llm = ChatOpenAI(
-        model=settings.OPENAI_MODEL,
-        api_key=settings.OPENAI_API_KEY,
-        temperature=0.0,
-        timeout=settings.OPENAI_TIMEOUT,
-        max_retries=settings.OPENAI_MAX_RETRIES if hasattr(settings, "OPENAI_MAX_RETRIES") else 2,
+
+@lru_cache(maxsize=1)
+def _prompt():
+    from langchain.prompts import ChatPromptTemplate
+    return ChatPromptTemplate.from_template(PROMPT_TEMPLATE).partial(
+        categories=list(Category.__args__),
+        relations=list(Relation.__args__),
     )
-    # returns a model that outputs a SkillGraph object
-    return llm.with_structured_output(SkillGraph)
+
+def _structured_chain():
+    # Prompt → structured LLM that outputs a SkillGraph object (shared, built once)
+    return structured_chain(_prompt(), SkillGraph, temperature=0.0)
 
 def infer_skill_graph(parsed: dict, jd_text: str) -> SkillGraph:
     # chain = _get_structured_llm()
     # return chain.invoke({"parsed_json": parsed, "jd_text": jd_text})
-        # Compose: Prompt → Structured LLM
-    chain = PROMPT | _structured_llm()
+    chain = _structured_chain()
     # Optional: pretty JSON for readability in the prompt
     parsed_json_str = json.dumps(parsed, ensure_ascii=False, indent=2)
-    return chain.invoke({"parsed_json": parsed_json_str, "jd_text": jd_text})
\ No newline at end of file
+    with span("skills.infer_skill_graph") as sp, llm_context("skills"):
+        graph = chain.invoke({"parsed_json": parsed_json_str, "jd_text": jd_text})
+        sp.set(n_nodes=len(graph.skills), n_edges=len(graph.edges))
+        return graph
\ No newline at end of file
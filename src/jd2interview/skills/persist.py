@@ -1,42 +1,76 @@
-from typing import Tuple, List
+from typing import Dict, Tuple, List
 from jd2interview.skills.models import SkillGraph
 from jd2interview.storage.db import (
-    session_scope, init_db, get_or_create_role, get_or_create_skill, add_alias,
-    upsert_role_skill, upsert_edge, get_or_create_tool, upsert_skill_tool
+    session_scope, ensure_db, Role, Skill, Tool, bulk_get_or_create, bulk_add_aliases,
+    bulk_upsert_role_skills, bulk_upsert_edges, bulk_upsert_skill_tools, bump_version, mark_stale
 )
+from jd2interview.skills.graph_engine import VERSION_KEY
+from jd2interview.skills.canon import canon_index
+from jd2interview.skills.query import role_version_key
+from jd2interview.utils.tracing import span
 
 def persist_skill_graph(graph: SkillGraph) -> Tuple[int, List[Tuple[str, float]]]:
-    """Writes a SkillGraph into DB and returns (role_id, ranked skills by importance)."""
-    init_db()
+    """
+    Writes a SkillGraph into DB and returns (role_id, ranked skills by importance).
+    Set-based: names are resolved with IN queries, missing rows bulk-inserted, links upserted
+    with ON CONFLICT, and everything is committed once.
+    """
+    ensure_db()
     role_title = graph.role_title or "Unknown Role"
-    ranked = sorted([(n.name, float(n.importance)) for n in graph.skills],
-                    key=lambda kv: kv[1], reverse=True)
+    # spellings that match an existing skill, alias or tag synonym ("Postgres", "k8s") reuse that skill
+    idx = canon_index()
+    canon = {n.name: idx.canonical_name(n.name, families=False) or n.name for n in graph.skills}
+    best: Dict[str, float] = {}
+    for n in graph.skills:
+        best[canon[n.name]] = max(best.get(canon[n.name], 0.0), float(n.importance))
+    ranked = sorted(best.items(), key=lambda kv: kv[1], reverse=True)
 
-    with session_scope() as db:
-        role = get_or_create_role(db, role_title)
+    with span("skills.persist_skill_graph", n_nodes=len(graph.skills), n_edges=len(graph.edges)) as sp, \
+            session_scope() as db:
+        role_id = bulk_get_or_create(db, Role, {role_title: {}})[role_title]
+        sp.set(role_id=role_id)
 
-        # nodes
-        name_to_id = {}
+        # nodes (first occurrence of a name decides its category, like get_or_create)
+        skill_vals: Dict[str, Dict] = {}
         for node in graph.skills:
-            sk = get_or_create_skill(db, name=node.name, canonical=node.name, category=node.category)
-            name_to_id[node.name] = sk.id
-            for a in node.aliases:
-                if a and a.strip() and a.strip().lower() != node.name.lower():
-                    add_alias(db, sk.id, a.strip())
-            upsert_role_skill(db, role.id, sk.id, float(node.importance))
+            skill_vals.setdefault(canon[node.name], {"canonical_name": canon[node.name], "category": node.category})
+        canon_ids = bulk_get_or_create(db, Skill, skill_vals)
+        name_to_id = {name: canon_ids[c] for name, c in canon.items()}
 
-        # edges
+        aliases, weights = [], {}
+        for node in graph.skills:
+            sid = name_to_id[node.name]
+            cname = canon[node.name].lower()
+            for a in [*node.aliases, node.name]:
+                if a and a.strip() and a.strip().lower() != cname:
+                    aliases.append((sid, a.strip()))
+            weights[sid] = max(weights.get(sid, 0.0), float(node.importance))
+        bulk_add_aliases(db, aliases)
+        bulk_upsert_role_skills(db, role_id, weights)
+
+        # edges (uses_tool to a non-skill target goes to skill_tools)
+        edge_rows, tool_links = [], []
         for e in graph.edges:
             src_id = name_to_id.get(e.source)
             dst_id = name_to_id.get(e.target)
             if e.relation == "uses_tool":
                 if src_id and dst_id:
-                    upsert_edge(db, src_id, dst_id, "uses_tool", float(e.weight), "llm")
+                    edge_rows.append((src_id, dst_id, "uses_tool", float(e.weight)))
                 elif src_id and not dst_id:
-                    tool = get_or_create_tool(db, e.target)
-                    upsert_skill_tool(db, src_id, tool.id, "uses_tool", float(e.weight), "llm")
+                    tool_links.append((src_id, e.target, float(e.weight)))
             else:
                 if src_id and dst_id and src_id != dst_id:
-                    upsert_edge(db, src_id, dst_id, e.relation, float(e.weight), "llm")
+                    edge_rows.append((src_id, dst_id, e.relation, float(e.weight)))
+
+        bulk_upsert_edges(db, [{"src_skill_id": s, "dst_skill_id": d, "relation_type": r, "weight": w, "source": "llm"}
+                               for s, d, r, w in edge_rows])
+        if tool_links:
+            tool_ids = bulk_get_or_create(db, Tool, {name: {} for _, name, _ in tool_links})
+            bulk_upsert_skill_tools(db, [{"skill_id": s, "tool_id": tool_ids[name], "relation_type": "uses_tool",
+                                          "weight": w, "source": "llm"} for s, name, w in tool_links])
+        sp.set(aliases=len(aliases), tools=len(tool_links))
+        bump_version(db, VERSION_KEY)
+        bump_version(db, role_version_key(role_id))
 
-        return role.id, ranked
\ No newline at end of file
+    mark_stale(VERSION_KEY)   # after commit, so the reload sees the new edges
+    return role_id, ranked
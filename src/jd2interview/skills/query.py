@@ -1,39 +1,82 @@
 # src/jd2interview/skills/query.py
 from __future__ import annotations
-from typing import Dict, List
-from sqlalchemy import select, desc, or_
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+from sqlalchemy import select, desc
 
-from jd2interview.storage.db import SessionLocal, Role, Skill, RoleSkill, SkillEdge
-from typing import List, Tuple
-from sqlalchemy import select
-from jd2interview.storage.db import SessionLocal, Role, RoleSkill, Skill, SkillEdge
+from jd2interview.storage.db import ReadSession, Role, Skill, RoleSkill, DataVersion, VersionedSnapshot
+from jd2interview.utils.config import settings
 
-def top_k_skills_for_role(role_id: int, k: int = 5) -> List[Tuple[str, float]]:
-    with SessionLocal() as db:
+# ---------- role → ranked skills cache ----------
+# persist_skill_graph bumps `role_skills:<id>` (and 'skill_graph'); an entry is served while its stamp
+# matches, so writing one role never evicts the others.
+ROLE_VERSION_PREFIX = "role_skills:"
+
+def role_version_key(role_id: int) -> str:
+    return f"{ROLE_VERSION_PREFIX}{int(role_id)}"
+
+def _load_role_versions(db, version: int) -> Dict[int, int]:
+    rows = db.execute(select(DataVersion.key, DataVersion.version)
+                      .where(DataVersion.key.like(ROLE_VERSION_PREFIX + "%"))).all()
+    return {int(k[len(ROLE_VERSION_PREFIX):]): int(v) for k, v in rows}
+
+_role_versions = VersionedSnapshot("skill_graph", _load_role_versions)
+_ranked: "OrderedDict[int, Tuple[int, List[Tuple[str, float]]]]" = OrderedDict()
+_ranked_lock = threading.Lock()
+
+def _ranked_skills(role_id: int) -> List[Tuple[str, float]]:
+    """Full ranked [(skill, weight)] list for a role, from the LRU when its version stamp is current."""
+    role_id = int(role_id)
+    stamp = _role_versions.get().get(role_id, 0)     # read before loading: a racing write only causes a reload
+    with _ranked_lock:
+        hit = _ranked.get(role_id)
+        if hit is not None and hit[0] == stamp:
+            _ranked.move_to_end(role_id)
+            return hit[1]
+    with ReadSession() as db:
         stmt = (
             select(Skill.name, RoleSkill.weight)
             .join(RoleSkill, RoleSkill.skill_id == Skill.id)
             .where(RoleSkill.role_id == role_id)
             .order_by(RoleSkill.weight.desc(), Skill.name.asc())
-            .limit(k)
         )
-        return [(n, float(w)) for (n, w) in db.execute(stmt).all()]
+        ranked = [(n, float(w)) for (n, w) in db.execute(stmt).all()]
+    with _ranked_lock:
+        _ranked[role_id] = (stamp, ranked)
+        _ranked.move_to_end(role_id)
+        while len(_ranked) > max(1, settings.ROLE_SKILL_CACHE_SIZE):
+            _ranked.popitem(last=False)
+    return ranked
+
+def invalidate_role_skills(role_id: int | None = None):
+    """Drop one role's (or every) cached ranking in this process."""
+    with _ranked_lock:
+        if role_id is None:
+            _ranked.clear()
+        else:
+            _ranked.pop(int(role_id), None)
+
+def top_k_skills_for_role(role_id: int, k: int = 5) -> List[Tuple[str, float]]:
+    return _ranked_skills(role_id)[:max(0, int(k))]
 
 def neighbors(skill_name: str, relation_type: str = "related_to") -> List[str]:
-    with SessionLocal() as db:
-        # get id
-        sid = db.query(Skill).filter(Skill.name == skill_name).with_entities(Skill.id).scalar()
-        if not sid:
-            return []
-        q = (
-            select(Skill.name)
-            .join(SkillEdge, SkillEdge.dst_skill_id == Skill.id)
-            .where(SkillEdge.src_skill_id == sid, SkillEdge.relation_type == relation_type)
-            .order_by(SkillEdge.weight.desc(), Skill.name.asc())
-        )
-        return [row[0] for row in db.execute(q).all()]
-    
-    
+    from jd2interview.skills.graph_engine import skill_graph
+    return [n for n, _, _ in skill_graph().neighbors(skill_name, relation=relation_type, direction="out")]
+
+def related_skills_for_role(role_id: int, k: int = 4, exclude: List[str] = ()) -> List[str]:
+    """Skills the graph ties to the role beyond `exclude` (personalized PageRank from its skills)."""
+    if k <= 0:
+        return []
+    from jd2interview.skills.graph_engine import skill_graph
+    return [n for n, _ in skill_graph().related_to_role(role_id, k=k, exclude=exclude)]
+
+def role_skill_terms(role_id: int, k: int = 8, related: int = 0) -> List[str]:
+    """Top-k role skills followed by up to `related` graph-related skills (used as crawl/retrieval tags)."""
+    skills = [s for s, _ in top_k_skills_for_role(role_id, k=k)]
+    if skills and related > 0:
+        skills += related_skills_for_role(role_id, k=related, exclude=skills)
+    return skills
 
 
 def build_role_skill_graph(role_id: int, top_k: int = 50, include_neighbors: int = 30) -> Dict:
@@ -48,7 +91,7 @@ def build_role_skill_graph(role_id: int, top_k: int = 50, include_neighbors: int
     """
     out = {"role_title": f"Role {role_id}", "skills": [], "edges": [], "tags": []}
 
-    with SessionLocal() as db:
+    with ReadSession() as db:
         role_name = db.query(Role.name).filter(Role.id == role_id).scalar()
         if role_name:
             out["role_title"] = role_name
@@ -72,34 +115,22 @@ def build_role_skill_graph(role_id: int, top_k: int = 50, include_neighbors: int
             out["tags"].append(sname)
         out["tags"] = sorted({t.lower() for t in out["tags"]})
 
-        # neighbor edges (only include edges incident to top skills)
+        # edges among the top skills, plus edges to the `include_neighbors` strongest outside skills
         if include_neighbors and include_neighbors > 0:
-            top_ids = [int(s["id"]) for s in out["skills"]]
-            e = (
-                select(SkillEdge.src_skill_id, SkillEdge.dst_skill_id, SkillEdge.relation_type, SkillEdge.weight)
-                .where(or_(SkillEdge.src_skill_id.in_(top_ids), SkillEdge.dst_skill_id.in_(top_ids)))
-                .order_by(desc(SkillEdge.weight))
-                .limit(int(include_neighbors))
-            )
-            edges = db.execute(e).all()
-            # make sure we have names for both ends (query names if necessary)
-            missing_ids = {sid for row in edges for sid in (int(row[0]), int(row[1])) if sid not in id_to_name}
-            if missing_ids:
-                name_rows = db.execute(
-                    select(Skill.id, Skill.name).where(Skill.id.in_(list(missing_ids)))
-                ).all()
-                for sid, sname in name_rows:
-                    id_to_name[int(sid)] = sname
-
-            for src_id, dst_id, rtype, w in edges:
-                src = id_to_name.get(int(src_id))
-                dst = id_to_name.get(int(dst_id))
-                if src and dst:
+            from jd2interview.skills.graph_engine import skill_graph
+            g = skill_graph()
+            top_nodes = {g.node_for_skill_id(sid) for sid in id_to_name} - {None}
+            outside: List[int] = []
+            for src, dst, rtype, w in g.incident_edges(top_nodes):
+                other = dst if src in top_nodes else src
+                if other in top_nodes or other in outside or len(outside) < int(include_neighbors):
+                    if other not in top_nodes and other not in outside:
+                        outside.append(other)
                     out["edges"].append({
-                        "src": src, "dst": dst,
+                        "src": g.names[src], "dst": g.names[dst],
                         "relation_type": rtype, "weight": float(w)
                     })
-                    
+
             have = {s["name"] for s in out["skills"]}
             for e in out["edges"]:
                 for nm in (e["src"], e["dst"]):
@@ -1,7 +1,10 @@
 # src/jd2interview/skills/viz.py
 from __future__ import annotations
-from typing import Dict, Set
+from functools import lru_cache
+from typing import Dict, List, Set, Tuple
+import copy
 import html as _html
+import json
 
 def _normalize_graph(gdict: Dict) -> Dict:
     """Ensure neighbor nodes exist for all edge endpoints and give them small weight."""
@@ -20,10 +23,55 @@ def _normalize_graph(gdict: Dict) -> Dict:
 
     return {"skills": list(by_name.values()), "edges": edges, "role_title": gdict.get("role_title", "Role")}
 
+STATIC_LAYOUT_MIN_NODES = 60   # at or above this many nodes the browser gets a physics-free layout
+
+def layout_positions(names: List[str], edges: List[Dict], size: float = 900.0, iters: int = 150, seed: int = 7):
+    """
+    Deterministic 2-D positions (n×2 ndarray, pixels): spectral embedding of the weighted graph
+    refined by vectorised Fruchterman–Reingold.
+    """
+    import numpy as np
+    n = len(names)
+    if n <= 1:
+        return np.zeros((n, 2))
+    idx = {nm: i for i, nm in enumerate(names)}
+    A = np.zeros((n, n))
+    for e in edges:
+        i, j = idx.get(e.get("src")), idx.get(e.get("dst"))
+        if i is not None and j is not None and i != j:
+            w = max(0.05, float(e.get("weight", 1.0) or 1.0))
+            A[i, j] = A[j, i] = max(A[i, j], w)
+
+    rng = np.random.default_rng(seed)
+    if n > 2 and A.any():
+        _, vecs = np.linalg.eigh(np.diag(A.sum(1)) - A)
+        pos = vecs[:, 1:3].copy()
+    else:
+        pos = rng.uniform(-1, 1, size=(n, 2))
+    pos += rng.normal(scale=1e-2, size=(n, 2))         # separate nodes the spectrum puts on one point
+    pos /= max(1e-9, np.abs(pos).max())
+
+    k = np.sqrt(4.0 / n)                                # ideal edge length in the [-1, 1]² box
+    t = 0.2
+    for _ in range(int(iters)):
+        delta = pos[:, None, :] - pos[None, :, :]
+        dist = np.maximum(np.linalg.norm(delta, axis=-1), 1e-3)
+        f = (k * k) / dist ** 2 - A * dist / k           # repulsion minus weighted attraction, per unit delta
+        np.fill_diagonal(f, 0.0)
+        disp = (delta * f[..., None]).sum(axis=1)
+        length = np.maximum(np.linalg.norm(disp, axis=1, keepdims=True), 1e-9)
+        pos += disp / length * np.minimum(length, t)
+        t *= 0.97
+    pos -= pos.mean(axis=0)
+    return pos / max(1e-9, np.abs(pos).max()) * (size / 2.0)
+
+def _script_json(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False).replace("</", "<\\/")
+
 def graph_html_iframe(gdict: Dict) -> str:
     """
     Returns an <iframe srcdoc="..."> with a vis-network graph.
-    No external Python libs required.
+    Node positions are computed here; graphs with STATIC_LAYOUT_MIN_NODES+ nodes render with physics off.
     """
     if not gdict:
         return "<em>No graph data.</em>"
@@ -35,30 +83,29 @@ def graph_html_iframe(gdict: Dict) -> str:
     if not skills and not edges:
         return "<em>No skills/edges for this role yet. Parse a JD first.</em>"
 
-    # Build JS arrays
-    def js_str(s: str) -> str:
-        return s.replace("\\", "\\\\").replace('"', '\\"')
+    names = [s.get("name") or "" for s in skills]
+    pos = layout_positions(names, edges)
+    static = len(skills) >= STATIC_LAYOUT_MIN_NODES
 
-    nodes_js = []
-    for s in skills:
+    nodes = []
+    for s, (x, y) in zip(skills, pos.tolist()):
         name = s.get("name") or ""
         w = float(s.get("weight", 1.0) or 1.0)
-        label = js_str(name)
-        title = js_str(f"{name} (w={w:.2f})")
-        size  = 14 + int(24 * max(0.0, min(1.0, (w - 0.0) / max(1.0, w))))  # simple size heuristic
-        nodes_js.append(f'{{id:"{label}", label:"{label}", title:"{title}", value:{w:.4f}, font:{{multi:"md"}}, size:{size}}}')
+        size = 14 + int(24 * max(0.0, min(1.0, (w - 0.0) / max(1.0, w))))  # simple size heuristic
+        nodes.append({"id": name, "label": name, "title": f"{name} (w={w:.2f})", "value": round(w, 4),
+                      "font": {"multi": "md"}, "size": size, "x": round(x, 1), "y": round(y, 1)})
 
-    edges_js = []
+    edges_out = []
     for e in edges:
-        src = e.get("src") or ""
-        dst = e.get("dst") or ""
-        rt  = e.get("relation_type") or ""
-        w   = float(e.get("weight", 1.0) or 1.0)
-        title = js_str(f"{rt} ({w:.2f})")
-        edges_js.append(f'{{from:"{js_str(src)}", to:"{js_str(dst)}", value:{w:.4f}, title:"{title}", arrows:"to"}}')
+        rt = e.get("relation_type") or ""
+        w  = float(e.get("weight", 1.0) or 1.0)
+        edges_out.append({"from": e.get("src") or "", "to": e.get("dst") or "", "value": round(w, 4),
+                          "title": f"{rt} ({w:.2f})", "arrows": "to"})
 
-    nodes_str = "[" + ",".join(nodes_js) + "]"
-    edges_str = "[" + ",".join(edges_js) + "]"
+    # static: no physics, straight edges; small graphs keep physics for dragging, starting settled
+    physics = ('{ enabled: false }' if static else
+               '{ solver: "forceAtlas2Based", stabilization: { iterations: 25 } }')
+    smooth = "false" if static else "true"
 
     html = f"""<!doctype html>
 <html>
@@ -75,24 +122,22 @@ def graph_html_iframe(gdict: Dict) -> str:
 <body>
 <div id="mynetwork"></div>
 <script>
-  const nodes = new vis.DataSet({nodes_str});
-  const edges = new vis.DataSet({edges_str});
+  const nodes = new vis.DataSet({_script_json(nodes)});
+  const edges = new vis.DataSet({_script_json(edges_out)});
   const container = document.getElementById('mynetwork');
   const data = {{ nodes, edges }};
   const options = {{
+    layout: {{ improvedLayout: false }},
     nodes: {{
       shape: "dot",
       scaling: {{ min: 10, max: 50 }},
     }},
     edges: {{
-      smooth: true,
+      smooth: {smooth},
       color: {{ opacity: 0.6 }},
       arrows: "to"
     }},
-    physics: {{
-      solver: "forceAtlas2Based",
-      stabilization: {{ iterations: 200 }}
-    }},
+    physics: {physics},
     interaction: {{
       hover: true,
       tooltipDelay: 120,
@@ -105,4 +150,17 @@ def graph_html_iframe(gdict: Dict) -> str:
 </body>
 </html>"""
     # Escape for srcdoc attribute
-    return f'<iframe srcdoc="{_html.escape(html, quote=True)}" style="width:100%;height:660px;border:0;"></iframe>'
\ No newline at end of file
+    return f'<iframe srcdoc="{_html.escape(html, quote=True)}" style="width:100%;height:660px;border:0;"></iframe>'
+
+# ---------- cached view ----------
+@lru_cache(maxsize=64)
+def _role_graph_view(role_id: int, top_k: int, neighbors: int, version: int) -> Tuple[str, Dict]:
+    from jd2interview.skills.query import build_role_skill_graph
+    g = build_role_skill_graph(role_id, top_k=top_k, include_neighbors=neighbors)
+    return graph_html_iframe(g), g
+
+def role_graph_view(role_id: int, top_k: int = 50, neighbors: int = 30) -> Tuple[str, Dict]:
+    """(iframe html, graph dict) for a role, cached per (role, top_k, neighbors, skill-graph version)."""
+    from jd2interview.skills.graph_engine import skill_graph
+    html, g = _role_graph_view(int(role_id), int(top_k), int(neighbors), skill_graph().version)
+    return html, copy.deepcopy(g)
@@ -0,0 +1,320 @@
+# src/jd2interview/storage/bank_io.py
+"""
+Streaming export / import of the question bank and skill graph.
+
+    jd2i export data/bank                      # gzip JSONL, one file per table + manifest.json
+    jd2i export data/bank --format parquet     # columnar (needs pyarrow); vectors as fixed_size_list<float32>
+    jd2i import data/bank                      # format taken from the manifest
+
+Rows are keyed by natural keys, not ids (questions by (source, external_id), skills / tools / roles by
+name), so a dump can seed any database. Export reads through a streaming cursor (`yield_per`:
+server-side on Postgres, incremental on SQLite) and import writes each batch in its own
+transaction through the bulk upsert helpers in storage/db.py, so memory stays flat at any bank size.
+Vectors are written one file per dimension (`question_vectors.d<dim>.*`).
+"""
+from __future__ import annotations
+import gzip
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from jd2interview.storage.db import (
+    Answer, Question, QuestionMeta, QuestionVector, Role, RoleSkill, Skill, SkillAlias, SkillEdge, SkillTool, Tool,
+    bulk_add_aliases, bulk_get_or_create, bulk_upsert, bulk_upsert_edges, bulk_upsert_question_meta,
+    bulk_upsert_question_vectors, bulk_upsert_questions, bulk_upsert_role_skills, bulk_upsert_skill_tools,
+    bump_version, get_read_engine, ids_by_name, init_db, mark_stale, question_ids_by_key,
+    refresh_question_summaries, session_scope,
+)
+
+FORMATS = {"jsonl": ".jsonl.gz", "parquet": ".parquet"}
+BATCH = 5000
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+
+# table → [(column, kind)]; kind drives the Parquet schema and datetime decoding of JSONL
+SCHEMAS: Dict[str, List[tuple]] = {
+    "skills": [("name", "str"), ("canonical_name", "str"), ("category", "str"), ("description", "str")],
+    "tools": [("name", "str")],
+    "roles": [("name", "str")],
+    "skill_aliases": [("skill", "str"), ("alias", "str")],
+    "skill_edges": [("src", "str"), ("dst", "str"), ("relation_type", "str"), ("weight", "float"), ("source", "str")],
+    "skill_tools": [("skill", "str"), ("tool", "str"), ("relation_type", "str"), ("weight", "float"), ("source", "str")],
+    "role_skills": [("role", "str"), ("skill", "str"), ("weight", "float")],
+    "questions": [("source", "str"), ("external_id", "str"), ("url", "str"), ("title", "str"),
+                  ("body_markdown", "str"), ("body_html", "str"), ("tags", "list_str"), ("companies", "list_str"),
+                  ("question_type", "str"), ("difficulty", "str"), ("created_at", "ts"), ("score", "int"),
+                  ("hash", "str")],
+    "answers": [("question_source", "str"), ("question_external_id", "str"), ("external_id", "str"),
+                ("body_markdown", "str"), ("body_html", "str"), ("score", "int"), ("is_accepted", "bool"),
+                ("created_at", "ts")],
+    "question_meta": [("question_source", "str"), ("question_external_id", "str"), ("qtype", "str"),
+                      ("difficulty", "str"), ("rubric_json", "str")],
+    "question_vectors": [("question_source", "str"), ("question_external_id", "str"), ("embedding", "vector")],
+}
+TABLES = list(SCHEMAS)   # import order: names before the links that reference them, questions before their rows
+
+
+# ---------- file formats ----------
+def _pa():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet export/import needs pyarrow (pip install pyarrow)") from e
+    return pa, pq
+
+def _arrow_schema(table: str, dim: Optional[int] = None):
+    pa, _ = _pa()
+    kinds = {"str": pa.string(), "int": pa.int64(), "float": pa.float64(), "bool": pa.bool_(),
+             "ts": pa.timestamp("us"), "list_str": pa.list_(pa.string())}
+    return pa.schema([(c, pa.list_(pa.float32(), dim) if k == "vector" else kinds[k]) for c, k in SCHEMAS[table]])
+
+class _JsonlWriter:
+    def __init__(self, path: Path, table: str, dim: Optional[int] = None):
+        self._f = gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+        self._ts = [c for c, k in SCHEMAS[table] if k == "ts"]
+
+    def write(self, rows: List[dict]):
+        for r in rows:
+            for c in self._ts:
+                if r.get(c) is not None:
+                    r[c] = r[c].isoformat()
+            self._f.write(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def close(self):
+        self._f.close()
+
+class _ParquetWriter:
+    def __init__(self, path: Path, table: str, dim: Optional[int] = None):
+        pa, pq = _pa()
+        self._pa, self._schema = pa, _arrow_schema(table, dim)
+        self._w = pq.ParquetWriter(str(path), self._schema, compression="zstd")
+
+    def write(self, rows: List[dict]):
+        if rows:
+            self._w.write_table(self._pa.Table.from_pylist(rows, schema=self._schema))
+
+    def close(self):
+        self._w.close()
+
+def _writer(fmt: str, path: Path, table: str, dim: Optional[int] = None):
+    return (_ParquetWriter if fmt == "parquet" else _JsonlWriter)(path, table, dim)
+
+def _read_batches(path: Path, table: str, batch: int) -> Iterator[List[dict]]:
+    if path.name.endswith(".parquet"):
+        _, pq = _pa()
+        for rb in pq.ParquetFile(str(path)).iter_batches(batch_size=batch):
+            yield rb.to_pylist()
+        return
+    ts = [c for c, k in SCHEMAS[table] if k == "ts"]
+    buf: List[dict] = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            r = json.loads(line)
+            for c in ts:
+                if r.get(c):
+                    r[c] = datetime.fromisoformat(r[c])
+            buf.append(r)
+            if len(buf) >= batch:
+                yield buf
+                buf = []
+    if buf:
+        yield buf
+
+
+# ---------- export ----------
+def _export_queries() -> Dict[str, object]:
+    Src, Dst = aliased(Skill), aliased(Skill)
+    return {
+        "skills": select(Skill.name, Skill.canonical_name, Skill.category, Skill.description).order_by(Skill.id),
+        "tools": select(Tool.name).order_by(Tool.id),
+        "roles": select(Role.name).order_by(Role.id),
+        "skill_aliases": select(Skill.name.label("skill"), SkillAlias.alias)
+            .join(Skill, Skill.id == SkillAlias.skill_id).order_by(SkillAlias.id),
+        "skill_edges": select(Src.name.label("src"), Dst.name.label("dst"), SkillEdge.relation_type,
+                              SkillEdge.weight, SkillEdge.source)
+            .join(Src, Src.id == SkillEdge.src_skill_id).join(Dst, Dst.id == SkillEdge.dst_skill_id)
+            .order_by(SkillEdge.id),
+        "skill_tools": select(Skill.name.label("skill"), Tool.name.label("tool"), SkillTool.relation_type,
+                              SkillTool.weight, SkillTool.source)
+            .join(Skill, Skill.id == SkillTool.skill_id).join(Tool, Tool.id == SkillTool.tool_id)
+            .order_by(SkillTool.id),
+        "role_skills": select(Role.name.label("role"), Skill.name.label("skill"), RoleSkill.weight)
+            .join(Role, Role.id == RoleSkill.role_id).join(Skill, Skill.id == RoleSkill.skill_id)
+            .order_by(RoleSkill.id),
+        "questions": select(Question.source, Question.external_id, Question.url, Question.title,
+                            Question.body_markdown, Question.body_html, Question.tags_json, Question.companies_json,
+                            Question.question_type, Question.difficulty, Question.created_at_source.label("created_at"),
+                            Question.score, Question.hash).order_by(Question.id),
+        "answers": select(Question.source.label("question_source"), Question.external_id.label("question_external_id"),
+                          Answer.external_id, Answer.body_markdown, Answer.body_html, Answer.score,
+                          Answer.is_accepted, Answer.created_at_source.label("created_at"))
+            .join(Question, Question.id == Answer.question_id).order_by(Answer.id),
+        "question_meta": select(Question.source.label("question_source"),
+                                Question.external_id.label("question_external_id"),
+                                QuestionMeta.qtype, QuestionMeta.difficulty, QuestionMeta.rubric_json)
+            .join(Question, Question.id == QuestionMeta.question_id).order_by(QuestionMeta.id),
+        "question_vectors": select(Question.source.label("question_source"),
+                                   Question.external_id.label("question_external_id"),
+                                   QuestionVector.dim, QuestionVector.embedding_json)
+            .join(Question, Question.id == QuestionVector.question_id).order_by(QuestionVector.id),
+    }
+
+def _shape(table: str, row) -> dict:
+    r = dict(row._mapping)
+    if table == "questions":
+        r["tags"] = json.loads(r.pop("tags_json") or "[]")
+        r["companies"] = json.loads(r.pop("companies_json") or "[]")
+    elif table == "answers":
+        r["is_accepted"] = bool(r["is_accepted"])
+    elif table == "question_vectors":
+        r.pop("dim")
+        r["embedding"] = json.loads(r.pop("embedding_json"))
+    return r
+
+def export_bank(out_dir: str, fmt: str = "jsonl", tables: Optional[List[str]] = None, batch: int = BATCH) -> Dict[str, int]:
+    """Stream the selected tables to `out_dir`; returns {table: rows}."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r} (expected one of {', '.join(FORMATS)})")
+    tables = tables or TABLES
+    out = Path(out_dir); out.mkdir(parents=True, exist_ok=True)
+    queries, counts, files = _export_queries(), {}, {}
+    with get_read_engine().connect().execution_options(yield_per=batch) as conn:
+        for table in tables:
+            t0, n = time.perf_counter(), 0
+            writers: Dict[Optional[int], object] = {}
+            try:
+                for part in conn.execute(queries[table]).partitions():
+                    rows = [_shape(table, r) for r in part]
+                    if table == "question_vectors":      # fixed-size arrays: one file per dimension
+                        by_dim: Dict[int, List[dict]] = {}
+                        for r in rows:
+                            by_dim.setdefault(len(r["embedding"]), []).append(r)
+                        for dim, rs in by_dim.items():
+                            if dim not in writers:
+                                name = f"{table}.d{dim}{FORMATS[fmt]}"
+                                writers[dim] = _writer(fmt, out / name, table, dim); files[name] = table
+                            writers[dim].write(rs)
+                    else:
+                        if None not in writers:
+                            name = f"{table}{FORMATS[fmt]}"
+                            writers[None] = _writer(fmt, out / name, table); files[name] = table
+                        writers[None].write(rows)
+                    n += len(rows)
+            finally:
+                for w in writers.values():
+                    w.close()
+            counts[table] = n
+            print(f"[bank] exported {table}: {n:,} rows in {time.perf_counter() - t0:.1f}s")
+    (out / MANIFEST).write_text(json.dumps({
+        "format": fmt, "format_version": FORMAT_VERSION, "exported_at": datetime.utcnow().isoformat(),
+        "counts": counts, "files": files,
+    }, indent=2), encoding="utf-8")
+    return counts
+
+
+# ---------- import ----------
+def _import_skills(db, rows):
+    bulk_get_or_create(db, Skill, {r["name"]: {"canonical_name": r.get("canonical_name"), "category": r.get("category"),
+                                               "description": r.get("description")} for r in rows})
+
+def _import_tools(db, rows):
+    bulk_get_or_create(db, Tool, {r["name"]: {} for r in rows})
+
+def _import_roles(db, rows):
+    bulk_get_or_create(db, Role, {r["name"]: {} for r in rows})
+
+def _import_skill_aliases(db, rows):
+    ids = ids_by_name(db, Skill, (r["skill"] for r in rows))
+    bulk_add_aliases(db, [(ids[r["skill"]], r["alias"]) for r in rows if r["skill"] in ids])
+
+def _import_skill_edges(db, rows):
+    ids = ids_by_name(db, Skill, [n for r in rows for n in (r["src"], r["dst"])])
+    bulk_upsert_edges(db, [{"src_skill_id": ids[r["src"]], "dst_skill_id": ids[r["dst"]],
+                            "relation_type": r["relation_type"], "weight": r["weight"], "source": r.get("source")}
+                           for r in rows if r["src"] in ids and r["dst"] in ids])
+
+def _import_skill_tools(db, rows):
+    sids, tids = ids_by_name(db, Skill, (r["skill"] for r in rows)), ids_by_name(db, Tool, (r["tool"] for r in rows))
+    bulk_upsert_skill_tools(db, [{"skill_id": sids[r["skill"]], "tool_id": tids[r["tool"]],
+                                  "relation_type": r["relation_type"], "weight": r["weight"], "source": r.get("source")}
+                                 for r in rows if r["skill"] in sids and r["tool"] in tids])
+
+def _import_role_skills(db, rows, touched_roles: set):
+    rids, sids = ids_by_name(db, Role, (r["role"] for r in rows)), ids_by_name(db, Skill, (r["skill"] for r in rows))
+    by_role: Dict[int, Dict[int, float]] = {}
+    for r in rows:
+        if r["role"] in rids and r["skill"] in sids:
+            by_role.setdefault(rids[r["role"]], {})[sids[r["skill"]]] = float(r["weight"])
+    for role_id, weights in by_role.items():
+        bulk_upsert_role_skills(db, role_id, weights)
+    touched_roles.update(by_role)
+
+def _import_questions(db, rows):
+    bulk_upsert_questions(db, [SimpleNamespace(**r, answers=[]) for r in rows])
+
+def _question_ids(db, rows) -> Dict[tuple, int]:
+    return question_ids_by_key(db, ((r["question_source"], r["question_external_id"]) for r in rows))
+
+def _import_answers(db, rows):
+    ids = _question_ids(db, rows)
+    vals = [{"question_id": ids[k], "external_id": r["external_id"], "body_markdown": r.get("body_markdown"),
+             "body_html": r.get("body_html"), "score": r.get("score") or 0, "is_accepted": bool(r.get("is_accepted")),
+             "created_at_source": r.get("created_at")}
+            for r in rows if (k := (r["question_source"], r["question_external_id"])) in ids]
+    bulk_upsert(db, Answer.__table__, vals, keys=["question_id", "external_id"],
+                update_cols=["body_markdown", "body_html", "score", "is_accepted", "created_at_source"])
+    refresh_question_summaries(db, [v["question_id"] for v in vals])     # has_answer
+
+def _import_question_meta(db, rows):
+    ids = _question_ids(db, rows)
+    bulk_upsert_question_meta(db, [
+        {"question_id": ids[k], "qtype": r.get("qtype"), "difficulty": r.get("difficulty"),
+         "rubric": json.loads(r.get("rubric_json") or "{}")}
+        for r in rows if (k := (r["question_source"], r["question_external_id"])) in ids])
+
+def _import_question_vectors(db, rows):
+    ids = _question_ids(db, rows)
+    bulk_upsert_question_vectors(db, [(ids[k], [float(x) for x in r["embedding"]])
+                                      for r in rows if (k := (r["question_source"], r["question_external_id"])) in ids])
+
+def import_bank(in_dir: str, tables: Optional[List[str]] = None, batch: int = BATCH) -> Dict[str, int]:
+    """Load a dump written by export_bank (either format); one transaction per batch. Returns {table: rows read}."""
+    from jd2interview.skills.graph_engine import VERSION_KEY
+    from jd2interview.skills.query import role_version_key
+    src = Path(in_dir)
+    manifest = json.loads((src / MANIFEST).read_text(encoding="utf-8"))
+    if manifest.get("format_version", 1) > FORMAT_VERSION:
+        raise RuntimeError(f"dump format_version {manifest['format_version']} is newer than this build supports")
+    init_db()
+    wanted = tables or TABLES
+    counts: Dict[str, int] = {}
+    touched_roles: set = set()
+    for table in TABLES:
+        if table not in wanted:
+            continue
+        load = globals()[f"_import_{table}"]
+        t0, n = time.perf_counter(), 0
+        for name in sorted(f for f, t in manifest["files"].items() if t == table):
+            for rows in _read_batches(src / name, table, batch):
+                with session_scope() as db:
+                    load(db, rows, touched_roles) if table == "role_skills" else load(db, rows)
+                n += len(rows)
+        counts[table] = n
+        print(f"[bank] imported {table}: {n:,} rows in {time.perf_counter() - t0:.1f}s")
+
+    if any(t in wanted for t in ("skills", "skill_aliases", "skill_edges", "skill_tools", "role_skills")):
+        with session_scope() as db:
+            bump_version(db, VERSION_KEY)
+            for role_id in touched_roles:
+                bump_version(db, role_version_key(role_id))
+        mark_stale(VERSION_KEY)
+    return counts
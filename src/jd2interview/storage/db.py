@@ -1,18 +1,19 @@
 from __future__ import annotations
 from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 import hashlib
 import json
 from datetime import datetime
 from typing import Optional, Iterable, Tuple
 from sqlalchemy import (
-    create_engine, String, Integer, Float, Text, ForeignKey,
+    String, Integer, Float, Text, ForeignKey,
     UniqueConstraint, Index
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, sessionmaker
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.engine.url import make_url
-from sqlalchemy import DateTime, JSON, Boolean
+from sqlalchemy import DateTime, JSON, Boolean, delete, update
 from sqlalchemy import select
 
 
@@ -35,19 +36,66 @@ def _ensure_sqlite_dir(db_url: str):
         p.parent.mkdir(parents=True, exist_ok=True)
 
 def _create_engine():
+    from jd2interview.storage.engine import build_engine
     _ensure_sqlite_dir(settings.DB_URL)
-    return create_engine(settings.DB_URL, future=True, pool_pre_ping=True)
+    return build_engine(settings.DB_URL)
 
-engine = _create_engine()
-
-
-SessionLocal = sessionmaker(
-    bind=engine,
+# Engine and session factory are built on first use, not at import: tools that never
+# touch the DB (or only need the ORM models) don't pay for engine setup or create files.
+_SessionFactory = sessionmaker(
     autocommit=False,
     autoflush=False,
     expire_on_commit=False,   # <-- important
 )
 
+@lru_cache(maxsize=1)
+def get_engine():
+    import atexit
+    eng = _create_engine()
+    _SessionFactory.configure(bind=eng)
+    atexit.register(eng.dispose)   # close pooled connections so SQLite checkpoints its WAL on exit
+    return eng
+
+def SessionLocal():
+    """Open a new Session bound to the (lazily created) engine."""
+    get_engine()
+    return _SessionFactory()
+
+# --- Read side: UI/query modules opt in with ReadSession() so browsing never queues behind the
+# writer's pool or lock (crawl / classify / generate keep using SessionLocal / session_scope) ---
+_ReadSessionFactory = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False)
+
+@lru_cache(maxsize=1)
+def get_read_engine():
+    """Read-only engine: DB_READ_URL (replica) if set, else a read-only pool on DB_URL."""
+    from jd2interview.storage.engine import build_engine
+    writer = get_engine()
+    url = settings.DB_READ_URL or settings.DB_URL
+    if not settings.DB_READ_SPLIT or (url == settings.DB_URL and writer.dialect.name == "sqlite"
+                                      and make_url(url).database in (None, "", ":memory:")):
+        eng = writer                                   # split off, or a private in-memory DB
+    else:
+        if writer.dialect.name == "sqlite" and not settings.DB_READ_URL:
+            writer.connect().close()                   # create the file / switch it to WAL before ro opens
+        eng = build_engine(url, readonly=True)
+        import atexit
+        atexit.register(eng.dispose)               # runs before the writer's: the writer closes last
+    _ReadSessionFactory.configure(bind=eng)
+    return eng
+
+def ReadSession():
+    """Open a Session on the read-only engine (same data as SessionLocal, no writes)."""
+    get_read_engine()
+    return _ReadSessionFactory()
+
+def __getattr__(name):
+    # backwards compatible `from jd2interview.storage.db import engine`
+    if name == "engine":
+        return get_engine()
+    if name == "read_engine":
+        return get_read_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class Base(DeclarativeBase):
     pass
@@ -110,12 +158,17 @@ Index("ix_edges_src", SkillEdge.src_skill_id)
 Index("ix_edges_dst", SkillEdge.dst_skill_id)
 
 def init_db():
-    # engine = get_engine()
-    Base.metadata.create_all(bind=engine)
+    from jd2interview.storage.migrations import migrate
+    Base.metadata.create_all(bind=get_engine())
+    migrate(get_engine())
+
+@lru_cache(maxsize=1)
+def ensure_db():
+    """init_db() once per process, for hot paths that would otherwise re-inspect every table per call."""
+    init_db()
 
 @contextmanager
 def session_scope():
-    # SessionLocal = get_sessionmaker()
     session = SessionLocal()
     try:
         yield session
@@ -195,8 +248,91 @@ def upsert_skill_tool(db, skill_id: int, tool_id: int, relation_type: str, weigh
         db.add(SkillTool(skill_id=skill_id, tool_id=tool_id,
                          relation_type=relation_type, weight=weight, source=source))
     db.commit()
-    
-    
+
+
+# --- Set-based writers (no commits: the caller's session_scope commits once) ---
+_IN_CHUNK = 500   # stay well under SQLite's bound-parameter limit
+
+def _chunks(xs: list, n: int = _IN_CHUNK):
+    for i in range(0, len(xs), n):
+        yield xs[i:i + n]
+
+def _dialect_insert(db):
+    name = db.get_bind().dialect.name
+    if name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    if name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    return None
+
+def bulk_upsert(db, table, rows: list[dict], keys: list[str], update_cols: list[str] = ()):
+    """
+    INSERT ... ON CONFLICT (keys) DO UPDATE SET update_cols (or DO NOTHING) for many rows.
+    Rows with the same key are collapsed (last wins), like a sequence of per-row upserts.
+    """
+    rows = list({tuple(r[k] for k in keys): r for r in rows}.values())
+    if not rows:
+        return
+    insert_ = _dialect_insert(db)
+    if insert_ is None:
+        # no portable ON CONFLICT: select-then-write per row, still inside one transaction
+        from sqlalchemy import insert as _insert, update as _update
+        for r in rows:
+            cond = [table.c[k] == r[k] for k in keys]
+            if db.execute(select(table.c.id).where(*cond)).first() is None:
+                db.execute(_insert(table).values(**r))
+            elif update_cols:
+                db.execute(_update(table).where(*cond).values({c: r[c] for c in update_cols}))
+        return
+    ins = insert_(table)
+    if update_cols:
+        stmt = ins.on_conflict_do_update(index_elements=keys, set_={c: ins.excluded[c] for c in update_cols})
+    else:
+        stmt = ins.on_conflict_do_nothing(index_elements=keys)
+    for chunk in _chunks(rows):
+        db.execute(stmt, chunk)
+
+def ids_by_name(db, model, names: Iterable[str]) -> dict[str, int]:
+    """{name: id} for the given names of a model with a unique `name` column (chunked IN queries)."""
+    out: dict[str, int] = {}
+    for chunk in _chunks(list(dict.fromkeys(names))):
+        out.update({n: i for n, i in db.execute(select(model.name, model.id).where(model.name.in_(chunk))).all()})
+    return out
+
+def bulk_get_or_create(db, model, values: dict[str, dict]) -> dict[str, int]:
+    """
+    Resolve {name: extra_columns} to {name: id}: one IN query, one bulk insert of the missing
+    names (existing rows are left untouched), one IN query for the new ids.
+    """
+    ids = ids_by_name(db, model, values)
+    missing = [n for n in values if n not in ids]
+    if missing:
+        bulk_upsert(db, model.__table__, [{"name": n, **values[n]} for n in missing], keys=["name"])
+        ids.update(ids_by_name(db, model, missing))
+    return ids
+
+def bulk_add_aliases(db, pairs: Iterable[Tuple[int, str]]):
+    bulk_upsert(db, SkillAlias.__table__, [{"skill_id": sid, "alias": a} for sid, a in pairs],
+                keys=["skill_id", "alias"])
+
+def bulk_upsert_role_skills(db, role_id: int, weights: dict[int, float]):
+    bulk_upsert(db, RoleSkill.__table__,
+                [{"role_id": role_id, "skill_id": sid, "weight": float(w)} for sid, w in weights.items()],
+                keys=["role_id", "skill_id"], update_cols=["weight"])
+
+def bulk_upsert_edges(db, rows: list[dict]):
+    """rows: {src_skill_id, dst_skill_id, relation_type, weight, source}"""
+    bulk_upsert(db, SkillEdge.__table__, rows, keys=["src_skill_id", "dst_skill_id", "relation_type"],
+                update_cols=["weight", "source"])
+
+def bulk_upsert_skill_tools(db, rows: list[dict]):
+    """rows: {skill_id, tool_id, relation_type, weight, source}"""
+    bulk_upsert(db, SkillTool.__table__, rows, keys=["skill_id", "tool_id", "relation_type"],
+                update_cols=["weight", "source"])
+
+
 class Question(Base):
     __tablename__ = "questions"
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -321,9 +457,118 @@ def upsert_question_with_answers(db, item) -> Question:
                     created_at_source=a.created_at
                 ))
 
+    db.flush()
+    refresh_question_summaries(db, [q.id])
     db.commit()
     return q
 
+_QUESTION_KEYS = ("source", "external_id", "hash")
+
+def _question_fields(item) -> dict:
+    return {
+        "url": item.url, "title": item.title, "body_markdown": item.body_markdown, "body_html": item.body_html,
+        "tags_json": json.dumps(item.tags), "companies_json": json.dumps(item.companies),
+        "question_type": item.question_type, "difficulty": item.difficulty,
+        "created_at_source": item.created_at, "score": item.score or 0,
+    }
+
+def _answer_fields(a) -> dict:
+    return {"body_markdown": a.body_markdown, "body_html": a.body_html, "score": a.score or 0,
+            "is_accepted": bool(a.is_accepted), "created_at_source": a.created_at}
+
+def question_ids_by_key(db, keys: Iterable[Tuple[str, str]]) -> dict[Tuple[str, str], int]:
+    """{(source, external_id): id} for the given question keys (chunked IN queries per source)."""
+    by_source: dict[str, list[str]] = {}
+    for src, ext in dict.fromkeys(keys):
+        by_source.setdefault(src, []).append(ext)
+    out: dict[Tuple[str, str], int] = {}
+    for src, exts in by_source.items():
+        for chunk in _chunks(exts):
+            out.update({(src, e): i for i, e in db.execute(
+                select(Question.id, Question.external_id).where(Question.source == src, Question.external_id.in_(chunk))
+            ).all()})
+    return out
+
+def bulk_upsert_questions(db, items) -> list[int]:
+    """
+    Set-based `upsert_question_with_answers` (no commit): chunked IN lookups on (source, external_id)
+    and (source, hash), one executemany UPDATE for known questions, one INSERT ... RETURNING for new
+    ones, then the same for their answers. Returns question ids aligned with `items`.
+    """
+    from sqlalchemy import insert as _insert, update as _update, or_
+    items = list(items)
+    rows, answers, slot = [], [], []           # unique questions, their answers by external id, item → row
+    by_key: dict[tuple, int] = {}
+    for it in items:
+        h = getattr(it, "hash", None) or sha256_hex(canonical_question_text(it.title, it.body_markdown))
+        try:
+            it.hash = h
+        except Exception:
+            pass
+        j = by_key.get(("e", it.source, it.external_id), by_key.get(("h", it.source, h)))
+        if j is None:                          # same key twice in one batch: later item updates the first row
+            j = len(rows)
+            rows.append({"source": it.source, "external_id": it.external_id, "hash": h})
+            answers.append({})
+        rows[j].update(_question_fields(it))
+        for a in it.answers or []:
+            answers[j][a.external_id] = a
+        by_key.setdefault(("e", it.source, it.external_id), j)
+        by_key.setdefault(("h", it.source, h), j)
+        slot.append(j)
+    if not rows:
+        return []
+
+    # existing questions, external id match first (like the per-row helper)
+    by_ext, by_hash = {}, {}
+    for src in {r["source"] for r in rows}:
+        mine = [r for r in rows if r["source"] == src]
+        for chunk in _chunks(mine, _IN_CHUNK // 2):
+            for qid, ext, h in db.execute(
+                select(Question.id, Question.external_id, Question.hash).where(
+                    Question.source == src,
+                    or_(Question.external_id.in_([r["external_id"] for r in chunk]),
+                        Question.hash.in_([r["hash"] for r in chunk])))
+            ).all():
+                by_ext[(src, ext)] = qid; by_hash[(src, h)] = qid
+    ids = [by_ext.get((r["source"], r["external_id"]), by_hash.get((r["source"], r["hash"]))) for r in rows]
+
+    known = [j for j, qid in enumerate(ids) if qid is not None]
+    if known:                                  # keep source/external_id/hash stable, update the rest
+        db.execute(_update(Question), [{"id": ids[j], **{k: v for k, v in rows[j].items() if k not in _QUESTION_KEYS}} for j in known])
+    new = [j for j, qid in enumerate(ids) if qid is None]
+    if new:
+        if _dialect_insert(db) is not None:    # SQLite >= 3.35 / Postgres: ids come back with the insert
+            got = db.execute(_insert(Question).returning(Question.id, sort_by_parameter_order=True),
+                             [rows[j] for j in new]).scalars().all()
+        else:
+            got = []
+            for j in new:
+                q = Question(**rows[j]); db.add(q); db.flush(); got.append(q.id)
+        for j, qid in zip(new, got):
+            ids[j] = qid
+
+    # answers: update by (question_id, external_id), insert the rest
+    have = {}
+    known_ids = [ids[j] for j in known if answers[j]]
+    for chunk in _chunks(known_ids):
+        have.update({(qid, ext): aid for aid, qid, ext in db.execute(
+            select(Answer.id, Answer.question_id, Answer.external_id).where(Answer.question_id.in_(chunk))).all()})
+    upd, ins = [], []
+    for j, by_ext_id in enumerate(answers):
+        for ext, a in by_ext_id.items():
+            aid = have.get((ids[j], ext))
+            if aid is not None:
+                upd.append({"id": aid, **_answer_fields(a)})
+            else:
+                ins.append({"question_id": ids[j], "external_id": ext, **_answer_fields(a)})
+    if upd:
+        db.execute(_update(Answer), upd)
+    if ins:
+        db.execute(_insert(Answer), ins)
+    refresh_question_summaries(db, ids)
+    return [ids[j] for j in slot]
+
 
 # --- Embeddings table for questions (store as JSON for portability) ---
 class QuestionVector(Base):
@@ -344,8 +589,108 @@ class QuestionMeta(Base):
     rubric_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)      # JSON string
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-def get_questions_with_any_tags(db, tags: list[str], limit: int = 500):
-    """Simple Python-side filter; tags_json is a JSON-encoded list."""
+# Composite indexes for the hot query shapes (existing databases get them from storage/migrations.py)
+Index("ix_questions_score_id", Question.score, Question.id)                       # ORDER BY score DESC, id DESC
+Index("ix_questions_source_score", Question.source, Question.score, Question.id)   # source filter + same order
+Index("ix_qmeta_type_diff_qid", QuestionMeta.qtype, QuestionMeta.difficulty, QuestionMeta.question_id)
+Index("ix_answers_best", Answer.question_id, Answer.is_accepted, Answer.score)    # best answer per question
+Index("uq_answers_qid_extid", Answer.question_id, Answer.external_id, unique=True)
+
+# --- Browse read model: one narrow row per question, kept in step by the upsert helpers ---
+class QuestionSummary(Base):
+    __tablename__ = "question_summary"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    question_id: Mapped[int] = mapped_column(ForeignKey("questions.id", ondelete="CASCADE"), unique=True)
+    source: Mapped[str] = mapped_column(String(32))
+    score: Mapped[int] = mapped_column(Integer, default=0)
+    qtype: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)      # NULL = not classified yet
+    difficulty: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+    tags_json: Mapped[str] = mapped_column(Text, default="[]")                   # JSON array, as stored on the question
+    snippet: Mapped[str] = mapped_column(Text, default="")                       # title + start of body, one line
+    url: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    has_answer: Mapped[bool] = mapped_column(Boolean, default=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+Index("ix_qsummary_score", QuestionSummary.score, QuestionSummary.question_id)
+Index("ix_qsummary_type_diff_src", QuestionSummary.qtype, QuestionSummary.difficulty, QuestionSummary.source)
+
+# what listing / relevance / counting read (Row tuples: no ORM identity map, snippet left out)
+SUMMARY_LIST_COLUMNS = (QuestionSummary.question_id, QuestionSummary.source, QuestionSummary.qtype,
+                        QuestionSummary.difficulty, QuestionSummary.tags_json, QuestionSummary.url,
+                        QuestionSummary.has_answer)
+
+SNIPPET_CHARS = 240
+
+def _snippet(title: Optional[str], body: Optional[str], n: int = SNIPPET_CHARS) -> str:
+    text = " ".join(f"{title or ''} {body or ''}".split())
+    return text if len(text) <= n else text[:n - 1].rstrip() + "…"
+
+def refresh_question_summaries(db, ids: Optional[Iterable[int]] = None):
+    """
+    Rebuild question_summary rows for `ids` (every question when None) from questions, question_meta
+    and answers, in the caller's transaction (no commit). Pending ORM changes must be flushed first.
+    """
+    if ids is None:
+        ids = db.execute(select(Question.id)).scalars().all()
+    ids = list(dict.fromkeys(int(i) for i in ids))
+    now = datetime.utcnow()
+    for chunk in _chunks(ids):
+        answered = set(db.execute(select(Answer.question_id).where(Answer.question_id.in_(chunk)).distinct()).scalars())
+        rows = db.execute(
+            select(Question.id, Question.source, Question.score, Question.title, Question.body_markdown,
+                   Question.body_html, Question.url, Question.tags_json, QuestionMeta.qtype, QuestionMeta.difficulty)
+            .outerjoin(QuestionMeta, QuestionMeta.question_id == Question.id)
+            .where(Question.id.in_(chunk))
+        ).all()
+        bulk_upsert(db, QuestionSummary.__table__, [
+            {"question_id": qid, "source": src, "score": score or 0, "qtype": qtype, "difficulty": diff,
+             "tags_json": tj or "[]", "snippet": _snippet(title, body_md or body_html), "url": url,
+             "has_answer": qid in answered, "updated_at": now}
+            for qid, src, score, title, body_md, body_html, url, tj, qtype, diff in rows
+        ], keys=["question_id"], update_cols=["source", "score", "qtype", "difficulty", "tags_json", "snippet",
+                                              "url", "has_answer", "updated_at"])
+
+def summary_items(db, rows, with_answer: bool = False) -> list[dict]:
+    """
+    UI/retrieval item dicts for question_summary rows (SUMMARY_LIST_COLUMNS; order kept): full question text and rubric
+    (and best answer) come from chunked IN queries, never one query per question.
+    """
+    ids = [r.question_id for r in rows]
+    text, rubric, best = {}, {}, {}
+    for chunk in _chunks(ids):
+        for qid, title, md, html in db.execute(select(Question.id, Question.title, Question.body_markdown,
+                                                      Question.body_html).where(Question.id.in_(chunk))).all():
+            body = md or html
+            text[qid] = (title or "") + ("\n\n" + body if body else "")
+        rubric.update(db.execute(select(QuestionMeta.question_id, QuestionMeta.rubric_json)
+                                 .where(QuestionMeta.question_id.in_(chunk))).all())
+    if with_answer:
+        for chunk in _chunks([r.question_id for r in rows if r.has_answer]):
+            for qid, body in db.execute(
+                select(Answer.question_id, Answer.body_markdown).where(Answer.question_id.in_(chunk))
+                .order_by(Answer.question_id, Answer.is_accepted.desc(), Answer.score.desc())
+            ).all():
+                best.setdefault(qid, body)
+    out = []
+    for r in rows:
+        try:
+            rb = json.loads(rubric.get(r.question_id) or "{}")
+        except Exception:
+            rb = {}
+        try:
+            tags = json.loads(r.tags_json or "[]")
+        except Exception:
+            tags = []
+        item = {"id": r.question_id, "question": text.get(r.question_id, ""), "type": r.qtype,
+                "difficulty": r.difficulty, "evaluation_rubric": rb, "url": r.url, "tags": tags,
+                "source": r.source}
+        if with_answer:
+            item["answer"] = best.get(r.question_id) or ""
+        out.append(item)
+    return out
+
+def get_questions_with_any_tags(db, tags: list[str], limit: int = 500, match=None):
+    """Simple Python-side filter; tags_json is a JSON-encoded list. `match(qtags)` overrides the overlap test."""
     if not tags:
         return []
     rows = db.execute(select(Question.id, Question.title, Question.body_markdown, Question.url, Question.tags_json)
@@ -358,26 +703,141 @@ def get_questions_with_any_tags(db, tags: list[str], limit: int = 500):
             qtags = {t.lower() for t in json.loads(tags_json or "[]")}
         except Exception:
             qtags = set()
-        if qtags & tagset:
+        if (match(qtags) if match is not None else qtags & tagset):
             out.append({"id": qid, "title": title or "", "body_md": body_md or "", "url": url, "tags": list(qtags)})
     return out
 
 def get_or_none_question_vector(db, question_id: int) -> Optional[QuestionVector]:
     return db.query(QuestionVector).filter_by(question_id=question_id).one_or_none()
 
+def question_vectors_by_id(db, ids: Iterable[int]) -> dict[int, list[float]]:
+    """{question_id: embedding} for the ids that have a stored vector (chunked IN queries)."""
+    out: dict[int, list[float]] = {}
+    for chunk in _chunks(list(dict.fromkeys(ids))):
+        out.update({qid: json.loads(e) for qid, e in db.execute(
+            select(QuestionVector.question_id, QuestionVector.embedding_json).where(QuestionVector.question_id.in_(chunk))
+        ).all()})
+    return out
+
 def upsert_question_vector(db, question_id: int, emb: list[float]):
     qv = db.query(QuestionVector).filter_by(question_id=question_id).one_or_none()
     if qv:
         qv.embedding_json = json.dumps(emb); qv.dim = len(emb)
+        bump_version(db, VECTORS_VERSION_KEY)
     else:
         qv = QuestionVector(question_id=question_id, dim=len(emb), embedding_json=json.dumps(emb))
         db.add(qv)
     db.commit()
     return qv
 
+# --- Background jobs (crawl / classify / generate) ---
+class Job(Base):
+    __tablename__ = "jobs"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(32), index=True)                  # 'generate_questions', ...
+    role_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
+    params_json: Mapped[str] = mapped_column(Text, default="{}")
+    dedup_key: Mapped[str] = mapped_column(String(64), index=True)             # sha256(kind, role_id, params)
+    status: Mapped[str] = mapped_column(String(16), index=True, default="queued")  # queued/running/done/failed
+    progress: Mapped[float] = mapped_column(Float, default=0.0)                # 0..1
+    message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)        # last progress line
+    log_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)       # JSON list of recent lines
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    owner: Mapped[Optional[str]] = mapped_column(String(96), nullable=True)    # host:pid:token of the runner
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)  # refreshed by the owner
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+# --- Data versions: monotonically bumped stamps that in-memory caches compare against ---
+class SchemaMigration(Base):
+    __tablename__ = "schema_migrations"
+    version: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(128))
+    applied_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)   # 'skill_graph', ...
+    version: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+def bump_version(db, key: str):
+    """Increment `key`'s version inside the caller's transaction (visible to other processes on commit)."""
+    tbl = DataVersion.__table__
+    insert_ = _dialect_insert(db)
+    if insert_ is not None:
+        ins = insert_(tbl).values(key=key, version=1, updated_at=datetime.utcnow())
+        db.execute(ins.on_conflict_do_update(index_elements=["key"],
+                                             set_={"version": tbl.c.version + 1, "updated_at": datetime.utcnow()}))
+        return
+    row = db.get(DataVersion, key)
+    if row is None:
+        db.add(DataVersion(key=key, version=1))
+    else:
+        row.version += 1
+
+def get_version(db, key: str) -> int:
+    return int(db.execute(select(DataVersion.version).where(DataVersion.key == key)).scalar() or 0)
+
+_snapshots: dict[str, list] = {}
+
+class VersionedSnapshot:
+    """
+    Process-wide value built by `loader(db, version)` and rebuilt when `key`'s data version moves.
+    The version is re-read at most every `recheck_s` seconds, or on the next get() after mark_stale(key).
+    """
+    def __init__(self, key: str, loader, recheck_s=lambda: settings.SKILL_GRAPH_RELOAD_SECONDS):
+        import threading
+        self.key, self._loader, self._recheck_s = key, loader, recheck_s
+        self._value, self._version, self._checked_at, self._stale = None, None, 0.0, True
+        self._lock = threading.Lock()
+        _snapshots.setdefault(key, []).append(self)
+
+    def _fresh(self) -> bool:
+        import time
+        return (self._value is not None and not self._stale
+                and time.monotonic() - self._checked_at < self._recheck_s())
+
+    def get(self):
+        import time
+        if self._fresh():
+            return self._value
+        with self._lock:
+            if self._fresh():
+                return self._value
+            self._stale = False
+            with ReadSession() as db:
+                try:
+                    version = get_version(db, self.key)
+                except Exception:   # data_versions not created yet (init_db not run)
+                    version = 0
+                if self._value is None or version != self._version:
+                    self._value, self._version = self._loader(db, version), version
+            self._checked_at = time.monotonic()
+            return self._value
+
+def mark_stale(key: str):
+    """Make every snapshot of `key` re-check its version on next use (call after committing a bump)."""
+    for snap in _snapshots.get(key, []):
+        snap._stale = True
+
 def get_or_none_question_meta(db, question_id: int) -> Optional[QuestionMeta]:
     return db.query(QuestionMeta).filter_by(question_id=question_id).one_or_none()
 
+def question_meta_by_id(db, ids: Iterable[int]) -> dict[int, dict]:
+    """{question_id: {type, difficulty, evaluation_rubric}} for the ids that are classified (chunked IN queries)."""
+    out: dict[int, dict] = {}
+    for chunk in _chunks(list(dict.fromkeys(ids))):
+        for qid, qtype, diff, rj in db.execute(
+            select(QuestionMeta.question_id, QuestionMeta.qtype, QuestionMeta.difficulty, QuestionMeta.rubric_json)
+            .where(QuestionMeta.question_id.in_(chunk))
+        ).all():
+            try: rubric = json.loads(rj or "{}")
+            except Exception: rubric = {}
+            out[qid] = {"type": qtype, "difficulty": diff, "evaluation_rubric": rubric}
+    return out
+
 def upsert_question_meta(db, question_id: int, qtype: str, difficulty: str, rubric: dict):
     jm = json.dumps(rubric, ensure_ascii=False)
     qm = db.query(QuestionMeta).filter_by(question_id=question_id).one_or_none()
@@ -386,7 +846,77 @@ def upsert_question_meta(db, question_id: int, qtype: str, difficulty: str, rubr
     else:
         qm = QuestionMeta(question_id=question_id, qtype=qtype, difficulty=difficulty, rubric_json=jm)
         db.add(qm)
+    db.flush()
+    refresh_question_summaries(db, [question_id])
     db.commit()
     return qm
 
 
+
+def bulk_upsert_question_meta(db, rows: list[dict]):
+    """rows: {question_id, qtype, difficulty, rubric (dict)}; one ON CONFLICT statement, no commit."""
+    now = datetime.utcnow()
+    bulk_upsert(db, QuestionMeta.__table__,
+                [{"question_id": r["question_id"], "qtype": r["qtype"], "difficulty": r["difficulty"],
+                  "rubric_json": json.dumps(r["rubric"], ensure_ascii=False), "updated_at": now} for r in rows],
+                keys=["question_id"], update_cols=["qtype", "difficulty", "rubric_json", "updated_at"])
+    refresh_question_summaries(db, [r["question_id"] for r in rows])
+
+VECTORS_VERSION_KEY = "question_vectors"   # bumped when stored vectors are rewritten in place (not on inserts)
+
+def bulk_upsert_question_vectors(db, pairs: Iterable[Tuple[int, list[float]]]):
+    """(question_id, embedding) pairs; one ON CONFLICT statement, no commit."""
+    pairs = list(pairs)
+    now = datetime.utcnow()
+    for chunk in _chunks([qid for qid, _ in pairs]):
+        if db.execute(select(QuestionVector.id).where(QuestionVector.question_id.in_(chunk)).limit(1)).first():
+            bump_version(db, VECTORS_VERSION_KEY)     # cached vector indexes must reload
+            break
+    bulk_upsert(db, QuestionVector.__table__,
+                [{"question_id": qid, "dim": len(v), "embedding_json": json.dumps(v), "updated_at": now}
+                 for qid, v in pairs],
+                keys=["question_id"], update_cols=["dim", "embedding_json", "updated_at"])
+
+# --- Assembled interview packages, keyed by a fingerprint of their inputs (generation/package_cache.py) ---
+class PackageCache(Base):
+    __tablename__ = "package_cache"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(64), unique=True)       # sha256(role version, params, seed)
+    role_id: Mapped[int] = mapped_column(Integer, index=True)
+    role_version: Mapped[int] = mapped_column(Integer, default=0)
+    corpus_mark: Mapped[int] = mapped_column(Integer, default=0)             # max(questions.id) when built
+    checked_mark: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)   # questions counted up to here
+    new_relevant: Mapped[int] = mapped_column(Integer, default=0)            # role-relevant ones past corpus_mark
+    payload_json: Mapped[str] = mapped_column(Text)                         # {"package": [...], "stats": {...}}
+    build_ms: Mapped[float] = mapped_column(Float, default=0.0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+def get_package_cache(db, fingerprints: Iterable[str]) -> dict[str, PackageCache]:
+    out: dict[str, PackageCache] = {}
+    for chunk in _chunks(list(dict.fromkeys(fingerprints))):
+        out.update({r.fingerprint: r for r in db.execute(
+            select(PackageCache).where(PackageCache.fingerprint.in_(chunk))).scalars()})
+    return out
+
+def put_package_cache(db, rows: list[dict]):
+    """rows: {fingerprint, role_id, role_version, corpus_mark, payload (dict), build_ms}; drops older role versions. No commit."""
+    now = datetime.utcnow()
+    for r in rows:
+        db.execute(delete(PackageCache).where(PackageCache.role_id == r["role_id"],
+                                              PackageCache.role_version < r["role_version"]))
+    bulk_upsert(db, PackageCache.__table__,
+                [{"fingerprint": r["fingerprint"], "role_id": r["role_id"], "role_version": r["role_version"],
+                  "corpus_mark": r["corpus_mark"], "checked_mark": r["corpus_mark"], "new_relevant": 0,
+                  "payload_json": json.dumps(r["payload"], ensure_ascii=False),
+                  "build_ms": float(r["build_ms"]), "created_at": now} for r in rows],
+                keys=["fingerprint"], update_cols=["role_version", "corpus_mark", "checked_mark", "new_relevant",
+                                                   "payload_json", "build_ms", "created_at"])
+
+def advance_package_cache(db, fingerprint: str, corpus_mark: int, checked_mark: int, new_relevant: int):
+    """
+    Record how far past its corpus mark an entry has been checked (so the next lookup resumes there);
+    a no-op if the entry was rebuilt meanwhile. No commit.
+    """
+    db.execute(update(PackageCache)
+               .where(PackageCache.fingerprint == fingerprint, PackageCache.corpus_mark == corpus_mark)
+               .values(checked_mark=checked_mark, new_relevant=new_relevant))
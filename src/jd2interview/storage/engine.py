@@ -0,0 +1,112 @@
+# src/jd2interview/storage/engine.py
+"""
+Engine profiles: how `storage/db.py` builds its SQLAlchemy engine for a given URL.
+
+    DB_PROFILE=production   SQLite: WAL, synchronous=NORMAL, mmap, larger page cache, busy_timeout
+                            (applied on every new connection) and a sized QueuePool.
+                            Postgres: pool size / overflow / recycle and a server-side statement_timeout.
+    DB_PROFILE=compat       driver defaults (the old behaviour; rollback journal, no busy handling).
+
+Individual SQLite pragmas can be overridden with DB_SQLITE_PRAGMAS='{"synchronous": "FULL"}'.
+
+`readonly=True` builds the reader pool used by `db.ReadSession`: SQLite files are opened with
+`mode=ro` (each read transaction sees a WAL snapshot, never the writer's lock), Postgres sessions
+default to read-only transactions.
+"""
+from __future__ import annotations
+from typing import Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import make_url
+
+from jd2interview.utils.config import settings
+
+# pragma → value, applied in this order on connect (journal_mode first: it is a property of the file)
+SQLITE_PRODUCTION_PRAGMAS: Dict[str, object] = {
+    "journal_mode": "WAL",          # readers never block the writer and vice versa
+    "synchronous": "NORMAL",        # durable at checkpoints; safe with WAL, far fewer fsyncs than FULL
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,       # negative = KiB → 64 MiB page cache per connection
+    "temp_store": "MEMORY",
+}
+
+PROFILES = ("production", "compat")
+
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+def readonly_url(db_url: str) -> str:
+    """SQLite file URL → read-only URI form (`file:...?mode=ro&uri=true`); other URLs unchanged."""
+    url = make_url(db_url)
+    if url.get_backend_name() != "sqlite" or _is_memory_sqlite(url) or url.query.get("mode"):
+        return db_url
+    path = url.database if url.database.startswith("file:") else f"file:{url.database}"
+    return str(url.set(database=path, query={**url.query, "mode": "ro", "uri": "true"}))
+
+def sqlite_pragmas(profile: str | None = None, readonly: bool = False) -> Dict[str, object]:
+    """Effective per-connection pragmas for a SQLite engine under `profile`."""
+    profile = profile or settings.DB_PROFILE
+    if profile == "compat":
+        return {}
+    pragmas = dict(SQLITE_PRODUCTION_PRAGMAS)
+    pragmas["busy_timeout"] = settings.DB_BUSY_TIMEOUT_MS
+    pragmas.update(settings.DB_SQLITE_PRAGMAS or {})
+    if readonly:                    # the journal mode belongs to the writer; readers only query
+        pragmas.pop("journal_mode", None)
+        pragmas["query_only"] = "ON"
+    return pragmas
+
+def _install_sqlite_pragmas(engine: Engine, pragmas: Dict[str, object]):
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        try:
+            for k, v in pragmas.items():
+                cur.execute(f"PRAGMA {k}={v}")
+        finally:
+            cur.close()
+
+def engine_options(db_url: str, profile: str | None = None, readonly: bool = False) -> dict:
+    """create_engine() keyword arguments for `db_url` under `profile`."""
+    profile = profile or settings.DB_PROFILE
+    if profile not in PROFILES:
+        raise ValueError(f"unknown DB_PROFILE {profile!r} (expected one of {', '.join(PROFILES)})")
+    url = make_url(db_url)
+    opts: dict = {"future": True, "pool_pre_ping": True}
+    if profile == "compat":
+        return opts
+    size = settings.DB_READ_POOL_SIZE if readonly else settings.DB_POOL_SIZE
+    backend = url.get_backend_name()
+    if backend == "sqlite":
+        if _is_memory_sqlite(url):
+            return opts                 # single-connection pool; nothing to size or tune
+        # the driver-level timeout is sqlite3's own busy handler (seconds); the pragma covers other drivers
+        opts["connect_args"] = {"timeout": settings.DB_BUSY_TIMEOUT_MS / 1000.0, "check_same_thread": False}
+        opts.update(pool_size=size, max_overflow=settings.DB_MAX_OVERFLOW, pool_timeout=settings.DB_POOL_TIMEOUT)
+        opts["pool_pre_ping"] = False   # local file: a dead connection is not a thing
+        return opts
+    opts.update(pool_size=size, max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT, pool_recycle=settings.DB_POOL_RECYCLE)
+    if backend == "postgresql":
+        pg = [f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"] if settings.DB_STATEMENT_TIMEOUT_MS > 0 else []
+        if readonly:
+            pg.append("-c default_transaction_read_only=on")
+        if pg:
+            opts["connect_args"] = {"options": " ".join(pg)}
+    return opts
+
+def build_engine(db_url: str, profile: str | None = None, readonly: bool = False) -> Engine:
+    """Engine for `db_url` with the profile's pool options and (SQLite) connect-time pragmas."""
+    profile = profile or settings.DB_PROFILE
+    if readonly:
+        db_url = readonly_url(db_url)
+    eng = create_engine(db_url, **engine_options(db_url, profile, readonly=readonly))
+    if eng.dialect.name == "sqlite" and not _is_memory_sqlite(eng.url):
+        _install_sqlite_pragmas(eng, sqlite_pragmas(profile, readonly=readonly))
+    print(f"[db] {'reader' if readonly else 'engine'} {eng.dialect.name} profile={profile} pool={type(eng.pool).__name__}")
+    return eng
@@ -0,0 +1,111 @@
+# src/jd2interview/storage/migrations.py
+"""
+Versioned schema migrations for databases created by earlier releases.
+
+`init_db()` runs `create_all()` (new tables, with the indexes declared in db.py) and then `migrate()`,
+which applies every migration newer than the highest version in `schema_migrations`, each in its own
+transaction. A fresh database already has what `create_all()` built, so migrations must be
+idempotent (checkfirst / IF NOT EXISTS).
+
+    python -m jd2interview.storage.migrations      # apply pending migrations, print the schema version
+
+Adding one: append a function decorated with `@migration(<next version>, "<what it does>")`.
+"""
+from __future__ import annotations
+from typing import Callable, List, Tuple
+
+from sqlalchemy import Index, func, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+from jd2interview.storage.db import Base, SchemaMigration
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = []
+
+def migration(version: int, name: str):
+    def register(fn: Callable[[Connection], None]):
+        assert all(v != version for v, _, _ in MIGRATIONS), f"duplicate migration version {version}"
+        MIGRATIONS.append((version, name, fn))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return register
+
+def _declared_index(table: str, name: str) -> Index:
+    return next(ix for ix in Base.metadata.tables[table].indexes if ix.name == name)
+
+def _add_columns(conn: Connection, table: str, names: Tuple[str, ...]):
+    """ALTER TABLE ADD COLUMN for declared columns the table does not have yet."""
+    from sqlalchemy import inspect
+    have = {c["name"] for c in inspect(conn).get_columns(table)}
+    for col in Base.metadata.tables[table].c:
+        if col.name in names and col.name not in have:
+            ddl = col.type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {col.name} {ddl}"))
+
+
+# ---------- migrations ----------
+@migration(1, "composite indexes for browse / retrieval / answer lookups")
+def _hot_path_indexes(conn: Connection):
+    # the unique (question_id, external_id) index needs older duplicate answers gone first (keep the newest)
+    conn.execute(text(
+        "DELETE FROM answers WHERE id NOT IN (SELECT MAX(id) FROM answers GROUP BY question_id, external_id)"
+    ))
+    for table, name in (("questions", "ix_questions_score_id"), ("questions", "ix_questions_source_score"),
+                        ("question_meta", "ix_qmeta_type_diff_qid"), ("answers", "ix_answers_best"),
+                        ("answers", "uq_answers_qid_extid")):
+        _declared_index(table, name).create(conn, checkfirst=True)
+    if conn.dialect.name == "sqlite":
+        conn.execute(text("ANALYZE"))    # give the planner row counts for the new indexes
+
+
+@migration(2, "question_summary read model backfill")
+def _question_summary(conn: Connection):
+    from sqlalchemy.orm import Session
+    from jd2interview.storage.db import QuestionSummary, refresh_question_summaries
+    QuestionSummary.__table__.create(conn, checkfirst=True)
+    for ix in QuestionSummary.__table__.indexes:
+        ix.create(conn, checkfirst=True)
+    with Session(bind=conn) as db:
+        refresh_question_summaries(db)
+        db.flush()
+
+
+@migration(3, "job owner + heartbeat columns")
+def _job_heartbeat(conn: Connection):
+    _add_columns(conn, "jobs", ("owner", "heartbeat_at"))
+
+
+@migration(4, "package cache check watermark")
+def _package_cache_watermark(conn: Connection):
+    _add_columns(conn, "package_cache", ("checked_mark", "new_relevant"))
+
+
+# ---------- runner ----------
+def current_version(conn: Connection) -> int:
+    return conn.execute(select(func.max(SchemaMigration.version))).scalar() or 0
+
+def migrate(engine: Engine) -> int:
+    """Apply pending migrations in order; returns the resulting schema version."""
+    SchemaMigration.__table__.create(engine, checkfirst=True)
+    with engine.connect() as conn:
+        version = current_version(conn)
+    for v, name, fn in MIGRATIONS:
+        if v <= version:
+            continue
+        try:
+            with engine.begin() as conn:
+                fn(conn)
+                conn.execute(SchemaMigration.__table__.insert().values(version=v, name=name))
+        except IntegrityError:      # another process recorded it first; its transaction did the work
+            version = v
+            continue
+        print(f"[db] migration {v} applied: {name}")
+        version = v
+    return version
+
+
+if __name__ == "__main__":
+    from jd2interview.storage.db import get_engine, init_db
+    init_db()
+    with get_engine().connect() as c:
+        print(f"[db] schema version {current_version(c)}")
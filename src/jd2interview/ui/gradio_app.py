@@ -1,46 +1,47 @@
 # src/jd2interview/ui/gradio_app.py
 from __future__ import annotations
 import json
+import time
 from pathlib import Path
 from typing import List, Dict, Optional
 from collections import Counter
 
 import gradio as gr
-from sqlalchemy import select, desc
-import markdown as _md
-import bleach
+from functools import lru_cache
+from sqlalchemy import select
 from html import escape as _esc
 
-from jd2interview.utils.config import settings
-from jd2interview.storage.db import (
-    init_db, SessionLocal, Question, QuestionMeta, Answer
-)
-from jd2interview.parsing.extract import extract_structured
-from jd2interview.skills.service import build_and_store_skill_graph
-from jd2interview.crawl.role_aware import crawl_for_role_stream
-from jd2interview.enrich.metadata import classify_role_questions_stream
-from jd2interview.retrieval.availability import fetch_typed_questions_for_role
-from jd2interview.generation.llm_qna import generate_qna_for_role
-from jd2interview.skills.viz import  graph_html_iframe
-from jd2interview.skills.query import build_role_skill_graph
+from jd2interview.utils.config import settings, log_settings
+from jd2interview.storage.db import init_db, ReadSession, QuestionSummary, SUMMARY_LIST_COLUMNS, summary_items
+from jd2interview.retrieval.availability import typed_summaries_for_role
+from jd2interview.jobs.runner import submit_job, get_job, recent_jobs, get_runner, FINAL_STATES
+from jd2interview.utils.metrics import role_cost_summary, export_jsonl, prometheus_text
+from jd2interview.utils.tracing import span, traced, recent_traces, render_tree
+# Parsing / skill-graph / viz modules (langchain, openai, markdown, bleach) are imported
+# inside the handlers that need them, so the UI process starts without loading them.
 
 QUESTION_TYPES = ["All", "Behavioral", "Technical", "Coding", "System Design"]
 DIFFICULTIES   = ["All", "Easy", "Medium", "Hard"]
 SOURCE_CHOICES = ["Web only", "LLM only", "Web + LLM"]
 
-_ALLOWED_TAGS = bleach.sanitizer.ALLOWED_TAGS.union({
-    "p","pre","code","blockquote","hr","br",
-    "h1","h2","h3","h4","h5","h6","ul","ol","li",
-    "table","thead","tbody","tr","th","td","em","strong","a","span","div"
-})
-_ALLOWED_ATTRS = {
-    **bleach.sanitizer.ALLOWED_ATTRIBUTES,
-    "a": ["href","title","target","rel"],
-    "span": ["class"],
-    "div": ["class"],
-    "code": ["class"],
-    "pre": ["class"],
-}
+@lru_cache(maxsize=1)
+def _sanitizer():
+    """(bleach, allowed_tags, allowed_attrs) — built on first render."""
+    import bleach
+    tags = bleach.sanitizer.ALLOWED_TAGS.union({
+        "p","pre","code","blockquote","hr","br",
+        "h1","h2","h3","h4","h5","h6","ul","ol","li",
+        "table","thead","tbody","tr","th","td","em","strong","a","span","div"
+    })
+    attrs = {
+        **bleach.sanitizer.ALLOWED_ATTRIBUTES,
+        "a": ["href","title","target","rel"],
+        "span": ["class"],
+        "div": ["class"],
+        "code": ["class"],
+        "pre": ["class"],
+    }
+    return bleach, tags, attrs
 
 # ---------- helpers ----------
 def read_text_file(file_path: str) -> str:
@@ -54,76 +55,50 @@ def _sources_for_mode(mode: str):
         return ["generated"]
     return None  # both
 
+def _typed_summaries(db, qtype: Optional[str] = None, sources: Optional[List[str]] = None, limit: int = 10000):
+    q = select(*SUMMARY_LIST_COLUMNS).where(QuestionSummary.qtype.is_not(None))
+    if qtype:
+        q = q.where(QuestionSummary.qtype == qtype)
+    if sources:
+        q = q.where(QuestionSummary.source.in_(sources))
+    q = q.order_by(QuestionSummary.score.desc(), QuestionSummary.question_id.desc()).limit(limit)
+    return db.execute(q).all()
+
 def _fetch_all_typed_questions(
     qtype: Optional[str] = None,
     sources: Optional[List[str]] = None,
     limit: int = 10000,
 ) -> List[Dict]:
-    out: List[Dict] = []
-    with SessionLocal() as db:
-        q = (
-            select(Question, QuestionMeta)
-            .join(QuestionMeta, QuestionMeta.question_id == Question.id)
-            .order_by(Question.score.desc(), Question.id.desc())
-            .limit(limit)
-        )
-        for Q, M in db.execute(q).all():
-            if qtype and M.qtype != qtype:
-                continue
-            if sources and Q.source not in sources:
-                continue
-            try:
-                rubric = json.loads(M.rubric_json or "{}")
-            except Exception:
-                rubric = {}
-            try:
-                tags = json.loads(Q.tags_json or "[]")
-            except Exception:
-                tags = []
-            ans = db.execute(
-                select(Answer.body_markdown)
-                .where(Answer.question_id == Q.id)
-                .order_by(desc(Answer.is_accepted), desc(Answer.score))
-                .limit(1)
-            ).scalar_one_or_none()
-            out.append({
-                "id": Q.id,
-                "question": (Q.title or "") + (
-                    "\n\n" + (Q.body_markdown or Q.body_html or "")
-                    if (Q.body_markdown or Q.body_html) else ""
-                ),
-                "type": M.qtype,
-                "difficulty": M.difficulty,
-                "evaluation_rubric": rubric,
-                "url": Q.url,
-                "tags": tags,
-                "source": Q.source,
-                "answer": ans or "",
-            })
-    return out
+    with ReadSession() as db:
+        return summary_items(db, _typed_summaries(db, qtype=qtype, sources=sources, limit=limit), with_answer=True)
 
-def _current_items_for_view(state, source_mode, qtype, diff):
+def _current_rows_for_view(db, state, source_mode, qtype, diff):
+    """(summary rows, role view?) for the current filters; listing and counting read only question_summary."""
     sources = _sources_for_mode(source_mode)
-    if state and state.get("role_id"):
-        role_id = int(state["role_id"])
-        if sources == ["generated"]:  # LLM only → show global generated (not role-filtered)
-            items = _fetch_all_typed_questions(qtype=None, sources=sources)
-        else:
-            items = fetch_typed_questions_for_role(role_id=role_id, qtype=None, sources=sources)
-    else:
-        items = _fetch_all_typed_questions(qtype=None, sources=sources)
-
+    role_view = bool(state and state.get("role_id")) and sources != ["generated"]
+    if role_view:
+        rows = typed_summaries_for_role(db, int(state["role_id"]), sources=sources)
+    else:  # no role, or LLM only → global generated (not role-filtered)
+        rows = _typed_summaries(db, sources=sources)
     if qtype != "All":
-        items = [q for q in items if q.get("type") == qtype]
+        rows = [r for r in rows if r.qtype == qtype]
     if diff != "All":
-        items = [q for q in items if q.get("difficulty") == diff]
-    return items
+        rows = [r for r in rows if r.difficulty == diff]
+    return rows, role_view
 
+@traced("ui.fetch_items")
+def _current_items_for_view(state, source_mode, qtype, diff):
+    with ReadSession() as db:
+        rows, role_view = _current_rows_for_view(db, state, source_mode, qtype, diff)
+        return summary_items(db, rows, with_answer=not role_view)
+
+@traced("ui.counts")
 def _counts_label(state, source_mode: str, difficulty: str = "All") -> str:
     try:
-        items = _current_items_for_view(state, source_mode, qtype="All", diff=difficulty)
-        c = Counter((q.get("type") or "Unknown") for q in items)
-        total = len(items)
+        with ReadSession() as db:
+            rows, _ = _current_rows_for_view(db, state, source_mode, qtype="All", diff=difficulty)
+        c = Counter((r.qtype or "Unknown") for r in rows)
+        total = len(rows)
         beh = c.get("Behavioral", 0)
         tech = c.get("Technical", 0)
         code = c.get("Coding", 0)
@@ -146,20 +121,23 @@ def _current_count_md(items) -> str:
     return f"**Currently showing:** {len(items or [])}"
 
 def _md_to_html(text: str) -> str:
+    import markdown as _md
+    bleach, tags, attrs = _sanitizer()
     html = _md.markdown(text or "", extensions=["fenced_code", "tables", "codehilite"])
-    return bleach.clean(html, tags=_ALLOWED_TAGS, attributes=_ALLOWED_ATTRS, strip=True)
+    return bleach.clean(html, tags=tags, attributes=attrs, strip=True)
 
+@traced("ui.skill_graph")
 def on_show_skill_graph(state, top_k, neighbors):
     if not isinstance(state, dict) or not state.get("role_id"):
         return "<em>Parse a JD first.</em>", {}
     role_id = int(state["role_id"])
+    from jd2interview.skills.viz import role_graph_view
     try:
-        g = build_role_skill_graph(role_id, top_k=int(top_k or 50), include_neighbors=int(neighbors or 30))
-        html = graph_html_iframe(g)      # <— use iframe renderer
-        return html, g
+        return role_graph_view(role_id, top_k=int(top_k or 50), neighbors=int(neighbors or 30))
     except Exception as e:
         return f"<em>Failed to render graph: {e}</em>", {}
 
+@traced("ui.render_questions")
 def _render_questions_html(items) -> str:
     if not items:
         return "<em>No questions match the current filters.</em>"
@@ -177,6 +155,7 @@ def _render_questions_html(items) -> str:
     .meta dd{margin:0 0 6px 0}
     </style>
     """
+    bleach = _sanitizer()[0]
     parts = [css]
     for i, q in enumerate(items, 1):
         question_md = q.get("question") or ""
@@ -249,10 +228,13 @@ def _render_parsed_html(preview: dict) -> str:
     """
 
 # ---------- parsing core & events ----------
+@traced("ui.parse")
 def parse_core(jd_text: str, source_mode: str, qtype: str, diff: str):
     if not (jd_text or "").strip():
         return "<em>No JD text provided.</em>", None, "<em>No items</em>", "_", "_", "JD"
 
+    from jd2interview.parsing.extract import extract_structured
+    from jd2interview.skills.service import build_and_store_skill_graph
     try:
         init_db()
         parsed = extract_structured(jd_text)
@@ -326,44 +308,81 @@ def on_parse_text_click(jd_text, source_mode, qtype, diff):
 
 #     yield {"status": "Done"}
 
+def _job_status_line(job: Dict) -> str:
+    pct = int(round(100 * float(job.get("progress") or 0.0)))
+    return f"**Job #{job['id']}** · {job['status']} · {pct}% — {job.get('message') or ''}"
+
 def on_generate_questions(state, source_mode):
+    """Submit a background job for the role and stream its progress (the work runs in the job pool)."""
     if not state or not state.get("role_id"):
         yield {"status": "Parse a JD first to scope results to the job."}
         return
 
     role_id = int(state["role_id"])
-
-    if source_mode in ("Web only", "Web + LLM"):
-        # crawl (role-aware) → classify
-        for msg in crawl_for_role_stream(role_id):
-            yield {"status": f"[crawl] {msg}"}
-        for msg in classify_role_questions_stream(role_id, batch_size=25, max_items=None):
-            yield {"status": f"[classify] {msg}"}
-
-    if source_mode in ("LLM only", "Web + LLM"):
-        # generate and persist
-        for typ, cnt in settings.LLM_GEN_COUNTS.items():
-            if int(cnt) > 0:
-                _ = generate_qna_for_role(role_id, target_type=typ, count=int(cnt), persist=True)
-        yield {"status": f"[llm] Generated: {settings.LLM_GEN_COUNTS}"}
-
-    yield {"status": "Done"}
+    job_id = submit_job("generate_questions", role_id=role_id, params={"source_mode": source_mode})
+
+    last = None
+    while True:
+        job = get_job(job_id)
+        if job is None:
+            yield {"status": f"Job #{job_id} not found."}
+            return
+        line = _job_status_line(job)
+        if line != last:
+            last = line
+            yield {"status": line, "job": job}
+        if job["status"] in FINAL_STATES:
+            if job["status"] == "failed":
+                yield {"status": f"**Error:** {job.get('message') or job.get('error')}", "job": job}
+            return
+        time.sleep(settings.JOB_POLL_SECONDS)
+
+def _render_jobs_md(limit: int = 15) -> str:
+    try:
+        jobs = recent_jobs(limit=limit)
+    except Exception as e:
+        return f"_Jobs unavailable: {e}_"
+    if not jobs:
+        return "_No jobs yet._"
+    rows = ["| # | kind | role | status | progress | last message |", "|---|---|---|---|---|---|"]
+    for j in jobs:
+        msg = (j.get("message") or "").replace("|", "/").replace("\n", " ")[:80]
+        rows.append(f"| {j['id']} | {j['kind']} | {j['role_id'] or '-'} | {j['status']} | "
+                    f"{int(round(100 * j['progress']))}% | {msg} |")
+    return "\n".join(rows)
     
 def _generate_and_refresh(state, source_mode, qtype, diff):
+    from jd2interview.jobs.handlers import NEW_ITEM_PREFIX
+    next_render = 0.0
     try:
         for msg in on_generate_questions(state, source_mode):
-            yield gr.update(), msg.get("status", ""), "", ""
+            streamed = ((msg.get("job") or {}).get("message") or "").startswith(NEW_ITEM_PREFIX)
+            if streamed and time.monotonic() >= next_render:
+                # streamed generation persists questions one by one: show what exists so far, but re-render
+                # the (possibly large) list at most every UI_STREAM_REFRESH_SECONDS, counted from the end
+                # of the previous render so slow renders can't pile up behind the poll loop
+                items = _current_items_for_view(state, source_mode, qtype, diff)
+                html = _render_questions_html(items)
+                next_render = time.monotonic() + settings.UI_STREAM_REFRESH_SECONDS
+                yield html, msg.get("status", ""), gr.update(), _current_count_md(items)
+            elif streamed:
+                yield gr.update(), msg.get("status", ""), gr.update(), gr.update()
+            else:
+                yield gr.update(), msg.get("status", ""), "", ""
     except Exception as e:
         yield gr.update(), f"**Error:** {e}", "", ""
     try:
-        items  = _current_items_for_view(state, source_mode, qtype, diff)
-        html   = _render_questions_html(items)
-        counts = _counts_label(state, source_mode, diff)
-        shown  = _current_count_md(items)
+        # computed before the yield: spans must not stay open across it
+        with span("ui.refresh_after_generate", source_mode=source_mode):
+            items  = _current_items_for_view(state, source_mode, qtype, diff)
+            html   = _render_questions_html(items)
+            counts = _counts_label(state, source_mode, diff)
+            shown  = _current_count_md(items)
         yield html, "Refreshed.", counts, shown
     except Exception as e:
         yield f"<em>Failed to refresh: {e}</em>", "Error", "_", "_"
 
+@traced("ui.filter")
 def on_filter_change_with_counts(state, source_mode, qtype, diff):
     try:
         items  = _current_items_for_view(state, source_mode, qtype, diff)
@@ -374,6 +393,7 @@ def on_filter_change_with_counts(state, source_mode, qtype, diff):
     except Exception as e:
         return f"<em>Failed to load items: {e}</em>", "_", "**Currently showing:** 0"
 
+@traced("ui.initial_load")
 def initial_load(source_mode, qtype, diff):
     try:
         items  = _current_items_for_view(None, source_mode, qtype, diff)
@@ -384,6 +404,77 @@ def initial_load(source_mode, qtype, diff):
     except Exception as e:
         return f"<em>Failed to load items: {e}</em>", "_", "**Currently showing:** 0"
 
+def _render_cost_md(state) -> str:
+    """Per-stage token / cost table for the current role (counters are per process)."""
+    role_id = int(state["role_id"]) if isinstance(state, dict) and state.get("role_id") else None
+    summary = role_cost_summary(role_id)
+    overall = role_cost_summary(None)["total"]
+    scope = f"role #{role_id}" if role_id is not None else "all roles"
+    if not summary["stages"]:
+        return f"_No LLM usage recorded yet for {scope}._"
+    rows = [f"**LLM usage — {scope}** (this process)", "",
+            "| stage | calls | prompt tok | completion tok | retries | cache hits | latency s | cost $ |",
+            "|---|---|---|---|---|---|---|---|"]
+    for stage, s in sorted(summary["stages"].items(), key=lambda kv: -kv[1]["cost_usd"]):
+        rows.append(f"| {stage} | {int(s['calls'])} | {int(s['prompt_tokens'])} | {int(s['completion_tokens'])} | "
+                    f"{int(s['retries'])} | {int(s['cache_hits'])} | {s['latency_s']:.1f} | {s['cost_usd']:.4f} |")
+    t = summary["total"]
+    rows.append(f"| **total** | {int(t['calls'])} | {int(t['prompt_tokens'])} | {int(t['completion_tokens'])} | "
+                f"{int(t['retries'])} | {int(t['cache_hits'])} | {t['latency_s']:.1f} | **{t['cost_usd']:.4f}** |")
+    rows.append(f"\n_All roles so far: ${overall['cost_usd']:.4f} over {int(overall['calls'])} calls._")
+    return "\n".join(rows)
+
+def on_export_metrics():
+    try:
+        path = export_jsonl()
+        prom = Path(path).with_suffix(".prom")
+        prom.write_text(prometheus_text(), encoding="utf-8")
+        return f"Exported → `{path}` and `{prom}`"
+    except Exception as e:
+        return f"_Export failed: {e}_"
+
+# ---------- debug: traces ----------
+_TRACE_SCOPES = {"UI requests": "ui.", "Background jobs": "job.", "All": None}
+
+def _package_status_md(out: Dict, elapsed_ms: float) -> str:
+    c, st = out.get("cache") or {}, out.get("stats") or {}
+    badge = "🟢 **cached**" if c.get("status") == "cached" else "🔄 **rebuilt**"
+    fp = f" · fingerprint `{c['fingerprint'][:10]}`" if c.get("fingerprint") else ""
+    return (f"{badge} · served in {elapsed_ms:.0f} ms (build took {c.get('build_ms', 0):.0f} ms, {c.get('built_at', '—')})"
+            f"{fp} · {len(out.get('package') or [])}/{st.get('requested_total', '—')} questions, "
+            f"{st.get('candidates', 0)} candidates, seed {st.get('seed', '—')}")
+
+@traced("ui.build_package")
+def on_build_package(state, total, seed, force):
+    """Assemble (or fetch the stored) interview package for the current role."""
+    if not isinstance(state, dict) or not state.get("role_id"):
+        return "<em>Parse a JD first.</em>", "_No role yet._"
+    from jd2interview.generation.package import build_interview_package
+    t0 = time.perf_counter()
+    try:
+        out = build_interview_package(int(state["role_id"]), total_q=int(total), seed=int(seed or 0),
+                                      force=bool(force))
+    except Exception as e:
+        return f"<em>Package build failed: {_esc(str(e))}</em>", "_failed_"
+    return _render_questions_html(out["package"]), _package_status_md(out, (time.perf_counter() - t0) * 1000.0)
+
+def _trace_label(root) -> str:
+    return f"{root.name} · {root.duration_ms:.0f} ms · {root.trace_id[:8]}"
+
+def on_refresh_traces(scope: str):
+    """Refresh the recent-trace dropdown and show the newest trace tree."""
+    roots = recent_traces(_TRACE_SCOPES.get(scope), limit=20)
+    labels = [_trace_label(r) for r in roots]
+    tree = render_tree(roots[0] if roots else None)
+    return gr.update(choices=labels, value=labels[0] if labels else None), f"```text\n{tree}\n```"
+
+def on_select_trace(label: Optional[str]):
+    if not label:
+        return "_No trace selected._"
+    tid = label.rsplit("· ", 1)[-1].strip()
+    root = next((r for r in recent_traces(None, limit=50) if r.trace_id.startswith(tid)), None)
+    return f"```text\n{render_tree(root)}\n```"
+
 # ---------- UI ----------
 def build_ui():
     init_db()
@@ -470,6 +561,37 @@ def build_ui():
             status_md      = gr.Markdown("")       # streaming crawl/classify/llm logs
             questions_html = gr.HTML(label="Questions")
 
+            # --- Interview package panel ---
+            with gr.Accordion("Interview package", open=False):
+                with gr.Row():
+                    pkg_total_in = gr.Slider(3, 30, value=10, step=1, label="Questions")
+                    pkg_seed_in  = gr.Number(value=settings.PACKAGE_SEED, precision=0, label="Seed")
+                    pkg_force_in = gr.Checkbox(value=False, label="Force rebuild")
+                    pkg_btn      = gr.Button("Build package")
+                pkg_status_md = gr.Markdown("")    # cached / rebuilt indicator
+                pkg_html      = gr.HTML(label="Package")
+
+            # --- Background jobs panel ---
+            with gr.Accordion("Background jobs", open=False):
+                jobs_md = gr.Markdown("")
+                refresh_jobs_btn = gr.Button("Refresh jobs")
+
+            # --- LLM usage / cost panel ---
+            with gr.Accordion("LLM usage & cost", open=False):
+                cost_md = gr.Markdown("")
+                with gr.Row():
+                    refresh_cost_btn = gr.Button("Refresh usage")
+                    export_metrics_btn = gr.Button("Export metrics (JSONL + Prometheus)")
+                export_md = gr.Markdown("")
+
+            # --- Tracing debug panel ---
+            with gr.Accordion("Debug: last request trace", open=False):
+                with gr.Row():
+                    trace_scope = gr.Radio(list(_TRACE_SCOPES), value="UI requests", label="Scope")
+                    trace_dd = gr.Dropdown(choices=[], label="Recent traces", interactive=True)
+                    refresh_trace_btn = gr.Button("Show last trace")
+                trace_md = gr.Markdown("")
+
             # --- Skill Graph panel ---
             with gr.Accordion("Skill Graph (role)", open=False):
                 with gr.Row():
@@ -483,6 +605,7 @@ def build_ui():
         demo.load(_update_views, inputs=nav_mode, outputs=[jd_group, q_group])
         demo.load(initial_load, inputs=[source_mode, qtype_dd, diff_dd],
                   outputs=[questions_html, counts_md, shown_md])
+        demo.load(_render_jobs_md, inputs=None, outputs=[jobs_md])
 
         # ---------------- Parse flows (with spinner + auto-nav + auto-graph) ----------------
         # Text JD
@@ -530,29 +653,49 @@ def build_ui():
         )
 
         # ---------------- Filters wiring ----------------
+        # Read-only queries: not capped by the default limit so browsing stays responsive during jobs.
         qtype_dd.change(
             on_filter_change_with_counts,
             inputs=[state, source_mode, qtype_dd, diff_dd],
             outputs=[questions_html, counts_md, shown_md],
+            concurrency_limit=None,
         )
         diff_dd.change(
             on_filter_change_with_counts,
             inputs=[state, source_mode, qtype_dd, diff_dd],
             outputs=[questions_html, counts_md, shown_md],
+            concurrency_limit=None,
         )
         source_mode.change(
             on_filter_change_with_counts,
             inputs=[state, source_mode, qtype_dd, diff_dd],
             outputs=[questions_html, counts_md, shown_md],
+            concurrency_limit=None,
         )
 
-        # ---------------- Generate (streams status; then refresh) ----------------
+        # ---------------- Generate (submits a job, polls its status; then refresh) ----------------
+        # The work runs in the job pool; this handler only polls, so it does not hold a worker slot.
         gen_btn.click(
             _generate_and_refresh,
             inputs=[state, source_mode, qtype_dd, diff_dd],
             outputs=[questions_html, status_md, counts_md, shown_md],
             queue=True,
+            concurrency_limit=None,
+        ).then(
+            _render_jobs_md, inputs=None, outputs=[jobs_md]
+        ).then(
+            _render_cost_md, inputs=[state], outputs=[cost_md]
         )
+        pkg_btn.click(on_build_package, inputs=[state, pkg_total_in, pkg_seed_in, pkg_force_in],
+                      outputs=[pkg_html, pkg_status_md], queue=True)
+        refresh_jobs_btn.click(_render_jobs_md, inputs=None, outputs=[jobs_md], concurrency_limit=None)
+        refresh_cost_btn.click(_render_cost_md, inputs=[state], outputs=[cost_md], concurrency_limit=None)
+        export_metrics_btn.click(on_export_metrics, inputs=None, outputs=[export_md])
+        refresh_trace_btn.click(on_refresh_traces, inputs=[trace_scope], outputs=[trace_dd, trace_md],
+                                concurrency_limit=None)
+        trace_scope.change(on_refresh_traces, inputs=[trace_scope], outputs=[trace_dd, trace_md],
+                           concurrency_limit=None)
+        trace_dd.input(on_select_trace, inputs=[trace_dd], outputs=[trace_md], concurrency_limit=None)
 
         # ---------------- Refresh ----------------
         refresh_btn.click(
@@ -572,10 +715,14 @@ def build_ui():
     return demo
 
 def main():
+    log_settings()
     print(f"[cfg] model={settings.OPENAI_MODEL}, key_prefix={str(settings.OPENAI_API_KEY)[:6]}…")
     print(f"[CFG] DB={settings.DB_URL}")
     print(f"[   CFG] StackExchange key present: {bool(getattr(settings, 'STACKEXCHANGE_KEY', ''))}")
     init_db()
+    resumed = get_runner().resume()
+    if resumed:
+        print(f"[jobs] resumed {len(resumed)} unfinished job(s): {resumed}")
     demo = build_ui()
     demo.queue(default_concurrency_limit=2).launch()
 
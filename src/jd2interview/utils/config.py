@@ -13,28 +13,92 @@ class Settings:
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-5-mini")
     DB_URL : str = os.getenv("DB_URL", f"sqlite:///{PROJECT_ROOT}/data/app.db")
+    # Engine profile (storage/engine.py): "production" = WAL + pragmas + sized pools, "compat" = driver defaults
+    DB_PROFILE: str = os.getenv("DB_PROFILE", "production")
+    DB_BUSY_TIMEOUT_MS: int = int(os.getenv("DB_BUSY_TIMEOUT_MS", "10000"))    # SQLite: wait for the write lock
+    DB_SQLITE_PRAGMAS = json.loads(os.getenv("DB_SQLITE_PRAGMAS", "{}"))      # per-pragma overrides
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))           # server DBs only
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))  # Postgres; 0 = none
+    # Read/write split: UI/query reads go through a separate read-only pool (a replica when DB_READ_URL is set)
+    DB_READ_SPLIT = os.getenv("DB_READ_SPLIT", "true").lower() in ("1", "true", "yes")
+    DB_READ_URL: str = os.getenv("DB_READ_URL", "")
+    DB_READ_POOL_SIZE: int = int(os.getenv("DB_READ_POOL_SIZE", "10"))
     STACKEXCHANGE_KEY: str = os.getenv("STACKEXCHANGE_KEY", "")
+    # API base URLs (point at a local replay server for offline runs / benchmarks)
+    STACKEXCHANGE_API_URL: str = os.getenv("STACKEXCHANGE_API_URL", "https://api.stackexchange.com/2.3").rstrip("/")
+    GITHUB_API_URL: str = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
 
 
     # DB_PATH: str = os.getenv("DB_PATH", "data/app.db")
     OPENAI_TIMEOUT: int = int(os.getenv("OPENAI_TIMEOUT", "90"))
     OPENAI_MAX_RETRIES: int = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+    OPENAI_MAX_CONNECTIONS: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))  # shared keep-alive pool
     
     # Crawling defaults (used by role-aware crawl button elsewhere)
     CRAWL_SITES = os.getenv("CRAWL_SITES", "stackoverflow,softwareengineering,dba,datascience,ai").split(",")
     CRAWL_PAGES = int(os.getenv("CRAWL_PAGES", "2"))
     CRAWL_PAGE_SIZE = int(os.getenv("CRAWL_PAGE_SIZE", "50"))
     CRAWL_QUERY_HINT = os.getenv("CRAWL_QUERY_HINT", "interview")
+
+    # In-memory skill graph (skills/graph_engine.py): graph-related skills added on top of a role's
+    # top skills when building crawl tags / relevance filters; reload check interval across processes
+    CRAWL_RELATED_SKILLS = int(os.getenv("CRAWL_RELATED_SKILLS", "4"))
+    RETRIEVAL_RELATED_SKILLS = int(os.getenv("RETRIEVAL_RELATED_SKILLS", "4"))
+    SKILL_GRAPH_RELOAD_SECONDS = float(os.getenv("SKILL_GRAPH_RELOAD_SECONDS", "2.0"))
+    ROLE_SKILL_CACHE_SIZE = int(os.getenv("ROLE_SKILL_CACHE_SIZE", "512"))   # roles kept in the ranked-skill LRU
     
+    # Local pre-classifier (enrich/heuristics.py): rules + optional NumPy logistic regression; the LLM
+    # classifies only questions whose local confidence is below the threshold
+    HEURISTIC_CLASSIFY = os.getenv("HEURISTIC_CLASSIFY", "true").lower() in ("1", "true", "yes")
+    HEURISTIC_MIN_CONFIDENCE = float(os.getenv("HEURISTIC_MIN_CONFIDENCE", "0.85"))
+    HEURISTIC_MODEL_PATH = os.getenv("HEURISTIC_MODEL_PATH", str(PROJECT_ROOT / "data" / "models" / "qtype_lr.npz"))
+
     LLM_GEN_COUNTS = json.loads(os.getenv("LLM_GEN_COUNTS", '{"Technical":10,"Coding":10,"Behavioral":10}'))
+    LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))   # in-flight generation requests per process
+    LLM_GEN_BATCH = int(os.getenv("LLM_GEN_BATCH", "5"))       # max questions asked for per request
+    DEDUP_SIMILARITY = float(os.getenv("DEDUP_SIMILARITY", "0.92"))  # drop generated questions this close to the bank (0 = off)
+    LLM_STREAM = os.getenv("LLM_STREAM", "true").lower() in ("1", "true", "yes")  # persist/show items as they arrive
+    PACKAGE_SEED = int(os.getenv("PACKAGE_SEED", "0"))         # default seed for package assembly / distribution fill
+    PACKAGE_CACHE = os.getenv("PACKAGE_CACHE", "true").lower() in ("1", "true", "yes")  # reuse stored packages
+    PACKAGE_CACHE_NEW_QUESTIONS = int(os.getenv("PACKAGE_CACHE_NEW_QUESTIONS", "25"))   # new relevant questions → rebuild
+
+    # Background jobs (crawl / classify / generate run off the UI thread)
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1.0"))
+    UI_STREAM_REFRESH_SECONDS = float(os.getenv("UI_STREAM_REFRESH_SECONDS", "5.0"))  # min gap between list re-renders while streaming
+    JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "10"))  # owner refreshes its active jobs
+    JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "60"))          # no heartbeat this long → resumable
+
+    # Headless batch CLI (`jd2i batch`): max concurrent JDs inside each stage
+    BATCH_STAGE_LIMITS = json.loads(os.getenv(
+        "BATCH_STAGE_LIMITS", '{"parse":4,"skills":4,"crawl":1,"classify":2,"package":2}'
+    ))
+
+    # Token / cost accounting: USD per 1M tokens as [input, output]; longest model-name prefix wins
+    LLM_PRICING = json.loads(os.getenv("LLM_PRICING", json.dumps({
+        "gpt-4o-mini": [0.15, 0.60], "gpt-4o": [2.50, 10.00],
+        "gpt-5-mini": [0.25, 2.00], "gpt-5": [1.25, 10.00],
+        "text-embedding-3-small": [0.02, 0.0], "text-embedding-3-large": [0.13, 0.0],
+    })))
+    METRICS_JSONL = os.getenv("METRICS_JSONL", str(PROJECT_ROOT / "data" / "metrics" / "llm_usage.jsonl"))
+    METRICS_EVENTS_JSONL = os.getenv("METRICS_EVENTS_JSONL", "")   # optional per-call event log
+
+    # Stage-level tracing: one JSON line per span ("" disables), optional OTLP/HTTP JSON collector
+    TRACE_JSONL = os.getenv("TRACE_JSONL", "")                       # optional span log (empty = off)
+    TRACE_JSONL_MAX_MB = float(os.getenv("TRACE_JSONL_MAX_MB", "50"))  # rotate to <file>.1 past this size
+    OTLP_ENDPOINT = os.getenv("OTLP_ENDPOINT", "")   # e.g. http://localhost:4318/v1/traces
 
-    
     
 
 settings = Settings()
 
 
-# fail fast in dev
-if not settings.OPENAI_API_KEY:
-    print("[cfg] WARNING: OPENAI_API_KEY missing")
-print(f"[cfg] DB_URL={settings.DB_URL}")
\ No newline at end of file
+def log_settings():
+    """Print the effective config once at app/CLI startup (kept out of import time)."""
+    # fail fast in dev
+    if not settings.OPENAI_API_KEY:
+        print("[cfg] WARNING: OPENAI_API_KEY missing")
+    print(f"[cfg] DB_URL={settings.DB_URL}")
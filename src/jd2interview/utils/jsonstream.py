@@ -0,0 +1,76 @@
+# src/jd2interview/utils/jsonstream.py
+"""
+Incremental extraction of array items from a JSON document that arrives in pieces
+(streamed tool-call arguments / streamed content).
+
+    p = JsonArrayItems("items")
+    for piece in chunks:
+        for obj in p.feed(piece):   # each element of "items" as soon as its closing brace arrives
+            ...
+"""
+from __future__ import annotations
+import json
+import re
+from typing import Any, List
+
+
+class JsonArrayItems:
+    """Yields the objects of the first `"<key>": [...]` array; tolerant of chunk boundaries anywhere."""
+
+    def __init__(self, key: str = "items"):
+        self._head = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self._buf = ""
+        self._pos = -1          # scan position inside the array (-1 = array not found yet)
+        self._depth = 0
+        self._in_str = False
+        self._esc = False
+        self._start = -1
+        self.done = False
+
+    def feed(self, text: str) -> List[Any]:
+        if not text or self.done:
+            return []
+        self._buf += text
+        if self._pos < 0:
+            m = self._head.search(self._buf)
+            if not m:
+                return []
+            self._pos = m.end()
+
+        out: List[Any] = []
+        buf, i = self._buf, self._pos
+        while i < len(buf):
+            ch = buf[i]
+            if self._in_str:
+                if self._esc:
+                    self._esc = False
+                elif ch == "\\":
+                    self._esc = True
+                elif ch == '"':
+                    self._in_str = False
+            elif ch == '"':
+                self._in_str = True
+            elif ch == "{":
+                if self._depth == 0:
+                    self._start = i
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0 and self._start >= 0:
+                    try:
+                        out.append(json.loads(buf[self._start:i + 1]))
+                    except ValueError:
+                        pass
+                    self._start = -1
+            elif ch == "]" and self._depth == 0:
+                self.done = True
+                i += 1
+                break
+            i += 1
+
+        # drop consumed text so long streams stay O(n)
+        keep = self._start if self._start >= 0 else i
+        self._buf, self._pos = buf[keep:], i - keep
+        if self._start >= 0:
+            self._start = 0
+        return out
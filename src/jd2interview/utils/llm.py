@@ -0,0 +1,242 @@
+# src/jd2interview/utils/llm.py
+"""
+Process-wide registry of configured chat models and pre-built structured-output chains.
+
+Every ChatOpenAI shares one keep-alive httpx connection pool (sync) and one async pool, so calls
+reuse TLS connections instead of opening a fresh client per request, and reports token usage
+through `utils.metrics.usage_callback()`. Async work is run on a single
+background event loop (`run_async`) because an httpx.AsyncClient is bound to the loop it first ran on.
+"""
+from __future__ import annotations
+import asyncio
+import contextvars
+import queue
+import threading
+from functools import lru_cache
+from typing import (Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterator, List, Optional, Sequence,
+                    Tuple, TYPE_CHECKING)
+
+from jd2interview.utils.config import settings
+from jd2interview.utils.metrics import usage_callback, httpx_request_hook, httpx_async_request_hook
+
+if TYPE_CHECKING:
+    import httpx
+    from langchain_openai import ChatOpenAI
+    from langchain_core.runnables import Runnable
+
+_lock = threading.RLock()
+_models: Dict[Tuple, "ChatOpenAI"] = {}
+_chains: Dict[Tuple, Tuple[Any, "Runnable"]] = {}   # key → (prompt kept alive for id(), chain)
+_factory: Optional[Callable[..., Any]] = None       # optional override, see set_chat_factory()
+
+
+# ---------- shared HTTP pools ----------
+def _limits_and_timeout():
+    import httpx
+    limits = httpx.Limits(
+        max_connections=settings.OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.OPENAI_MAX_CONNECTIONS,
+        keepalive_expiry=60.0,
+    )
+    timeout = httpx.Timeout(float(settings.OPENAI_TIMEOUT), connect=10.0)
+    return limits, timeout
+
+# request hooks count every HTTP attempt (incl. SDK retries) for the metrics layer
+@lru_cache(maxsize=1)
+def sync_http_client() -> "httpx.Client":
+    import httpx
+    limits, timeout = _limits_and_timeout()
+    return httpx.Client(limits=limits, timeout=timeout, event_hooks={"request": [httpx_request_hook]})
+
+@lru_cache(maxsize=1)
+def async_http_client() -> "httpx.AsyncClient":
+    import httpx
+    limits, timeout = _limits_and_timeout()
+    return httpx.AsyncClient(limits=limits, timeout=timeout,
+                             event_hooks={"request": [httpx_async_request_hook]})
+
+
+# ---------- background event loop for async LLM calls ----------
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="jd2i-llm-loop", daemon=True).start()
+        return _loop
+
+def run_async(coro):
+    """Run a coroutine on the shared LLM event loop and block until it finishes (callable from any thread)."""
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+def run_concurrently(jobs: Sequence[Callable[[], Awaitable[Any]]], limit: Optional[int] = None) -> List[Any]:
+    """
+    Run `job()` coroutines on the shared loop, at most `limit` (default LLM_CONCURRENCY) at a time.
+    Results come back in input order; a failed job yields its exception instead of a result.
+    The caller's context (llm_context attribution, current trace span) is carried into every job.
+    """
+    if not jobs:
+        return []
+    ctx = contextvars.copy_context()
+    limit = max(1, int(limit or settings.LLM_CONCURRENCY))
+
+    async def _main():
+        sem = asyncio.Semaphore(limit)
+
+        async def _one(job):
+            _enter(ctx)
+            async with sem:
+                return await job()
+
+        return await asyncio.gather(*(_one(j) for j in jobs), return_exceptions=True)
+
+    return run_async(_main())
+
+def _enter(ctx: contextvars.Context):
+    for var, value in ctx.items():      # each task runs in its own copy of the loop's context
+        var.set(value)
+
+_DONE = object()
+
+def stream_concurrently(jobs: Sequence[Callable[[], AsyncIterator[Any]]],
+                        limit: Optional[int] = None) -> Iterator[Tuple[int, Any]]:
+    """
+    Streaming counterpart of run_concurrently: drives async generators on the shared loop and yields
+    (job index, item) in arrival order; a failing job yields (index, exception) once and stops.
+    Closing the iterator early cancels the remaining work.
+    """
+    for batch in stream_concurrently_batches(jobs, limit=limit, max_batch=1):
+        yield batch[0]
+
+def stream_concurrently_batches(jobs: Sequence[Callable[[], AsyncIterator[Any]]], limit: Optional[int] = None,
+                                max_batch: int = 8) -> Iterator[List[Tuple[int, Any]]]:
+    """
+    stream_concurrently, but each step yields everything that has arrived since the last one (at most
+    `max_batch` items). It never waits to fill a batch: a lone item comes out as soon as it arrives, and
+    items that piled up while the consumer was busy come out together.
+    """
+    if not jobs:
+        return
+    ctx = contextvars.copy_context()
+    limit = max(1, int(limit or settings.LLM_CONCURRENCY))
+    q: "queue.Queue" = queue.Queue()
+
+    async def _main():
+        sem = asyncio.Semaphore(limit)
+
+        async def _one(i, job):
+            _enter(ctx)
+            async with sem:
+                try:
+                    async for item in job():
+                        q.put((i, item))
+                except Exception as e:
+                    q.put((i, e))
+
+        try:
+            await asyncio.gather(*(_one(i, j) for i, j in enumerate(jobs)))
+        finally:
+            q.put(_DONE)
+
+    fut = asyncio.run_coroutine_threadsafe(_main(), _background_loop())
+    max_batch = max(1, int(max_batch))
+    try:
+        done = False
+        while not done:
+            batch = [q.get()]
+            while len(batch) < max_batch:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is _DONE:
+                batch.pop(); done = True
+            if batch:
+                yield batch
+    finally:
+        if not fut.done():
+            fut.cancel()
+
+def split_count(n: int, size: Optional[int] = None) -> List[int]:
+    """Split n requested items into near-equal sub-batches of at most `size` (default LLM_GEN_BATCH)."""
+    n, size = max(0, int(n)), max(1, int(size or settings.LLM_GEN_BATCH))
+    if n == 0:
+        return []
+    parts = -(-n // size)
+    return [n // parts + (1 if i < n % parts else 0) for i in range(parts)]
+
+
+# ---------- registry ----------
+def chat_model(temperature: float = 0.0, model: Optional[str] = None) -> "ChatOpenAI":
+    """Shared ChatOpenAI for (model, temperature); built once per process."""
+    model = model or settings.OPENAI_MODEL
+    key = (model, float(temperature))
+    with _lock:
+        llm = _models.get(key)
+        if llm is None and _factory is not None:
+            llm = _models[key] = _factory(model=model, temperature=float(temperature),
+                                          callbacks=[usage_callback()])
+        if llm is None:
+            from langchain_openai import ChatOpenAI
+            llm = ChatOpenAI(
+                model=model,
+                api_key=settings.OPENAI_API_KEY,
+                temperature=float(temperature),
+                timeout=settings.OPENAI_TIMEOUT,
+                max_retries=settings.OPENAI_MAX_RETRIES,
+                http_client=sync_http_client(),
+                http_async_client=async_http_client(),
+                callbacks=[usage_callback()],
+                stream_usage=True,      # token usage is reported for streamed calls too
+            )
+            _models[key] = llm
+        return llm
+
+def structured_chain(prompt, schema: Hashable, temperature: float = 0.0,
+                     model: Optional[str] = None, method: Optional[str] = None) -> "Runnable":
+    """
+    Cached `prompt | chat_model(...).with_structured_output(schema)`, keyed by
+    (model, temperature, schema, method, prompt). Prompts should themselves be cached objects.
+    """
+    model = model or settings.OPENAI_MODEL
+    key = (model, float(temperature), schema, method, id(prompt))
+    with _lock:
+        hit = _chains.get(key)
+        if hit is not None:
+            return hit[1]
+        llm = chat_model(temperature, model)
+        so = llm.with_structured_output(schema, method=method) if method else llm.with_structured_output(schema)
+        chain = prompt | so
+        _chains[key] = (prompt, chain)
+        return chain
+
+def tool_model(schema: Hashable, temperature: float = 0.0, model: Optional[str] = None) -> "Runnable":
+    """Cached chat model bound to a single forced tool (`schema`); stream it to get incremental tool-call args."""
+    model = model or settings.OPENAI_MODEL
+    key = ("tool", model, float(temperature), schema)
+    with _lock:
+        hit = _chains.get(key)
+        if hit is not None:
+            return hit[1]
+        bound = chat_model(temperature, model).bind_tools([schema], tool_choice=schema.__name__)
+        _chains[key] = (None, bound)
+        return bound
+
+def set_chat_factory(factory: Optional[Callable[..., Any]]):
+    """
+    Build chat models with `factory(model=, temperature=, callbacks=)` instead of ChatOpenAI
+    (offline runs / benchmarks, see benchmarks/fakes.py); None restores the default. Clears the registry.
+    """
+    global _factory
+    with _lock:
+        _factory = factory
+        _models.clear()
+        _chains.clear()
+
+def clear_registry():
+    """Drop cached models/chains (e.g. after changing settings in tests or benchmarks)."""
+    with _lock:
+        _models.clear()
+        _chains.clear()
@@ -0,0 +1,231 @@
+# src/jd2interview/utils/metrics.py
+"""
+Token / latency / cost accounting for LLM and embedding calls.
+
+Calls are attributed to a (stage, role_id) taken from `llm_context(...)`, a contextvar that the
+pipeline stages set around their LLM work. Counters live in-process; `export_jsonl()` and
+`prometheus_text()` expose them, and `role_cost_summary()` feeds the UI.
+"""
+from __future__ import annotations
+import contextvars
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from jd2interview.utils.config import settings
+
+_ctx: contextvars.ContextVar[Tuple[str, Optional[int]]] = contextvars.ContextVar(
+    "jd2i_llm_ctx", default=("unattributed", None)
+)
+
+@contextmanager
+def llm_context(stage: str, role_id: Optional[int] = None):
+    """Attribute LLM/embedding calls made inside the block to `stage` (role inherited if not given)."""
+    _, outer_role = _ctx.get()
+    token = _ctx.set((stage, role_id if role_id is not None else outer_role))
+    try:
+        yield
+    finally:
+        _ctx.reset(token)
+
+def current_context() -> Tuple[str, Optional[int]]:
+    return _ctx.get()
+
+
+# ---------- pricing ----------
+def cost_usd(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """USD cost from settings.LLM_PRICING ({model: [input_per_1M, output_per_1M]}); longest prefix match."""
+    table = settings.LLM_PRICING or {}
+    best = None
+    for name in table:
+        if model and model.startswith(name) and (best is None or len(name) > len(best)):
+            best = name
+    if best is None:
+        return 0.0
+    p_in, p_out = (list(table[best]) + [0.0, 0.0])[:2]
+    return (prompt_tokens * float(p_in) + completion_tokens * float(p_out)) / 1_000_000
+
+
+# ---------- counters ----------
+_FIELDS = ("calls", "errors", "prompt_tokens", "completion_tokens", "latency_s", "cost_usd",
+           "cache_hits", "cache_misses", "http_requests")
+
+class Metrics:
+    """Thread-safe counters keyed by (kind, stage, role_id, model)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._c: Dict[Tuple[str, str, Optional[int], str], Dict[str, float]] = defaultdict(
+            lambda: {f: 0 for f in _FIELDS}
+        )
+
+    def _add(self, key, **inc):
+        with self._lock:
+            row = self._c[key]
+            for k, v in inc.items():
+                row[k] += v
+
+    def record_call(self, kind: str, model: str, prompt_tokens: int = 0, completion_tokens: int = 0,
+                    latency_s: float = 0.0, error: bool = False,
+                    stage: Optional[str] = None, role_id: Optional[int] = None):
+        cur_stage, cur_role = current_context()
+        stage = stage or cur_stage
+        role_id = role_id if role_id is not None else cur_role
+        cost = cost_usd(model, prompt_tokens, completion_tokens)
+        self._add((kind, stage, role_id, model or "?"), calls=1, errors=int(bool(error)),
+                  prompt_tokens=int(prompt_tokens), completion_tokens=int(completion_tokens),
+                  latency_s=float(latency_s), cost_usd=cost)
+        _write_event({"ts": datetime.utcnow().isoformat(), "kind": kind, "stage": stage, "role_id": role_id,
+                      "model": model, "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "latency_s": round(latency_s, 4), "error": bool(error), "cost_usd": cost})
+
+    def record_cache(self, stage: str, hits: int = 0, misses: int = 0, role_id: Optional[int] = None):
+        cur_stage, cur_role = current_context()
+        role_id = role_id if role_id is not None else cur_role
+        self._add(("cache", stage or cur_stage, role_id, "-"), cache_hits=int(hits), cache_misses=int(misses))
+
+    def record_http_request(self):
+        stage, role_id = current_context()
+        self._add(("http", stage, role_id, "-"), http_requests=1)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{"kind": k[0], "stage": k[1], "role_id": k[2], "model": k[3], **dict(v)}
+                    for k, v in sorted(self._c.items(), key=lambda kv: tuple(str(x) for x in kv[0]))]
+
+    def reset(self):
+        with self._lock:
+            self._c.clear()
+
+
+metrics = Metrics()
+
+_events_lock = threading.Lock()
+
+def _write_event(ev: Dict):
+    path = settings.METRICS_EVENTS_JSONL
+    if not path:
+        return
+    try:
+        p = Path(path); p.parent.mkdir(parents=True, exist_ok=True)
+        with _events_lock, p.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(ev, default=str) + "\n")
+    except Exception as e:
+        print(f"[metrics] failed to write event: {e}")
+
+
+# ---------- aggregation / exporters ----------
+def _stage_rows(rows: List[Dict]) -> Dict[str, Dict[str, float]]:
+    by_stage: Dict[str, Dict[str, float]] = defaultdict(lambda: {f: 0 for f in _FIELDS})
+    for r in rows:
+        agg = by_stage[r["stage"]]
+        for f in _FIELDS:
+            agg[f] += r[f]
+    for agg in by_stage.values():
+        # retries = HTTP attempts beyond one per LLM/embedding call
+        agg["retries"] = max(0, agg["http_requests"] - agg["calls"]) if agg["http_requests"] else 0
+    return dict(by_stage)
+
+def role_cost_summary(role_id: Optional[int] = None) -> Dict[str, Any]:
+    """Per-stage totals for one role (or all roles when role_id is None)."""
+    rows = [r for r in metrics.snapshot() if role_id is None or r["role_id"] == role_id]
+    stages = _stage_rows(rows)
+    total = {f: sum(s[f] for s in stages.values()) for f in _FIELDS}
+    total["retries"] = sum(s.get("retries", 0) for s in stages.values())
+    return {"role_id": role_id, "stages": stages, "total": total}
+
+def export_jsonl(path: Optional[str] = None) -> str:
+    """Append the current counters (one line per key) to a JSONL file; returns the path."""
+    p = Path(path or settings.METRICS_JSONL); p.parent.mkdir(parents=True, exist_ok=True)
+    ts = datetime.utcnow().isoformat()
+    with p.open("a", encoding="utf-8") as f:
+        for row in metrics.snapshot():
+            f.write(json.dumps({"ts": ts, **row}, default=str) + "\n")
+    return str(p)
+
+def prometheus_text() -> str:
+    """Prometheus text exposition of the counters."""
+    help_ = {
+        "calls": "LLM/embedding calls", "errors": "Failed calls",
+        "prompt_tokens": "Prompt (input) tokens", "completion_tokens": "Completion (output) tokens",
+        "latency_s": "Summed call latency in seconds", "cost_usd": "Estimated cost in USD",
+        "cache_hits": "Cache hits that avoided a call", "cache_misses": "Cache misses",
+        "http_requests": "HTTP requests sent to the API (incl. retries)",
+    }
+    rows = metrics.snapshot()
+    lines: List[str] = []
+    for f in _FIELDS:
+        name = f"jd2i_llm_{f}_total"
+        lines.append(f"# HELP {name} {help_[f]}")
+        lines.append(f"# TYPE {name} counter")
+        for r in rows:
+            if not r[f]:
+                continue
+            labels = ",".join(f'{k}="{str(r[k]).replace(chr(34), "")}"' for k in ("kind", "stage", "role_id", "model"))
+            lines.append(f"{name}{{{labels}}} {r[f]}")
+    return "\n".join(lines) + "\n"
+
+
+# ---------- LangChain callback ----------
+_handler = None
+
+def usage_callback():
+    """Shared LangChain callback handler that records every chat-model call into `metrics`."""
+    global _handler
+    if _handler is None:
+        from langchain_core.callbacks import BaseCallbackHandler
+
+        class _UsageCallback(BaseCallbackHandler):
+            def __init__(self):
+                self._runs: Dict[Any, Tuple[float, str, Optional[int], str]] = {}
+                self._lock = threading.Lock()
+
+            def _start(self, run_id, serialized, kwargs):
+                inv = kwargs.get("invocation_params") or {}
+                model = inv.get("model") or inv.get("model_name") or ""
+                stage, role_id = current_context()   # captured in the caller's context
+                with self._lock:
+                    self._runs[run_id] = (time.perf_counter(), stage, role_id, model)
+
+            def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+                self._start(run_id, serialized, kwargs)
+
+            def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+                self._start(run_id, serialized, kwargs)
+
+            def on_llm_end(self, response, *, run_id, **kwargs):
+                with self._lock:
+                    t0, stage, role_id, model = self._runs.pop(run_id, (time.perf_counter(), None, None, ""))
+                p_tok = c_tok = 0
+                try:
+                    msg = response.generations[0][0].message
+                    um = getattr(msg, "usage_metadata", None) or {}
+                    p_tok, c_tok = int(um.get("input_tokens", 0)), int(um.get("output_tokens", 0))
+                except Exception:
+                    pass
+                if not (p_tok or c_tok):
+                    tu = (response.llm_output or {}).get("token_usage") or {}
+                    p_tok, c_tok = int(tu.get("prompt_tokens", 0)), int(tu.get("completion_tokens", 0))
+                model = (response.llm_output or {}).get("model_name") or model
+                metrics.record_call("chat", model, p_tok, c_tok, time.perf_counter() - t0,
+                                    stage=stage, role_id=role_id)
+
+            def on_llm_error(self, error, *, run_id, **kwargs):
+                with self._lock:
+                    t0, stage, role_id, model = self._runs.pop(run_id, (time.perf_counter(), None, None, ""))
+                metrics.record_call("chat", model, 0, 0, time.perf_counter() - t0, error=True,
+                                    stage=stage, role_id=role_id)
+
+        _handler = _UsageCallback()
+    return _handler
+
+def httpx_request_hook(request):
+    metrics.record_http_request()
+
+async def httpx_async_request_hook(request):
+    metrics.record_http_request()
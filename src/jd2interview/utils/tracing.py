@@ -0,0 +1,221 @@
+# src/jd2interview/utils/tracing.py
+"""
+Lightweight tracing: nested, context-managed spans with attributes.
+
+    with span("skills.persist_skill_graph", role_id=3) as s:
+        ...
+        s.set(n_nodes=25)
+
+A span started without an explicit parent hangs under the current span (contextvar). When a root
+span finishes, the whole tree is kept in memory (`last_trace()`, for the UI debug panel) and
+exported to JSONL (settings.TRACE_JSONL) and, if configured, to an OTLP/HTTP JSON collector
+(settings.OTLP_ENDPOINT, e.g. http://localhost:4318/v1/traces).
+
+Generators must not hold a `with span(...)` open across `yield` (Gradio resumes them in other
+contexts); use `start_span()` / `.finish()` for the outer span and pass `parent=` to children.
+"""
+from __future__ import annotations
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from jd2interview.utils.config import settings
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("jd2i_span", default=None)
+_UNSET = object()
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent", "attrs", "start_ns", "end_ns",
+                 "status", "error", "children", "_lock")
+
+    def __init__(self, name: str, parent: Optional["Span"], attrs: Dict[str, Any]):
+        self.name = name
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.attrs: Dict[str, Any] = {k: v for k, v in attrs.items() if v is not None}
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.children: List["Span"] = []
+        self._lock = threading.Lock()
+        if parent is not None:
+            with parent._lock:
+                parent.children.append(self)
+
+    def set(self, **attrs) -> "Span":
+        self.attrs.update({k: v for k, v in attrs.items() if v is not None})
+        return self
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns or time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def finish(self, error: Optional[BaseException] = None):
+        if self.end_ns is not None:
+            return
+        if error is not None:
+            self.status, self.error = "error", f"{type(error).__name__}: {error}"
+        self.end_ns = time.time_ns()
+        if self.parent is None:
+            _on_trace_done(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name, "trace_id": self.trace_id, "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent else None,
+            "start_ns": self.start_ns, "end_ns": self.end_ns, "duration_ms": round(self.duration_ms, 3),
+            "status": self.status, "error": self.error, "attrs": dict(self.attrs),
+            "children": [c.to_dict() for c in list(self.children)],
+        }
+
+    def walk(self):
+        yield self
+        for c in list(self.children):
+            yield from c.walk()
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+def start_span(name: str, parent: Any = _UNSET, **attrs) -> Span:
+    """Create a span (child of `parent`, default: current span) without making it current."""
+    if parent is _UNSET:
+        parent = _current.get()
+    return Span(name, parent, attrs)
+
+@contextmanager
+def span(name: str, parent: Any = _UNSET, **attrs):
+    s = start_span(name, parent, **attrs)
+    token = _current.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.finish(error=e)
+        raise
+    finally:
+        _current.reset(token)
+        s.finish()
+
+def traced(name: Optional[str] = None, **static_attrs):
+    """Decorator: run the (non-generator) function inside a span."""
+    def deco(fn):
+        span_name = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name, **static_attrs):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+# ---------- completed traces + exporters ----------
+_recent: Deque[Span] = deque(maxlen=50)
+_recent_lock = threading.Lock()
+_export_lock = threading.Lock()
+
+def _on_trace_done(root: Span):
+    with _recent_lock:
+        _recent.append(root)
+    if settings.TRACE_JSONL:
+        _export_jsonl(root)
+    if settings.OTLP_ENDPOINT:
+        threading.Thread(target=_export_otlp, args=(root,), daemon=True, name="jd2i-otlp").start()
+
+def recent_traces(prefix: Optional[str] = None, limit: int = 20) -> List[Span]:
+    with _recent_lock:
+        roots = [r for r in _recent if prefix is None or r.name.startswith(prefix)]
+    return roots[-limit:][::-1]
+
+def last_trace(prefix: Optional[str] = None) -> Optional[Span]:
+    roots = recent_traces(prefix, limit=1)
+    return roots[0] if roots else None
+
+def _export_jsonl(root: Span):
+    try:
+        p = Path(settings.TRACE_JSONL); p.parent.mkdir(parents=True, exist_ok=True)
+        with _export_lock:
+            _rotate(p)
+            _append_spans(p, root)
+    except Exception as e:
+        print(f"[trace] JSONL export failed: {e}")
+
+def _rotate(p: Path):
+    """Keep the span log bounded: past TRACE_JSONL_MAX_MB it moves to <file>.1 (replacing the previous one)."""
+    limit = settings.TRACE_JSONL_MAX_MB * 1024 * 1024
+    if limit > 0 and p.exists() and p.stat().st_size >= limit:
+        os.replace(p, p.with_name(p.name + ".1"))
+
+def _append_spans(p: Path, root: Span):
+    with p.open("a", encoding="utf-8") as f:
+        for s in root.walk():
+            d = s.to_dict(); d.pop("children")
+            f.write(json.dumps(d, default=str) + "\n")
+
+def _otlp_value(v: Any) -> Dict[str, Any]:
+    if isinstance(v, bool):
+        return {"boolValue": v}
+    if isinstance(v, int):
+        return {"intValue": str(v)}
+    if isinstance(v, float):
+        return {"doubleValue": v}
+    return {"stringValue": str(v)}
+
+def otlp_payload(root: Span) -> Dict[str, Any]:
+    """OTLP/HTTP JSON (ExportTraceServiceRequest) for one trace."""
+    spans = []
+    for s in root.walk():
+        spans.append({
+            "traceId": s.trace_id, "spanId": s.span_id,
+            **({"parentSpanId": s.parent.span_id} if s.parent else {}),
+            "name": s.name, "kind": 1,
+            "startTimeUnixNano": str(s.start_ns), "endTimeUnixNano": str(s.end_ns or time.time_ns()),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attrs.items()],
+            "status": {"code": 2, "message": s.error} if s.status == "error" else {"code": 1},
+        })
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "jd2interview"}}]},
+        "scopeSpans": [{"scope": {"name": "jd2interview.tracing"}, "spans": spans}],
+    }]}
+
+def _export_otlp(root: Span):
+    import urllib.request
+    try:
+        req = urllib.request.Request(settings.OTLP_ENDPOINT, data=json.dumps(otlp_payload(root)).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"}, method="POST")
+        urllib.request.urlopen(req, timeout=5).read()
+    except Exception as e:
+        print(f"[trace] OTLP export to {settings.OTLP_ENDPOINT} failed: {e}")
+
+
+# ---------- rendering ----------
+def render_tree(root: Optional[Span], max_children: int = 25) -> str:
+    """Indented text tree: name  duration  attrs (long child lists are elided)."""
+    if root is None:
+        return "(no trace recorded yet)"
+    lines: List[str] = []
+
+    def _fmt(s: Span, depth: int):
+        attrs = " ".join(f"{k}={v}" for k, v in s.attrs.items())
+        err = f"  !! {s.error}" if s.error else ""
+        lines.append(f"{'  ' * depth}{s.name}  {s.duration_ms:9.1f} ms  {attrs}{err}")
+        kids = list(s.children)
+        for c in kids[:max_children]:
+            _fmt(c, depth + 1)
+        if len(kids) > max_children:
+            rest = kids[max_children:]
+            lines.append(f"{'  ' * (depth + 1)}… {len(rest)} more spans "
+                         f"({sum(c.duration_ms for c in rest):.1f} ms)")
+
+    _fmt(root, 0)
+    return "\n".join(lines)